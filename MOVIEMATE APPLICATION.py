@@ -1,18 +1,26 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
-import os
-import json
-import datetime
-import bcrypt
+import queue
+import atexit
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from moviemate.importer import BulkImporter
+from moviemate.instrumentation import registry as timings, timed, timer
+from moviemate.persistence import PersistenceWorker
+from moviemate.service import MovieMateService, ServiceError, NotFoundError, hash_password, open_storage
 
 # Constants
-USERS_FILE = "users.json"
-RATINGS_FILE = "ratings.json"
-MOVIES_FILE = "movies.json"
-FRIENDS_FILE = "friends.json"
-POSTER_DIR = "posters"
+CARD_POSTER_SIZE = (120, 160)
+DETAIL_POSTER_SIZE = (250, 375)
+# Imported posters are scaled down to this on the way in
+IMPORT_POSTER_SIZE = (500, 750)
+POSTER_CACHE_BYTES = 64 * 1024 * 1024
+POSTER_WORKERS = 4
+AUTH_WORKERS = 2
+SEARCH_DEBOUNCE_MS = 150
 
 # Color Theme - Yellow and Black
 THEME = {
@@ -28,212 +36,408 @@ THEME = {
     "admin_btn": "#990000"
 }
 
+class PosterCache:
+    # Decoded, resized posters shared by every frame, keyed by (path, version,
+    # size); the version comes from the service's PosterDirectory and changes
+    # when a poster file is replaced. Least recently used entries are
+    # evicted once the estimated RGBA size of the cache exceeds max_bytes.
+    def __init__(self, max_bytes=POSTER_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(path, version, size):
+        return (path, version, size)
+
+    @staticmethod
+    @timed("poster.decode")
+    def decode(path, size):
+        # Pure Pillow work, safe to run off the Tk thread
+        image = Image.open(path).resize(size, Image.LANCZOS)
+        image.load()
+        return image
+
+    def lookup(self, key):
+        image = self.entries.get(key)
+        if image is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return image
+
+    @timed("poster.photoimage")
+    def put(self, key, pil_image):
+        image = self.entries.get(key)
+        if image is not None:
+            return image
+        size = key[2]
+        image = ImageTk.PhotoImage(pil_image)
+        self.entries[key] = image
+        self.current_bytes += size[0] * size[1] * 4
+        while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+            (_, _, old_size), _ = self.entries.popitem(last=False)
+            self.current_bytes -= old_size[0] * old_size[1] * 4
+            self.evictions += 1
+        return image
+
+    @staticmethod
+    @timed("poster.import_thumbnail")
+    def make_thumbnail(source, target):
+        # Bulk import copy step, run on the importer's pool
+        image = Image.open(source)
+        image.thumbnail(IMPORT_POSTER_SIZE, Image.LANCZOS)
+        image.convert("RGB").save(target, "JPEG", quality=90)
+
+    def get(self, path, version, size):
+        key = self.key(path, version, size)
+        image = self.lookup(key)
+        if image is None:
+            image = self.put(key, self.decode(path, size))
+        return image
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+class PosterLoader:
+    # Decodes posters on a thread pool. Labels show a blank placeholder of the
+    # final size until the image arrives back on the Tk thread. Jobs belong to
+    # an owner (usually a frame) so a re-render can cancel the ones it no
+    # longer needs.
+    def __init__(self, app, cache, workers=POSTER_WORKERS):
+        self.app = app
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poster")
+        self.jobs = defaultdict(dict)
+        self.placeholders = {}
+
+    def placeholder(self, size):
+        if size not in self.placeholders:
+            self.placeholders[size] = tk.PhotoImage(width=size[0], height=size[1])
+        return self.placeholders[size]
+
+    def load_into(self, owner, label, path, version, size):
+        self.forget(owner, label)
+        key = self.cache.key(path, version, size)
+        image = self.cache.lookup(key)
+        if image is not None:
+            self.show_image(label, image)
+            return
+
+        self.show_image(label, self.placeholder(size))
+        future = self.executor.submit(PosterCache.decode, path, size)
+        self.jobs[owner][label] = future
+        future.add_done_callback(
+            lambda f: self.app.call_in_ui(self.finish, owner, f, key, label))
+
+    def finish(self, owner, future, key, label):
+        if future.cancelled():
+            return
+        jobs = self.jobs.get(owner)
+        current = jobs is not None and jobs.get(label) is future
+        if current:
+            del jobs[label]
+        try:
+            pil_image = future.result()
+        except Exception as e:
+            print(f"Error loading poster: {e}")
+            if current and label.winfo_exists():
+                self.show_missing(label)
+            return
+        # Cache even stale results, the poster is likely to be shown again
+        image = self.cache.put(key, pil_image)
+        if current and label.winfo_exists():
+            self.show_image(label, image)
+
+    def forget(self, owner, label):
+        # The label is about to show something else
+        future = self.jobs.get(owner, {}).pop(label, None)
+        if future is not None:
+            future.cancel()
+
+    def cancel(self, owner):
+        for future in self.jobs.pop(owner, {}).values():
+            future.cancel()
+
+    def show_image(self, label, image):
+        label.config(image=image)
+        label.image = image
+
+    def show_missing(self, label):
+        label.config(image="", text="No Image", height=8, bg=THEME["card_bg"], fg=THEME["card_fg"], font=("Helvetica", 10))
+        label.image = None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class VirtualMovieGrid(tk.Frame):
+    # Scrollable grid of fixed-size movie cards. Only the rows inside the
+    # viewport (plus `overscan` rows either side) have widgets; cards that
+    # scroll out are hidden and rebound to the rows that scroll in. The
+    # scrollregion is computed from the item count. Visible cards are keyed
+    # by movie id so a single card can be refreshed in place.
+    CARD_WIDTH = 200
+    CARD_HEIGHT = 280
+    PADDING = 5
+
+    def __init__(self, parent, owner, columns=5, overscan=1):
+        super().__init__(parent, bg=THEME["bg"])
+        self.owner = owner
+        self.app = owner.app
+        self.columns = columns
+        self.overscan = overscan
+        self.items = []
+        self.item_ids = None
+        self.visible = {}
+        self.cards_by_id = {}
+        self.pool = []
+        self.refresh_pending = False
+
+        self.canvas = tk.Canvas(self, bg=THEME["bg"], highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.empty_text = self.canvas.create_text(0, 50, anchor="n", state="hidden", fill=THEME["fg"],
+                                                  font=("Helvetica", 14))
+        self.canvas.bind("<Configure>", lambda e: self.relayout())
+
+    @property
+    def cell_width(self):
+        return max(self.CARD_WIDTH + 2 * self.PADDING, self.canvas.winfo_width() // self.columns)
+
+    @property
+    def cell_height(self):
+        return self.CARD_HEIGHT + 2 * self.PADDING
+
+    def set_items(self, items, empty_message=""):
+        self.canvas.itemconfigure(self.empty_text, text=empty_message,
+                                  state="hidden" if items else "normal")
+        item_ids = [movie["id"] for movie in items]
+        if item_ids == self.item_ids:
+            # Same result set: keep the layout and scroll position
+            self.items = list(items)
+            for index, card in self.visible.items():
+                self.bind_card(card, self.items[index])
+            return
+
+        self.items = list(items)
+        self.item_ids = item_ids
+        for index in list(self.visible):
+            self.release(index)
+        self.canvas.yview_moveto(0)
+        self.relayout()
+
+    def relayout(self):
+        for index in list(self.visible):
+            self.release(index)
+        rows = (len(self.items) + self.columns - 1) // self.columns
+        width = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, rows * self.cell_height))
+        self.canvas.coords(self.empty_text, width // 2, 50)
+        self.refresh()
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            self.after_idle(self.refresh)
+
+    def refresh(self):
+        self.refresh_pending = False
+        if not self.items:
+            return
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        rows = (len(self.items) + self.columns - 1) // self.columns
+        first_row = max(0, int(top // self.cell_height) - self.overscan)
+        last_row = min(rows - 1, int(bottom // self.cell_height) + self.overscan)
+        wanted = range(first_row * self.columns, min(len(self.items), (last_row + 1) * self.columns))
+
+        for index in [i for i in self.visible if i not in wanted]:
+            self.release(index)
+        for index in wanted:
+            if index not in self.visible:
+                self.show(index)
+
+    def show(self, index):
+        card = self.pool.pop() if self.pool else self.create_card()
+        row, col = divmod(index, self.columns)
+        x = col * self.cell_width + (self.cell_width - self.CARD_WIDTH) // 2
+        y = row * self.cell_height + self.PADDING
+        self.canvas.coords(card.window, x, y)
+        self.canvas.itemconfigure(card.window, state="normal")
+        self.bind_card(card, self.items[index])
+        self.visible[index] = card
+        self.cards_by_id[card.movie["id"]] = card
+
+    def release(self, index):
+        card = self.visible.pop(index)
+        self.cards_by_id.pop(card.movie["id"], None)
+        self.canvas.itemconfigure(card.window, state="hidden")
+        self.app.poster_loader.forget(self.owner, card.poster_label)
+        card.movie = None
+        self.pool.append(card)
+
+    def update_item(self, movie_id):
+        # Cards that are not materialized pick up the change when bound
+        card = self.cards_by_id.get(movie_id)
+        if card is not None:
+            self.owner.add_rating_controls(card.rating_frame, card.movie)
+
+    @timed("ui.create_card")
+    def create_card(self):
+        card = tk.Frame(self.canvas, bg=THEME["card_bg"], bd=2, relief="groove")
+        card.movie = None
+        card.bind("<Button-1>", lambda e: card.movie and self.owner.show_movie_detail(card.movie["title"]))
+
+        card.poster_label = tk.Label(card, bg=THEME["card_bg"])
+        card.poster_label.pack()
+        card.title_label = tk.Label(card, wraplength=160, font=("Helvetica", 11, "bold"),
+                                    bg=THEME["card_bg"], fg=THEME["card_fg"])
+        card.title_label.pack(pady=(5, 0))
+        card.year_label = tk.Label(card, font=("Helvetica", 9), bg=THEME["card_bg"], fg=THEME["card_fg"])
+        card.year_label.pack()
+        card.rating_frame = tk.Frame(card, bg=THEME["card_bg"])
+        card.rating_frame.pack(pady=5)
+
+        card.window = self.canvas.create_window(0, 0, window=card, anchor="nw", state="hidden",
+                                                width=self.CARD_WIDTH, height=self.CARD_HEIGHT)
+        return card
+
+    def bind_card(self, card, movie):
+        card.movie = movie
+        poster_path, version = self.app.service.poster(movie["title"])
+        if poster_path:
+            card.poster_label.config(text="", height=0)
+            self.app.poster_loader.load_into(self.owner, card.poster_label, poster_path, version, CARD_POSTER_SIZE)
+        else:
+            card.poster_label.config(image="", text="Poster not available", height=8, bg=THEME["card_bg"], fg=THEME["card_fg"], font=("Helvetica", 10))
+            card.poster_label.image = None
+        card.title_label.config(text=movie["title"])
+        card.year_label.config(text=f"({movie.get('year', 'N/A')})")
+        self.owner.add_rating_controls(card.rating_frame, movie)
+
 class MovieMateApp:
     def __init__(self, root):
+        self.started = time.perf_counter()
         self.root = root
         self.root.title("MovieMate 🎬")
         self.root.geometry("1200x800")
         self.root.configure(bg=THEME["bg"])
 
-        self.users = self.load_data(USERS_FILE, {})
-        self.ratings = self.load_data(RATINGS_FILE, {})
-        self.movie_db = self.load_data(MOVIES_FILE, None)
-        self.friends = self.load_data(FRIENDS_FILE, {})
-        self.poster_map = {}
-
-        os.makedirs(POSTER_DIR, exist_ok=True)
-
-        self.create_default_admin()
-        if not self.movie_db:
-            self.create_mini_database()
-        self.load_poster_map()
+        self.ui_calls = queue.Queue()
+        self.writer = PersistenceWorker(on_error=self.show_storage_error)
+        atexit.register(self.writer.stop)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.poll_ui_calls()
+
+        with timer("startup.service"):
+            self.service = MovieMateService(open_storage(writer=self.writer, on_error=self.show_storage_error))
+        self.service_ready = time.perf_counter()
+        self.poster_cache = PosterCache()
+        self.poster_loader = PosterLoader(self, self.poster_cache)
+        self.auth_executor = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="auth")
+        self.auth_jobs = 0
+        # One thread, so queries run in order and never pile up in parallel
+        self.search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
 
         self.current_user = None
         self.is_admin = False
         self.setup_ui()
 
-    def load_data(self, filename, default):
-        try:
-            if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    return json.load(f)
-            return default
-        except (json.JSONDecodeError, IOError) as e:
-            messagebox.showerror("Error", f"Failed to load {filename}: {str(e)}")
-            return default
-
-    def save_data(self, data, filename):
+    def call_in_ui(self, func, *args):
+        # Worker threads must not touch tkinter; they queue calls for the main loop instead
+        self.ui_calls.put((func, args))
+
+    def poll_ui_calls(self):
         try:
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=4)
-            return True
-        except (TypeError, IOError) as e:
-            messagebox.showerror("Error", f"Failed to save {filename}: {str(e)}")
-            return False
-
-    def create_default_admin(self):
-        if "admin" not in self.users:
-            self.users["admin"] = {
-                "password": self.hash_password("admin123"),
-                "joined": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            self.save_data(self.users, USERS_FILE)
-
-    def hash_password(self, password):
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
-
-    def verify_password(self, password, hashed):
+            while True:
+                try:
+                    func, args = self.ui_calls.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    func(*args)
+                except Exception:
+                    # Report it the way Tk reports a failed event callback
+                    # and carry on with the rest of the queue
+                    self.root.report_callback_exception(*sys.exc_info())
+        finally:
+            self.root.after(50, self.poll_ui_calls)
+
+    def show_storage_error(self, message):
+        self.call_in_ui(messagebox.showerror, "Error", message)
+
+    def on_close(self):
+        # Flush queued writes before the window goes away
+        admin = self.frames.get("admin")
+        if admin is not None and admin.importer is not None:
+            admin.importer.cancel()
+        self.poster_loader.shutdown()
+        self.auth_executor.shutdown(wait=False, cancel_futures=True)
+        self.search_executor.shutdown(wait=False, cancel_futures=True)
+        self.writer.stop()
+        self.root.destroy()
+
+    def run_auth(self, func, on_done, on_error, *args):
+        # bcrypt is deliberately slow: run it on the auth pool and deliver the
+        # result (or the ServiceError it raised) back on the Tk thread. The
+        # watch cursor shows work in progress.
+        self.auth_jobs += 1
+        self.root.config(cursor="watch")
+        # Accounts may have been created or changed by another instance, so
+        # start once those changes are in
+        self.service.sync_later(self.call_in_ui, lambda changed: self.start_auth(func, args, on_done, on_error))
+
+    def start_auth(self, func, args, on_done, on_error):
+        future = self.auth_executor.submit(func, *args)
+        future.add_done_callback(lambda f: self.call_in_ui(self.finish_auth, f, on_done, on_error))
+
+    def finish_auth(self, future, on_done, on_error):
+        self.auth_jobs -= 1
+        if not self.auth_jobs:
+            self.root.config(cursor="")
+        if future.cancelled():
+            return
         try:
-            return bcrypt.checkpw(password.encode(), hashed.encode())
-        except ValueError:
-            return False
-
-    def create_mini_database(self):
-        self.movie_db = {
-            "Action": [
-                {"title": "The Dark Knight", "year": "2008", "description": "Batman faces the Joker in Gotham.", "poster": "dark_knight.jpg", "id": 1},
-                {"title": "Inception", "year": "2010", "description": "A thief enters dreams to steal secrets.", "poster": "inception.jpg", "id": 2},
-                {"title": "Mad Max: Fury Road", "year": "2015", "description": "A post-apocalyptic chase in the wasteland.", "poster": "mad_max.jpg", "id": 3},
-                {"title": "Gladiator", "year": "2000", "description": "A Roman general seeks vengeance.", "poster": "gladiator.jpg", "id": 4},
-                {"title": "Die Hard", "year": "1988", "description": "A cop battles terrorists in a skyscraper.", "poster": "die_hard.jpg", "id": 5},
-                {"title": "John Wick", "year": "2014", "description": "An ex-hitman seeks revenge after his dog is killed.", "poster": "john_wick.jpg", "id": 6},
-                {"title": "The Bourne Identity", "year": "2002", "description": "A man with amnesia uncovers his past as a spy.", "poster": "bourne_identity.jpg", "id": 7},
-                {"title": "Mission: Impossible - Fallout", "year": "2018", "description": "Ethan Hunt races to stop a global catastrophe.", "poster": "mission_impossible_fallout.jpg", "id": 8},
-                {"title": "Skyfall", "year": "2012", "description": "James Bond's loyalty to M is tested.", "poster": "skyfall.jpg", "id": 9},
-                {"title": "The Expendables", "year": "2010", "description": "A group of mercenaries takes on a dangerous mission.", "poster": "expendables.jpg", "id": 10},
-                {"title": "Black Panther", "year": "2018", "description": "T'Challa becomes king of Wakanda and faces challenges.", "poster": "black_panther.jpg", "id": 11},
-                {"title": "Avengers: Endgame", "year": "2019", "description": "The Avengers assemble to undo Thanos' actions.", "poster": "avengers_endgame.jpg", "id": 12},
-                {"title": "Casino Royale", "year": "2006", "description": "James Bond takes on a terrorist financier in a high-stakes poker game.", "poster": "casino_royale.jpg", "id": 71},
-                {"title": "Speed", "year": "1994", "description": "A cop must prevent a bomb on a bus from exploding.", "poster": "speed.jpg", "id": 72},
-                {"title": "The Equalizer", "year": "2014", "description": "A retired operative takes on a Russian mafia.", "poster": "equalizer.jpg", "id": 73}
-            ],
-            "Comedy": [
-                {"title": "Superbad", "year": "2007", "description": "High schoolers throw a wild party.", "poster": "superbad.jpg", "id": 13},
-                {"title": "The Hangover", "year": "2009", "description": "A bachelor party goes wrong in Vegas.", "poster": "hangover.jpg", "id": 14},
-                {"title": "Deadpool", "year": "2016", "description": "A mercenary with a sense of humor.", "poster": "deadpool.jpg", "id": 15},
-                {"title": "Zombieland", "year": "2009", "description": "Survivors in a zombie apocalypse.", "poster": "zombieland.jpg", "id": 16},
-                {"title": "Pitch Perfect", "year": "2012", "description": "A college a cappella group competes.", "poster": "pitch_perfect.jpg", "id": 17},
-                {"title": "Anchorman", "year": "2004", "description": "A 1970s news anchor faces challenges.", "poster": "anchorman.jpg", "id": 18},
-                {"title": "Step Brothers", "year": "2008", "description": "Two grown men become stepbrothers and cause chaos.", "poster": "step_brothers.jpg", "id": 19},
-                {"title": "Mean Girls", "year": "2004", "description": "A teen navigates high school social hierarchies.", "poster": "mean_girls.jpg", "id": 20},
-                {"title": "The Nice Guys", "year": "2016", "description": "A private eye and a hired enforcer team up in 1970s LA.", "poster": "nice_guys.jpg", "id": 21},
-                {"title": "21 Jump Street", "year": "2012", "description": "Two cops go undercover at a high school.", "poster": "21_jump_street.jpg", "id": 22},
-                {"title": "Knives Out", "year": "2019", "description": "A detective investigates a dysfunctional family's patriarch's death.", "poster": "knives_out.jpg", "id": 23},
-                {"title": "Game Night", "year": "2018", "description": "A game night turns into a real mystery.", "poster": "game_night.jpg", "id": 24},
-                {"title": "Crazy Rich Asians", "year": "2018", "description": "A woman discovers her boyfriend's wealthy family in Singapore.", "poster": "crazy_rich_asians.jpg", "id": 74},
-                {"title": "The Grand Budapest Hotel", "year": "2014", "description": "A concierge and his lobby boy get embroiled in a caper.", "poster": "grand_budapest_hotel.jpg", "id": 75},
-                {"title": "Jojo Rabbit", "year": "2019", "description": "A boy has an imaginary friend who is Adolf Hitler.", "poster": "jojo_rabbit.jpg", "id": 76}
-            ],
-            "Drama": [
-                {"title": "The Shawshank Redemption", "year": "1994", "description": "Two prisoners find hope.", "poster": "shawshank.jpg", "id": 25},
-                {"title": "Forrest Gump", "year": "1994", "description": "A man witnesses history.", "poster": "forrest_gump.jpg", "id": 26},
-                {"title": "Fight Club", "year": "1999", "description": "An underground fight club spirals out of control.", "poster": "fight_club.jpg", "id": 27},
-                {"title": "The Godfather", "year": "1972", "description": "A mafia family saga.", "poster": "godfather.jpg", "id": 28},
-                {"title": "Schindler's List", "year": "1993", "description": "A businessman saves Jews during the Holocaust.", "poster": "schindlers_list.jpg", "id": 29},
-                {"title": "The Green Mile", "year": "1999", "description": "A death row guard encounters a unique prisoner.", "poster": "green_mile.jpg", "id": 30},
-                {"title": "12 Years a Slave", "year": "2013", "description": "A free man is kidnapped and sold into slavery.", "poster": "12_years_a_slave.jpg", "id": 31},
-                {"title": "The Pursuit of Happyness", "year": "2006", "description": "A struggling salesman fights for a better life.", "poster": "pursuit_of_happyness.jpg", "id": 32},
-                {"title": "A Beautiful Mind", "year": "2001", "description": "A mathematician struggles with schizophrenia.", "poster": "beautiful_mind.jpg", "id": 33},
-                {"title": "The Wolf of Wall Street", "year": "2013", "description": "A stockbroker's rise and fall in corruption.", "poster": "wolf_of_wall_street.jpg", "id": 34},
-                {"title": "Moonlight", "year": "2016", "description": "A young man grows up in a tough Miami neighborhood.", "poster": "moonlight.jpg", "id": 77},
-                {"title": "Manchester by the Sea", "year": "2016", "description": "A man returns to his hometown after his brother's death.", "poster": "manchester_by_the_sea.jpg", "id": 78},
-                {"title": "The Departed", "year": "2006", "description": "An undercover cop and a mole infiltrate each other's worlds.", "poster": "departed.jpg", "id": 79}
-            ],
-            "Science Fiction": [
-                {"title": "Interstellar", "year": "2014", "description": "Explorers travel through a wormhole.", "poster": "interstellar.jpg", "id": 35},
-                {"title": "The Matrix", "year": "1999", "description": "A hacker discovers reality's truth.", "poster": "matrix.jpg", "id": 36},
-                {"title": "Blade Runner 2049", "year": "2017", "description": "A replicant hunter uncovers a secret.", "poster": "blade_runner_2049.jpg", "id": 37},
-                {"title": "Dune", "year": "2021", "description": "A noble family controls a desert planet.", "poster": "dune.jpg", "id": 38},
-                {"title": "Star Wars: The Empire Strikes Back", "year": "1980", "description": "The Rebels face the Empire's wrath.", "poster": "empire_strikes_back.jpg", "id": 39},
-                {"title": "Arrival", "year": "2016", "description": "A linguist communicates with alien visitors.", "poster": "arrival.jpg", "id": 40},
-                {"title": "Ex Machina", "year": "2014", "description": "A programmer tests an AI's capabilities.", "poster": "ex_machina.jpg", "id": 41},
-                {"title": "2001: A Space Odyssey", "year": "1968", "description": "A journey to Jupiter with a mysterious monolith.", "poster": "2001_space_odyssey.jpg", "id": 42},
-                {"title": "Annihilation", "year": "2018", "description": "A team explores a mysterious zone called The Shimmer.", "poster": "annihilation.jpg", "id": 43},
-                {"title": "Her", "year": "2013", "description": "A man falls in love with an AI operating system.", "poster": "her.jpg", "id": 80},
-                {"title": "Edge of Tomorrow", "year": "2014", "description": "A soldier relives the same day to fight aliens.", "poster": "edge_of_tomorrow.jpg", "id": 81},
-                {"title": "The Martian", "year": "2015", "description": "An astronaut is stranded on Mars and must survive.", "poster": "martian.jpg", "id": 82}
-            ],
-            "Horror": [
-                {"title": "The Shining", "year": "1980", "description": "A family is haunted in an isolated hotel.", "poster": "shining.jpg", "id": 44},
-                {"title": "Get Out", "year": "2017", "description": "A man uncovers a dark secret at his girlfriend's family estate.", "poster": "get_out.jpg", "id": 45},
-                {"title": "Hereditary", "year": "2018", "description": "A family is haunted by sinister forces after a death.", "poster": "hereditary.jpg", "id": 46},
-                {"title": "It", "year": "2017", "description": "Kids face a shape-shifting entity in Derry.", "poster": "it.jpg", "id": 47},
-                {"title": "The Conjuring", "year": "2013", "description": "Paranormal investigators help a family in a haunted house.", "poster": "conjuring.jpg", "id": 48},
-                {"title": "A Quiet Place", "year": "2018", "description": "A family must live in silence to avoid creatures that hunt by sound.", "poster": "quiet_place.jpg", "id": 83},
-                {"title": "The Witch", "year": "2015", "description": "A Puritan family encounters evil in 17th-century New England.", "poster": "witch.jpg", "id": 84},
-                {"title": "Midsommar", "year": "2019", "description": "A couple visits a Swedish festival that turns sinister.", "poster": "midsommar.jpg", "id": 85}
-            ],
-            "Romance": [
-                {"title": "The Notebook", "year": "2004", "description": "A couple's love story unfolds through a notebook.", "poster": "notebook.jpg", "id": 49},
-                {"title": "La La Land", "year": "2016", "description": "A musician and an actress fall in love in LA.", "poster": "la_la_land.jpg", "id": 50},
-                {"title": "Pride & Prejudice", "year": "2005", "description": "Elizabeth Bennet navigates love and societal expectations.", "poster": "pride_prejudice.jpg", "id": 51},
-                {"title": "Before Sunrise", "year": "1995", "description": "Two strangers meet and connect in Vienna.", "poster": "before_sunrise.jpg", "id": 52},
-                {"title": "Amélie", "year": "2001", "description": "A shy waitress changes lives in Paris with small acts of kindness.", "poster": "amelie.jpg", "id": 86},
-                {"title": "Call Me by Your Name", "year": "2017", "description": "A teen experiences a summer romance in 1980s Italy.", "poster": "call_me_by_your_name.jpg", "id": 87},
-                {"title": "A Star Is Born", "year": "2018", "description": "A musician helps a young singer find fame as he struggles.", "poster": "star_is_born.jpg", "id": 88}
-            ],
-            "Thriller": [
-                {"title": "Se7en", "year": "1995", "description": "Two detectives hunt a serial killer with a twisted motive.", "poster": "se7en.jpg", "id": 53},
-                {"title": "Gone Girl", "year": "2014", "description": "A man becomes a suspect in his wife's disappearance.", "poster": "gone_girl.jpg", "id": 54},
-                {"title": "Shutter Island", "year": "2010", "description": "A marshal investigates a patient's disappearance on an island.", "poster": "shutter_island.jpg", "id": 55},
-                {"title": "The Silence of the Lambs", "year": "1991", "description": "An FBI agent seeks help from a cannibalistic killer.", "poster": "silence_of_the_lambs.jpg", "id": 56},
-                {"title": "Parasite", "year": "2019", "description": "A poor family infiltrates a wealthy household.", "poster": "parasite.jpg", "id": 57},
-                {"title": "Prisoners", "year": "2013", "description": "A father takes desperate measures when his daughter goes missing.", "poster": "prisoners.jpg", "id": 89},
-                {"title": "Nightcrawler", "year": "2014", "description": "A driven man becomes a crime journalist in LA.", "poster": "nightcrawler.jpg", "id": 90},
-                {"title": "Zodiac", "year": "2007", "description": "Investigators hunt the Zodiac Killer in San Francisco.", "poster": "zodiac.jpg", "id": 91}
-            ],
-            "Adventure": [
-                {"title": "Jurassic Park", "year": "1993", "description": "A theme park with cloned dinosaurs goes wrong.", "poster": "jurassic_park.jpg", "id": 58},
-                {"title": "Indiana Jones: Raiders of the Lost Ark", "year": "1981", "description": "An archaeologist races to find the Ark of the Covenant.", "poster": "raiders_lost_ark.jpg", "id": 59},
-                {"title": "The Lord of the Rings: The Fellowship of the Ring", "year": "2001", "description": "A hobbit embarks on a quest to destroy a powerful ring.", "poster": "lotr_fellowship.jpg", "id": 60},
-                {"title": "Pirates of the Caribbean: The Curse of the Black Pearl", "year": "2003", "description": "A pirate and a blacksmith rescue a kidnapped maiden.", "poster": "pirates_caribbean.jpg", "id": 61},
-                {"title": "The Revenant", "year": "2015", "description": "A frontiersman seeks survival and revenge in the wilderness.", "poster": "revenant.jpg", "id": 92},
-                {"title": "Life of Pi", "year": "2012", "description": "A young man survives a shipwreck with a Bengal tiger.", "poster": "life_of_pi.jpg", "id": 93},
-                {"title": "Into the Wild", "year": "2007", "description": "A young man abandons society to live in the Alaskan wilderness.", "poster": "into_the_wild.jpg", "id": 94}
-            ],
-            "Animation": [
-                {"title": "Toy Story", "year": "1995", "description": "Toys come to life when humans aren't looking.", "poster": "toy_story.jpg", "id": 62},
-                {"title": "Spirited Away", "year": "2001", "description": "A girl navigates a magical world to save her parents.", "poster": "spirited_away.jpg", "id": 63},
-                {"title": "The Incredibles", "year": "2004", "description": "A family of superheroes saves the world.", "poster": "incredibles.jpg", "id": 64},
-                {"title": "Coco", "year": "2017", "description": "A boy journeys to the Land of the Dead to uncover his family history.", "poster": "coco.jpg", "id": 65},
-                {"title": "Inside Out", "year": "2015", "description": "Emotions guide a young girl through a life change.", "poster": "inside_out.jpg", "id": 66},
-                {"title": "Finding Nemo", "year": "2003", "description": "A clownfish searches for his lost son in the ocean.", "poster": "finding_nemo.jpg", "id": 95},
-                {"title": "Up", "year": "2009", "description": "An elderly man embarks on an adventure with a floating house.", "poster": "up.jpg", "id": 96},
-                {"title": "WALL-E", "year": "2008", "description": "A small waste-collecting robot finds love and saves Earth.", "poster": "wall_e.jpg", "id": 97}
-            ],
-            "Mystery": [
-                {"title": "The Sixth Sense", "year": "1999", "description": "A boy who sees dead people seeks help from a psychologist.", "poster": "sixth_sense.jpg", "id": 67},
-                {"title": "Memento", "year": "2000", "description": "A man with short-term memory loss hunts his wife's killer.", "poster": "memento.jpg", "id": 68},
-                {"title": "The Others", "year": "2001", "description": "A woman suspects her house is haunted.", "poster": "others.jpg", "id": 69},
-                {"title": "Oldboy", "year": "2003", "description": "A man seeks answers after being imprisoned for 15 years.", "poster": "oldboy.jpg", "id": 70},
-                {"title": "The Girl with the Dragon Tattoo", "year": "2011", "description": "A journalist and hacker investigate a decades-old disappearance.", "poster": "girl_with_dragon_tattoo.jpg", "id": 98},
-                {"title": "Donnie Darko", "year": "2001", "description": "A troubled teen has visions of a man in a rabbit suit.", "poster": "donnie_darko.jpg", "id": 99},
-                {"title": "L.A. Confidential", "year": "1997", "description": "Cops uncover corruption in 1950s Los Angeles.", "poster": "la_confidential.jpg", "id": 100}
-            ]
-        }
-        self.save_data(self.movie_db, MOVIES_FILE)
-        self.load_poster_map()
-
-    def load_poster_map(self):
-        self.poster_map = {}
-        for genre, movies in self.movie_db.items():
-            for movie in movies:
-                poster_name = movie.get('poster', '')
-                if poster_name:
-                    poster_path = os.path.join(POSTER_DIR, poster_name)
-                    self.poster_map[movie['title']] = poster_path if os.path.exists(poster_path) else None
+            result = future.result()
+        except ServiceError as e:
+            on_error(e)
+            return
+        on_done(result)
 
     def setup_ui(self):
-        self.frames = {
-            "login": LoginFrame(self),
-            "movies": MovieBrowserFrame(self),
-            "profile": ProfileFrame(self),
-            "account": AccountFrame(self),
-            "movie_detail": MovieDetailFrame(self),
-
-            "recommendations": RecommendationsFrame(self),
-            "friends": FriendsFrame(self)
+        # Frames are built on their first show_frame, so startup only pays
+        # for the login screen and the catalog is not touched before login
+        self.frame_classes = {
+            "login": LoginFrame,
+            "movies": MovieBrowserFrame,
+            "profile": ProfileFrame,
+            "account": AccountFrame,
+            "movie_detail": MovieDetailFrame,
+
+            "recommendations": RecommendationsFrame,
+            "friends": FriendsFrame,
+            "admin": AdminFrame,
+            "performance": PerformanceFrame
         }
+        self.frames = {}
+        self.current_frame = None
 
         self.theme_btn = tk.Button(self.root, text="🌓 Toggle Theme",
                                    command=self.toggle_theme,
@@ -243,43 +447,86 @@ class MovieMateApp:
                                    command=lambda: self.show_frame("admin"),
                                    bg=THEME["admin_btn"], fg="white",
                                    font=("Helvetica", 14))
+        self.perf_btn = tk.Button(self.root, text="📊 Performance",
+                                  command=lambda: self.show_frame("performance"),
+                                  bg=THEME["admin_btn"], fg="white",
+                                  font=("Helvetica", 14))
 
         self.show_frame("login")
-
+        self.root.after_idle(self.report_startup)
+
+    def report_startup(self):
+        # Runs once the login screen has been laid out and drawn
+        ready = time.perf_counter()
+        timings.record("startup.login_screen", ready - self.started)
+        if timings.enabled:
+            print(f"Startup: login screen in {(ready - self.started) * 1000:.0f} ms "
+                  f"(data {(self.service_ready - self.started) * 1000:.0f} ms, "
+                  f"ui {(ready - self.service_ready) * 1000:.0f} ms)", file=sys.stderr)
+
+    def get_frame(self, name):
+        frame = self.frames.get(name)
+        if frame is None and name in self.frame_classes:
+            with timer(f"ui.build_frame.{name}"):
+                frame = self.frames[name] = self.frame_classes[name](self)
+        return frame
+
+    @timed("ui.show_frame")
     def show_frame(self, frame_name):
-        for name, frame in self.frames.items():
-            if name == frame_name:
-                frame.tkraise()
-                frame.place(relwidth=1, relheight=1)
-                if hasattr(frame, 'on_show'):
-                    frame.on_show()
-            else:
+        # Picks up data and poster files changed outside this instance; the
+        # data files are read in the background and the frame redrawn if
+        # they had changed
+        self.service.sync_later(self.call_in_ui, self.data_synced)
+        self.service.refresh_posters()
+        self.current_frame = frame_name
+        target = self.get_frame(frame_name)
+        for frame in self.frames.values():
+            if frame is not target:
                 frame.place_forget()
+        if target is not None:
+            target.tkraise()
+            target.place(relwidth=1, relheight=1)
+            if hasattr(target, 'on_show'):
+                with timer(f"ui.on_show.{frame_name}"):
+                    target.on_show()
         self.update_control_buttons()
 
+    def data_synced(self, changed):
+        frame = self.frames.get(self.current_frame)
+        if changed and frame is not None and hasattr(frame, 'on_show'):
+            frame.on_show()
+
     def update_control_buttons(self):
         if self.is_admin:
             self.admin_btn.place(x=10, y=10)
+            self.perf_btn.place(x=10, y=60)
             self.theme_btn.place_forget()
         elif self.current_user:
             self.theme_btn.place(x=10, y=10)
             self.admin_btn.place_forget()
+            self.perf_btn.place_forget()
         else:
             self.theme_btn.place_forget()
             self.admin_btn.place_forget()
+            self.perf_btn.place_forget()
 
     def toggle_theme(self):
         messagebox.showinfo("Theme", "Theme toggling will be implemented in a future version")
 
-    def login_user(self, username, password):
-        if username in self.users and self.verify_password(password, self.users[username]["password"]):
-            self.current_user = username
-            self.is_admin = (username == "admin")
-            self.ratings.setdefault(username, {})
-            self.friends.setdefault(username, {"friends": [], "requests_sent": [], "requests_received": []})
-            self.show_frame("movies")
-            return True
-        return False
+    def login_user(self, username, credentials):
+        # credentials come from service.check_password, run on the auth pool
+        self.service.complete_login(username, *credentials)
+        self.current_user = username
+        self.is_admin = self.service.is_admin(username)
+        self.show_frame("movies")
+        # Build the search index now rather than on the first keystroke
+        future = self.search_executor.submit(self.service.prepare_search)
+        future.add_done_callback(self.report_search_index_failure)
+
+    def report_search_index_failure(self, future):
+        # On the search worker; a failed build is retried by the next search
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Failed to build the search index: {future.exception()}")
 
     def logout_user(self):
         self.current_user = None
@@ -287,61 +534,17 @@ class MovieMateApp:
         self.show_frame("login")
 
     def export_ratings(self, username):
-        data = self.ratings.get(username, {})
-        if not data:
+        if not self.service.user_ratings(username):
             messagebox.showinfo("No Data", "No ratings to export.")
             return
 
         path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json"), ("All files", "*.*")])
         if path:
             try:
-                with open(path, "w") as f:
-                    json.dump(data, f, indent=4)
+                self.service.export_ratings(username, path)
                 messagebox.showinfo("Exported", f"Ratings saved to {path}")
-            except IOError as e:
-                messagebox.showerror("Error", f"Failed to export: {str(e)}")
-
-    def send_friend_request(self, from_user, to_user):
-        if from_user == to_user:
-            return False, "Cannot send friend request to yourself"
-        if to_user not in self.users:
-            return False, "User does not exist"
-        if to_user in self.friends[from_user]["friends"]:
-            return False, "You are already friends"
-        if to_user in self.friends[from_user]["requests_sent"]:
-            return False, "Friend request already sent"
-
-        self.friends[from_user]["requests_sent"].append(to_user)
-        self.friends[to_user]["requests_received"].append(from_user)
-        self.save_data(self.friends, FRIENDS_FILE)
-        return True, "Friend request sent successfully"
-
-    def accept_friend_request(self, from_user, to_user):
-        if from_user not in self.friends[to_user]["requests_received"]:
-            return False, "No friend request from this user"
-
-        self.friends[to_user]["requests_received"].remove(from_user)
-        self.friends[from_user]["requests_sent"].remove(to_user)
-        self.friends[to_user]["friends"].append(from_user)
-        self.friends[from_user]["friends"].append(to_user)
-        self.save_data(self.friends, FRIENDS_FILE)
-        return True, "Friend request accepted"
-
-    def reject_friend_request(self, from_user, to_user):
-        if from_user not in self.friends[to_user]["requests_received"]:
-            return False, "No friend request from this user"
-
-        self.friends[to_user]["requests_received"].remove(from_user)
-        self.friends[from_user]["requests_sent"].remove(to_user)
-        self.save_data(self.friends, FRIENDS_FILE)
-        return True, "Friend request rejected"
-
-    def get_movie_genre(self, title):
-        for genre, movies in self.movie_db.items():
-            for movie in movies:
-                if movie["title"] == title:
-                    return genre
-        return None
+            except ServiceError as e:
+                messagebox.showerror("Error", str(e))
 
 class LoginFrame(tk.Frame):
     def __init__(self, app):
@@ -374,13 +577,24 @@ class LoginFrame(tk.Frame):
         btn_frame = tk.Frame(center_frame, bg=THEME["bg"])
         btn_frame.pack(pady=20)
 
-        tk.Button(btn_frame, text="Login", font=("Helvetica", 16), width=15, height=1,
-                  command=self.login, bg=THEME["btn_bg"], fg=THEME["btn_fg"]).pack(side="left", padx=10, pady=10)
-        tk.Button(btn_frame, text="Sign Up", font=("Helvetica", 16), width=15, height=1,
-                  command=self.signup, bg=THEME["btn_bg"], fg=THEME["btn_fg"]).pack(side="left", padx=10, pady=10)
+        self.login_btn = tk.Button(btn_frame, text="Login", font=("Helvetica", 16), width=15, height=1,
+                                   command=self.login, bg=THEME["btn_bg"], fg=THEME["btn_fg"])
+        self.login_btn.pack(side="left", padx=10, pady=10)
+        self.signup_btn = tk.Button(btn_frame, text="Sign Up", font=("Helvetica", 16), width=15, height=1,
+                                    command=self.signup, bg=THEME["btn_bg"], fg=THEME["btn_fg"])
+        self.signup_btn.pack(side="left", padx=10, pady=10)
+
+        self.status_label = tk.Label(center_frame, font=("Helvetica", 14), bg=THEME["bg"], fg=THEME["fg"])
+        self.status_label.pack()
 
         self.place(relwidth=1, relheight=1)
 
+    def set_busy(self, message=""):
+        state = "disabled" if message else "normal"
+        self.login_btn.config(state=state)
+        self.signup_btn.config(state=state)
+        self.status_label.config(text=f"⏳ {message}" if message else "")
+
     def login(self):
         username = self.username_entry.get().strip()
         password = self.password_entry.get()
@@ -389,43 +603,61 @@ class LoginFrame(tk.Frame):
             messagebox.showerror("Error", "Username and password are required")
             return
 
-        if self.app.login_user(username, password):
-            self.username_entry.delete(0, tk.END)
-            self.password_entry.delete(0, tk.END)
-        else:
-            messagebox.showerror("Login Failed", "Invalid username or password")
+        self.set_busy("Logging in...")
+        self.app.run_auth(self.app.service.check_password,
+                          lambda credentials: self.finish_login(username, credentials),
+                          self.login_failed, username, password)
+
+    def finish_login(self, username, credentials):
+        self.set_busy()
+        try:
+            self.app.login_user(username, credentials)
+        except ServiceError as e:
+            self.login_failed(e)
+            return
+        self.username_entry.delete(0, tk.END)
+        self.password_entry.delete(0, tk.END)
+
+    def login_failed(self, error):
+        self.set_busy()
+        messagebox.showerror("Login Failed", str(error))
 
     def signup(self):
         username = self.username_entry.get().strip()
         password = self.password_entry.get()
 
-        if not username or not password:
-            messagebox.showerror("Error", "Username and password are required")
+        try:
+            self.app.service.validate_signup(username, password)
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
             return
 
-        if username.lower() == "admin":
-            messagebox.showerror("Error", "Cannot create admin account")
-        elif username in self.app.users:
-            messagebox.showerror("Error", "Username already exists")
-        elif len(password) < 6:
-            messagebox.showerror("Error", "Password must be at least 6 characters")
-        else:
-            self.app.users[username] = {
-                "password": self.app.hash_password(password),
-                "joined": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            self.app.ratings[username] = {}
-            self.app.friends[username] = {"friends": [], "requests_sent": [], "requests_received": []}
-            if self.app.save_data(self.app.users, USERS_FILE) and self.app.save_data(self.app.ratings, RATINGS_FILE) and self.app.save_data(self.app.friends, FRIENDS_FILE):
-                messagebox.showinfo("Success", "Account created successfully!")
-                self.username_entry.delete(0, tk.END)
-                self.password_entry.delete(0, tk.END)
+        self.set_busy("Creating account...")
+        self.app.run_auth(hash_password, lambda hashed: self.finish_signup(username, hashed),
+                          self.signup_failed, password)
+
+    def finish_signup(self, username, hashed):
+        self.set_busy()
+        try:
+            self.app.service.create_user(username, hashed)
+        except ServiceError as e:
+            self.signup_failed(e)
+            return
+        messagebox.showinfo("Success", "Account created successfully!")
+        self.username_entry.delete(0, tk.END)
+        self.password_entry.delete(0, tk.END)
+
+    def signup_failed(self, error):
+        self.set_busy()
+        messagebox.showerror("Error", str(error))
 
 class MovieBrowserFrame(tk.Frame):
     def __init__(self, app):
         super().__init__(app.root, bg=THEME["bg"])
         self.app = app
         self.filtered_movies = []
+        self.search_job = None
+        self.search_seq = 0
         self.setup_ui()
 
     def setup_ui(self):
@@ -441,6 +673,14 @@ class MovieBrowserFrame(tk.Frame):
         tk.Button(nav_frame, text="⚙️ Account", command=lambda: self.app.show_frame("account"),
                   bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 14)).pack(side="left")
 
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(nav_frame, textvariable=self.search_var, font=("Helvetica", 14),
+                                bg=THEME["entry_bg"], fg=THEME["entry_fg"], width=25)
+        search_entry.pack(side="right", padx=10)
+        search_entry.bind("<KeyRelease>", self.on_search_key)
+        tk.Label(nav_frame, text="🔍", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 14)).pack(side="right")
+
         self.genre_var = tk.StringVar(value="All")
         self.filter_frame = tk.Frame(self, bg=THEME["bg"])
         self.filter_frame.pack(fill="x", pady=5)
@@ -451,27 +691,17 @@ class MovieBrowserFrame(tk.Frame):
         self.genre_buttons = []
         self.update_genre_filters()
 
-        self.canvas = tk.Canvas(self, bg=THEME["bg"], highlightthickness=0)
-        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        self.scrollbar.pack(side="right", fill="y")
-        self.canvas.pack(side="left", fill="both", expand=True)
-
-        self.grid_frame = tk.Frame(self.canvas, bg=THEME["bg"])
-        self.canvas.create_window((0, 0), window=self.grid_frame, anchor="nw")
-
-        self.grid_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.grid = VirtualMovieGrid(self, self)
+        self.grid.pack(fill="both", expand=True)
 
         self.place(relwidth=1, relheight=1)
-        self.apply_filter()
 
     def update_genre_filters(self):
         for btn in self.genre_buttons:
             btn.destroy()
         self.genre_buttons = []
 
-        genres = ["All"] + sorted(self.app.movie_db.keys())
+        genres = ["All"] + self.app.service.catalog.genres()
         current_genre = self.genre_var.get()
         if current_genre not in genres:
             self.genre_var.set("All")
@@ -483,86 +713,76 @@ class MovieBrowserFrame(tk.Frame):
             btn.pack(side="left", padx=5)
             self.genre_buttons.append(btn)
 
+    def on_search_key(self, event=None):
+        # Wait for a pause in typing before searching
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self.apply_filter)
+
     def apply_filter(self):
+        self.search_job = None
+        # Results of any search still running are now stale
+        self.search_seq += 1
         genre = self.genre_var.get()
-        if genre == "All":
-            self.filtered_movies = [m for genre_movies in self.app.movie_db.values() for m in genre_movies]
-        else:
-            self.filtered_movies = self.app.movie_db.get(genre, [])
-
-        for widget in self.grid_frame.winfo_children():
-            widget.destroy()
-        self.display_movies()
-
-    def display_movies(self):
-        if not self.filtered_movies:
-            tk.Label(self.grid_frame, text=f"No movies found in {self.genre_var.get() if self.genre_var.get() != 'All' else 'database'}",
-                     bg=THEME["bg"], fg=THEME["fg"], font=("Helvetica", 14)).pack(pady=50)
+        query = self.search_var.get().strip()
+        if query:
+            self.run_search(query, None if genre == "All" else genre)
             return
+        self.filtered_movies = self.app.service.catalog.movies(None if genre == "All" else genre)
 
-        columns = 5
-        for i, movie in enumerate(self.filtered_movies):
-            row = i // columns
-            col = i % columns
-            card = self.create_movie_card(movie)
-            card.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
-            self.grid_frame.grid_columnconfigure(col, weight=1)
+        self.display_movies()
 
-    def create_movie_card(self, movie):
-        card = tk.Frame(self.grid_frame, width=200, height=280, bg=THEME["card_bg"], bd=2, relief="groove")
-        card.grid_propagate(False)
+    def run_search(self, query, genre):
+        seq = self.search_seq
+        future = self.app.search_executor.submit(self.app.service.search_movies, query, genre)
+        future.add_done_callback(lambda f: self.app.call_in_ui(self.show_search_results, seq, f))
 
-        card.bind("<Button-1>", lambda e: self.show_movie_detail(movie["title"]))
+    def show_search_results(self, seq, future):
+        if seq != self.search_seq or future.cancelled():
+            return
+        try:
+            self.filtered_movies = future.result()
+        except Exception as e:
+            print(f"Search failed: {e}")
+            return
+        self.display_movies()
 
-        poster_path = self.app.poster_map.get(movie["title"])
-        poster_label = tk.Label(card, bg=THEME["card_bg"])
-        if poster_path and os.path.exists(poster_path):
-            try:
-                img = Image.open(poster_path)
-                img = img.resize((120, 160), Image.LANCZOS)
-                img = ImageTk.PhotoImage(img)
-                poster_label.config(image=img)
-                poster_label.image = img
-            except Exception as e:
-                print(f"Error loading poster: {e}")
-                poster_label.config(text="No Image", height=8, bg=THEME["card_bg"], fg=THEME["card_fg"], font=("Helvetica", 10))
+    @timed("ui.display_movies")
+    def display_movies(self):
+        self.app.poster_loader.cancel(self)
+        genre = self.genre_var.get()
+        if self.search_var.get().strip():
+            empty_message = f"No movies match \"{self.search_var.get().strip()}\""
         else:
-            poster_label.config(text="Poster not available", height=8, bg=THEME["card_bg"], fg=THEME["card_fg"], font=("Helvetica", 10))
-        poster_label.pack()
-
-        tk.Label(card, text=movie["title"], wraplength=160, font=("Helvetica", 11, "bold"),
-                 bg=THEME["card_bg"], fg=THEME["card_fg"]).pack(pady=(5, 0))
-        tk.Label(card, text=f"({movie.get('year', 'N/A')})", font=("Helvetica", 9),
-                 bg=THEME["card_bg"], fg=THEME["card_fg"]).pack()
+            empty_message = f"No movies found in {genre if genre != 'All' else 'database'}"
+        self.grid.set_items(self.filtered_movies, empty_message)
 
-        self.add_rating_controls(card, movie["title"])
-        return card
-
-    def add_rating_controls(self, card, title):
-        btn_frame = tk.Frame(card, bg=THEME["card_bg"])
-        btn_frame.pack(pady=5)
+    def add_rating_controls(self, btn_frame, movie):
+        for widget in btn_frame.winfo_children():
+            widget.destroy()
 
-        user_rating = self.app.ratings.get(self.app.current_user, {}).get(title)
+        user_rating = self.app.service.rating_of(self.app.current_user, movie["id"])
         if user_rating is not None:
             rating_text = "👍" if user_rating == 1 else "👎"
             tk.Label(btn_frame, text=rating_text, font=("Helvetica", 12),
                      bg=THEME["card_bg"], fg=THEME["card_fg"]).pack()
         else:
-            tk.Button(btn_frame, text="👍", width=3, command=lambda: self.rate_movie(title, 1),
+            tk.Button(btn_frame, text="👍", width=3, command=lambda: self.rate_movie(movie, 1),
                       bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 10)).pack(side="left", padx=2)
-            tk.Button(btn_frame, text="👎", width=3, command=lambda: self.rate_movie(title, 0),
+            tk.Button(btn_frame, text="👎", width=3, command=lambda: self.rate_movie(movie, 0),
                       bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 10)).pack(side="left", padx=2)
 
     def show_movie_detail(self, movie_title):
-        self.app.frames["movie_detail"].load_movie(movie_title)
+        self.app.get_frame("movie_detail").load_movie(movie_title)
         self.app.show_frame("movie_detail")
 
-    def rate_movie(self, title, rating):
-        self.app.ratings[self.app.current_user][title] = rating
-        if self.app.save_data(self.app.ratings, RATINGS_FILE):
-            for widget in self.grid_frame.winfo_children():
-                widget.destroy()
-            self.display_movies()
+    def rate_movie(self, movie, rating):
+        try:
+            self.app.service.set_rating(self.app.current_user, movie["id"], rating)
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.grid.update_item(movie["id"])
 
     def on_show(self):
         self.update_genre_filters()
@@ -597,13 +817,13 @@ class ProfileFrame(tk.Frame):
         for widget in self.ratings_frame.winfo_children():
             widget.destroy()
 
-        user_ratings = self.app.ratings.get(self.app.current_user, {})
-        if not user_ratings:
+        rated_movies = self.app.service.rated_movies(self.app.current_user)
+        if not rated_movies:
             tk.Label(self.ratings_frame, text="You haven't rated any movies yet.",
                      bg=THEME["bg"], fg=THEME["fg"], font=("Helvetica", 14)).pack(pady=20)
             return
 
-        sorted_ratings = sorted(user_ratings.items(), key=lambda x: (-x[1], x[0]))
+        sorted_ratings = sorted(rated_movies, key=lambda x: (-x[1], x[0]["title"]))
         for movie, rating in sorted_ratings:
             rating_frame = tk.Frame(self.ratings_frame, bg=THEME["card_bg"], bd=1, relief="groove")
             rating_frame.pack(fill="x", pady=2, padx=10)
@@ -612,25 +832,18 @@ class ProfileFrame(tk.Frame):
             tk.Label(rating_frame, text=rating_icon, font=("Helvetica", 14),
                      bg=THEME["card_bg"], fg=THEME["card_fg"]).pack(side="left", padx=5)
 
-            movie_label = tk.Label(rating_frame, text=movie, font=("Helvetica", 14),
+            movie_label = tk.Label(rating_frame, text=movie["title"], font=("Helvetica", 14),
                                    bg=THEME["card_bg"], fg=THEME["highlight"], cursor="hand2")
             movie_label.pack(side="left", padx=5)
-            movie_label.bind("<Button-1>", lambda e, m=movie: self.show_movie_detail(m))
+            movie_label.bind("<Button-1>", lambda e, m=movie["title"]: self.show_movie_detail(m))
 
-            movie_year = self.get_movie_year(movie)
+            movie_year = movie.get("year", "")
             if movie_year:
                 tk.Label(rating_frame, text=f"({movie_year})", bg=THEME["card_bg"], fg=THEME["card_fg"],
                          font=("Helvetica", 14)).pack(side="left", padx=5)
 
-    def get_movie_year(self, title):
-        for genre in self.app.movie_db.values():
-            for movie in genre:
-                if movie["title"] == title:
-                    return movie.get("year", "")
-        return ""
-
     def show_movie_detail(self, movie_title):
-        self.app.frames["movie_detail"].load_movie(movie_title)
+        self.app.get_frame("movie_detail").load_movie(movie_title)
         self.app.show_frame("movie_detail")
 
     def on_show(self):
@@ -648,119 +861,42 @@ class RecommendationsFrame(tk.Frame):
         tk.Button(self, text="🔙 Back", command=lambda: self.app.show_frame("movies"),
                   bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 14)).pack(anchor="nw", padx=10, pady=10)
 
-        self.canvas = tk.Canvas(self, bg=THEME["bg"], highlightthickness=0)
-        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        self.scrollbar.pack(side="right", fill="y")
-        self.canvas.pack(side="left", fill="both", expand=True)
-
-        self.grid_frame = tk.Frame(self.canvas, bg=THEME["bg"])
-        self.canvas.create_window((0, 0), window=self.grid_frame, anchor="nw")
-
-        self.grid_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.grid = VirtualMovieGrid(self, self)
+        self.grid.pack(fill="both", expand=True)
         self.place(relwidth=1, relheight=1)
 
-    def get_recommendations(self):
-        user_ratings = self.app.ratings.get(self.app.current_user, {})
-        if not user_ratings:
-            return []
-
-        liked_genres = defaultdict(int)
-        for movie_title, rating in user_ratings.items():
-            if rating == 1:  # Liked
-                genre = self.app.get_movie_genre(movie_title)
-                if genre:
-                    liked_genres[genre] += 1
-
-        if not liked_genres:
-            return []
-
-        sorted_genres = sorted(liked_genres.items(), key=lambda x: x[1], reverse=True)
-
-        recommended_movies = []
-        for genre, _ in sorted_genres:
-            for movie in self.app.movie_db.get(genre, []):
-                if movie["title"] not in user_ratings:
-                    recommended_movies.append(movie)
-                if len(recommended_movies) >= 10:
-                    break
-            if len(recommended_movies) >= 10:
-                break
-
-        return recommended_movies
-
+    @timed("ui.display_recommendations")
     def display_recommendations(self):
-        for widget in self.grid_frame.winfo_children():
-            widget.destroy()
-
-        recommended_movies = self.get_recommendations()
-        if not recommended_movies:
-            tk.Label(self.grid_frame, text="No recommendations available. Rate some movies to get started!",
-                     bg=THEME["bg"], fg=THEME["fg"], font=("Helvetica", 14)).pack(pady=50)
-            return
-
-        columns = 5
-        for i, movie in enumerate(recommended_movies):
-            row = i // columns
-            col = i % columns
-            card = self.create_movie_card(movie)
-            card.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
-            self.grid_frame.grid_columnconfigure(col, weight=1)
+        self.app.poster_loader.cancel(self)
+        self.grid.set_items(self.app.service.recommend(self.app.current_user),
+                            "No recommendations available. Rate some movies to get started!")
 
-    def create_movie_card(self, movie):
-        card = tk.Frame(self.grid_frame, width=200, height=280, bg=THEME["card_bg"], bd=2, relief="groove")
-        card.grid_propagate(False)
-
-        card.bind("<Button-1>", lambda e: self.show_movie_detail(movie["title"]))
-
-        poster_path = self.app.poster_map.get(movie["title"])
-        poster_label = tk.Label(card, bg=THEME["card_bg"])
-        if poster_path and os.path.exists(poster_path):
-            try:
-                img = Image.open(poster_path)
-                img = img.resize((120, 160), Image.LANCZOS)
-                img = ImageTk.PhotoImage(img)
-                poster_label.config(image=img)
-                poster_label.image = img
-            except Exception as e:
-                print(f"Error loading poster: {e}")
-                poster_label.config(text="No Image", height=8, bg=THEME["card_bg"], fg=THEME["card_fg"], font=("Helvetica", 10))
-        else:
-            poster_label.config(text="Poster not available", height=8, bg=THEME["card_bg"], fg=THEME["card_fg"], font=("Helvetica", 10))
-        poster_label.pack()
-
-        tk.Label(card, text=movie["title"], wraplength=160, font=("Helvetica", 11, "bold"),
-                 bg=THEME["card_bg"], fg=THEME["card_fg"]).pack(pady=(5, 0))
-        tk.Label(card, text=f"({movie.get('year', 'N/A')})", font=("Helvetica", 9),
-                 bg=THEME["card_bg"], fg=THEME["card_fg"]).pack()
-
-        self.add_rating_controls(card, movie["title"])
-        return card
-
-    def add_rating_controls(self, card, title):
-        btn_frame = tk.Frame(card, bg=THEME["card_bg"])
-        btn_frame.pack(pady=5)
+    def add_rating_controls(self, btn_frame, movie):
+        for widget in btn_frame.winfo_children():
+            widget.destroy()
 
-        user_rating = self.app.ratings.get(self.app.current_user, {}).get(title)
+        user_rating = self.app.service.rating_of(self.app.current_user, movie["id"])
         if user_rating is not None:
             rating_text = "👍" if user_rating == 1 else "👎"
             tk.Label(btn_frame, text=rating_text, font=("Helvetica", 12),
                      bg=THEME["card_bg"], fg=THEME["card_fg"]).pack()
         else:
-            tk.Button(btn_frame, text="👍", width=3, command=lambda: self.rate_movie(title, 1),
+            tk.Button(btn_frame, text="👍", width=3, command=lambda: self.rate_movie(movie, 1),
                       bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 10)).pack(side="left", padx=2)
-            tk.Button(btn_frame, text="👎", width=3, command=lambda: self.rate_movie(title, 0),
+            tk.Button(btn_frame, text="👎", width=3, command=lambda: self.rate_movie(movie, 0),
                       bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 10)).pack(side="left", padx=2)
 
     def show_movie_detail(self, movie_title):
-        self.app.frames["movie_detail"].load_movie(movie_title)
+        self.app.get_frame("movie_detail").load_movie(movie_title)
         self.app.show_frame("movie_detail")
 
-    def rate_movie(self, title, rating):
-        self.app.ratings[self.app.current_user][title] = rating
-        if self.app.save_data(self.app.ratings, RATINGS_FILE):
-            self.display_recommendations()
+    def rate_movie(self, movie, rating):
+        try:
+            self.app.service.set_rating(self.app.current_user, movie["id"], rating)
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.grid.update_item(movie["id"])
 
     def on_show(self):
         self.display_recommendations()
@@ -838,7 +974,7 @@ class FriendsFrame(tk.Frame):
         for widget in self.friends_frame.winfo_children():
             widget.destroy()
 
-        friends = self.app.friends.get(self.app.current_user, {}).get("friends", [])
+        friends = self.app.service.friends.friends_of(self.app.current_user)
         if not friends:
             tk.Label(self.friends_frame, text="No friends yet.", bg=THEME["bg"], fg=THEME["fg"],
                      font=("Helvetica", 14)).pack(pady=20)
@@ -865,11 +1001,10 @@ class FriendsFrame(tk.Frame):
         tk.Label(dialog, text=f"👤 {friend}", font=("Helvetica", 18, "bold"),
                  bg=THEME["bg"], fg=THEME["fg"]).pack(pady=10)
 
-        user_data = self.app.users.get(friend, {})
-        friends = self.app.friends.get(friend, {}).get("friends", [])
-        tk.Label(dialog, text=f"Joined: {user_data.get('joined', 'N/A')}", font=("Helvetica", 14),
+        details = self.app.service.user_details(friend)
+        tk.Label(dialog, text=f"Joined: {details['joined']}", font=("Helvetica", 14),
                  bg=THEME["bg"], fg=THEME["fg"]).pack()
-        tk.Label(dialog, text=f"Friends: {len(friends)}", font=("Helvetica", 14),
+        tk.Label(dialog, text=f"Friends: {details['friends']}", font=("Helvetica", 14),
                  bg=THEME["bg"], fg=THEME["fg"]).pack()
 
         tk.Label(dialog, text="Liked Movies:", font=("Helvetica", 16, "bold"),
@@ -886,9 +1021,8 @@ class FriendsFrame(tk.Frame):
         canvas.create_window((0, 0), window=ratings_frame, anchor="nw")
         ratings_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
 
-        user_ratings = self.app.ratings.get(friend, {})
-        liked_movies = [(movie, year) for movie, rating in user_ratings.items() if rating == 1
-                        for genre in self.app.movie_db.values() for m in genre if m["title"] == movie and (year := m.get("year", ""))]
+        catalog = self.app.service.catalog
+        liked_movies = [(movie, year) for movie in details["liked"] if (year := catalog.year_of(movie))]
         if not liked_movies:
             tk.Label(ratings_frame, text="No liked movies yet.", bg=THEME["bg"], fg=THEME["fg"],
                      font=("Helvetica", 14)).pack(pady=20)
@@ -910,14 +1044,12 @@ class FriendsFrame(tk.Frame):
 
     def remove_friend(self, friend):
         if messagebox.askyesno("Confirm", f"Are you sure you want to remove {friend} as a friend?"):
-            self.app.friends[self.app.current_user]["friends"].remove(friend)
-            self.app.friends[friend]["friends"].remove(self.app.current_user)
-            self.app.save_data(self.app.friends, FRIENDS_FILE)
+            self.app.service.remove_friend(self.app.current_user, friend)
             self.load_friends()
             self.load_suggestions()
 
     def show_movie_detail(self, movie_title):
-        self.app.frames["movie_detail"].load_movie(movie_title)
+        self.app.get_frame("movie_detail").load_movie(movie_title)
         self.app.show_frame("movie_detail")
 
     def load_requests(self):
@@ -926,7 +1058,7 @@ class FriendsFrame(tk.Frame):
         for widget in self.sent_frame.winfo_children():
             widget.destroy()
 
-        incoming = self.app.friends.get(self.app.current_user, {}).get("requests_received", [])
+        incoming = list(self.app.service.friends.requests_received(self.app.current_user))
         if not incoming:
             tk.Label(self.incoming_frame, text="No incoming requests.", bg=THEME["bg"], fg=THEME["fg"],
                      font=("Helvetica", 14)).pack(pady=5)
@@ -940,7 +1072,7 @@ class FriendsFrame(tk.Frame):
                 tk.Button(frame, text="Reject", command=lambda u=user: self.reject_request(u),
                           bg="#FF0000", fg="white", font=("Helvetica", 12)).pack(side="left", padx=5)
 
-        sent = self.app.friends.get(self.app.current_user, {}).get("requests_sent", [])
+        sent = list(self.app.service.friends.requests_sent(self.app.current_user))
         if not sent:
             tk.Label(self.sent_frame, text="No sent requests.", bg=THEME["bg"], fg=THEME["fg"],
                      font=("Helvetica", 14)).pack(pady=5)
@@ -949,45 +1081,29 @@ class FriendsFrame(tk.Frame):
                 tk.Label(self.sent_frame, text=f"Pending: {user}", bg=THEME["bg"], fg=THEME["fg"],
                          font=("Helvetica", 14)).pack(anchor="w", padx=5, pady=2)
 
+    @timed("ui.load_suggestions")
     def load_suggestions(self):
         for widget in self.suggestions_frame.winfo_children():
             widget.destroy()
 
-        user_ratings = self.app.ratings.get(self.app.current_user, {})
-        if not user_ratings:
+        ratings = self.app.service.user_ratings(self.app.current_user)
+        if not ratings:
             tk.Label(self.suggestions_frame, text="Rate some movies to get friend suggestions!",
                      bg=THEME["bg"], fg=THEME["fg"], font=("Helvetica", 14)).pack(pady=5)
             return
 
-        liked_movies = set(movie for movie, rating in user_ratings.items() if rating == 1)
-        if not liked_movies:
+        if not ratings.liked_count():
             tk.Label(self.suggestions_frame, text="Like some movies to get friend suggestions!",
                      bg=THEME["bg"], fg=THEME["fg"], font=("Helvetica", 14)).pack(pady=5)
             return
 
-        similar_users = []
-        for other_user in self.app.users.keys():
-            if other_user == self.app.current_user or other_user == "admin":
-                continue
-            if other_user in self.app.friends[self.app.current_user]["friends"]:
-                continue
-            if other_user in self.app.friends[self.app.current_user]["requests_sent"]:
-                continue
-
-            other_ratings = self.app.ratings.get(other_user, {})
-            other_liked = set(movie for movie, rating in other_ratings.items() if rating == 1)
-            common_likes = liked_movies & other_liked
-            if common_likes:
-                similarity = len(common_likes)
-                similar_users.append((other_user, similarity, common_likes))
-
-        similar_users.sort(key=lambda x: x[1], reverse=True)
+        similar_users = self.app.service.friend_suggestions(self.app.current_user, k=5)
         if not similar_users:
             tk.Label(self.suggestions_frame, text="No users with similar interests found.",
                      bg=THEME["bg"], fg=THEME["fg"], font=("Helvetica", 14)).pack(pady=5)
             return
 
-        for user, similarity, common in similar_users[:5]:
+        for user, similarity in similar_users:
             frame = tk.Frame(self.suggestions_frame, bg=THEME["bg"])
             frame.pack(fill="x", pady=2)
             tk.Label(frame, text=f"{user} (Common Likes: {similarity})", bg=THEME["bg"], fg=THEME["fg"],
@@ -996,26 +1112,35 @@ class FriendsFrame(tk.Frame):
                       bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(side="left", padx=5)
 
     def send_request(self, to_user):
-        success, message = self.app.send_friend_request(self.app.current_user, to_user)
-        messagebox.showinfo("Result", message)
-        if success:
-            self.load_requests()
-            self.load_suggestions()
+        try:
+            self.app.service.send_friend_request(self.app.current_user, to_user)
+        except ServiceError as e:
+            messagebox.showinfo("Result", str(e))
+            return
+        messagebox.showinfo("Result", "Friend request sent successfully")
+        self.load_requests()
+        self.load_suggestions()
 
     def accept_request(self, from_user):
-        success, message = self.app.accept_friend_request(from_user, self.app.current_user)
-        messagebox.showinfo("Result", message)
-        if success:
-            self.load_friends()
-            self.load_requests()
-            self.load_suggestions()
+        try:
+            self.app.service.accept_friend_request(from_user, self.app.current_user)
+        except ServiceError as e:
+            messagebox.showinfo("Result", str(e))
+            return
+        messagebox.showinfo("Result", "Friend request accepted")
+        self.load_friends()
+        self.load_requests()
+        self.load_suggestions()
 
     def reject_request(self, from_user):
-        success, message = self.app.reject_friend_request(from_user, self.app.current_user)
-        messagebox.showinfo("Result", message)
-        if success:
-            self.load_requests()
-            self.load_suggestions()
+        try:
+            self.app.service.reject_friend_request(from_user, self.app.current_user)
+        except ServiceError as e:
+            messagebox.showinfo("Result", str(e))
+            return
+        messagebox.showinfo("Result", "Friend request rejected")
+        self.load_requests()
+        self.load_suggestions()
 
     def on_show(self):
         self.load_friends()
@@ -1056,14 +1181,11 @@ class AccountFrame(tk.Frame):
         if not self.app.current_user:
             return
 
-        user_data = self.app.users[self.app.current_user]
-        ratings = self.app.ratings.get(self.app.current_user, {})
-        friends = self.app.friends.get(self.app.current_user, {}).get("friends", [])
-        self.info_label.config(text=f"👤 {self.app.current_user}\nJoined: {user_data['joined']}\nFriends: {len(friends)}")
+        details = self.app.service.user_details(self.app.current_user)
+        self.info_label.config(text=f"👤 {self.app.current_user}\nJoined: {details['joined']}\nFriends: {details['friends']}")
 
-        liked = sum(1 for r in ratings.values() if r == 1)
-        disliked = sum(1 for r in ratings.values() if r == 0)
-        self.stats_label.config(text=f"🎞️ Rated: {len(ratings)}\n👍 Liked: {liked}\n👎 Disliked: {disliked}")
+        rated, liked, disliked = self.app.service.rating_counts(self.app.current_user)
+        self.stats_label.config(text=f"🎞️ Rated: {rated}\n👍 Liked: {liked}\n👎 Disliked: {disliked}")
 
     def change_password(self):
         dialog = tk.Toplevel(self)
@@ -1083,24 +1205,40 @@ class AccountFrame(tk.Frame):
                           font=("Helvetica", 14))
         new_pw.pack(pady=5)
 
+        username = self.app.current_user
+
         def submit():
-            current = current_pw.get()
             new = new_pw.get()
+            try:
+                self.app.service.validate_password(new)
+            except ServiceError as e:
+                messagebox.showerror("Error", str(e))
+                return
 
-            if not self.app.verify_password(current, self.app.users[self.app.current_user]["password"]):
-                messagebox.showerror("Error", "Incorrect current password")
-            elif not new:
-                messagebox.showerror("Error", "New password cannot be empty")
-            elif len(new) < 6:
-                messagebox.showerror("Error", "Password must be at least 6 characters")
-            else:
-                self.app.users[self.app.current_user]["password"] = self.app.hash_password(new)
-                if self.app.save_data(self.app.users, USERS_FILE):
-                    dialog.destroy()
-                    messagebox.showinfo("Success", "Password changed successfully")
+            submit_btn.config(state="disabled")
+            status_label.config(text="⏳ Checking password...")
+            self.app.run_auth(self.app.service.check_password_change, finish, failed,
+                              username, current_pw.get(), new)
 
-        tk.Button(dialog, text="Submit", command=submit,
-                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 14)).pack(pady=10)
+        def finish(new_hash):
+            if not dialog.winfo_exists():
+                return
+            self.app.service.set_password_hash(username, new_hash)
+            dialog.destroy()
+            messagebox.showinfo("Success", "Password changed successfully")
+
+        def failed(error):
+            if not dialog.winfo_exists():
+                return
+            submit_btn.config(state="normal")
+            status_label.config(text="")
+            messagebox.showerror("Error", str(error))
+
+        submit_btn = tk.Button(dialog, text="Submit", command=submit,
+                               bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 14))
+        submit_btn.pack(pady=10)
+        status_label = tk.Label(dialog, bg=THEME["bg"], fg=THEME["fg"], font=("Helvetica", 12))
+        status_label.pack(pady=(0, 10))
 
     def export_ratings(self):
         self.app.export_ratings(self.app.current_user)
@@ -1174,20 +1312,11 @@ class MovieDetailFrame(tk.Frame):
         self.place(relwidth=1, relheight=1)
 
     def load_movie(self, title):
-        self.current_movie = None
-        self.current_genre = None
-
-        for genre, movies in self.app.movie_db.items():
-            for movie in movies:
-                if movie["title"] == title:
-                    self.current_movie = movie
-                    self.current_genre = genre
-                    break
-            if self.current_movie:
-                break
-
-        if not self.current_movie:
-            messagebox.showerror("Error", "Movie not found")
+        try:
+            self.current_movie, self.current_genre = self.app.service.find_movie(title)
+        except NotFoundError as e:
+            self.current_movie = self.current_genre = None
+            messagebox.showerror("Error", str(e))
             self.app.show_frame("movies")
             return
 
@@ -1196,11 +1325,10 @@ class MovieDetailFrame(tk.Frame):
         self.genre_label.config(text=f"Genre: {self.current_genre}")
         self.desc_label.config(text=self.current_movie.get("description", "No description available"))
 
-        poster_path = self.app.poster_map.get(title)
-        if poster_path and os.path.exists(poster_path):
+        poster_path, version = self.app.service.poster(title)
+        if poster_path:
             try:
-                img = Image.open(poster_path).resize((250, 375), Image.LANCZOS)
-                img = ImageTk.PhotoImage(img)
+                img = self.app.poster_cache.get(poster_path, version, DETAIL_POSTER_SIZE)
                 self.poster_label.config(image=img)
                 self.poster_label.image = img
             except Exception as e:
@@ -1217,7 +1345,7 @@ class MovieDetailFrame(tk.Frame):
         if not self.current_movie or not self.app.current_user:
             return
 
-        rating = self.app.ratings.get(self.app.current_user, {}).get(self.current_movie["title"])
+        rating = self.app.service.rating_of(self.app.current_user, self.current_movie["id"])
         if rating is not None:
             status = "👍 Liked" if rating == 1 else "👎 Disliked"
             self.rating_status.config(text=status)
@@ -1228,218 +1356,379 @@ class MovieDetailFrame(tk.Frame):
         if not self.current_movie or not self.app.current_user:
             return
 
-        title = self.current_movie["title"]
-        if rating is None:
-            if title in self.app.ratings[self.app.current_user]:
-                del self.app.ratings[self.app.current_user][title]
-        else:
-            self.app.ratings[self.app.current_user][title] = rating
+        try:
+            self.app.service.set_rating(self.app.current_user, self.current_movie["id"], rating)
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.update_rating_display()
 
-        if self.app.save_data(self.app.ratings, RATINGS_FILE):
-            self.update_rating_display()
-def setup_movies_tab(self):
-    list_frame = tk.Frame(self.movies_tab, bg=THEME["bg"])
-    list_frame.pack(fill="both", expand=True, padx=10, pady=10)
+class PerformanceFrame(tk.Frame):
+    # Admin-only view of the timing registry. Timing is off unless
+    # MOVIEMATE_PROFILE=1 or it is switched on here.
+    COLUMNS = ("count", "mean_ms", "p50_ms", "p95_ms", "max_ms", "total_ms")
 
-    scrollbar = tk.Scrollbar(list_frame)
-    scrollbar.pack(side="right", fill="y")
+    def __init__(self, app):
+        super().__init__(app.root, bg=THEME["bg"])
+        self.app = app
+        self.setup_ui()
 
-    self.movie_list = tk.Listbox(list_frame, yscrollcommand=scrollbar.set,
-                                 bg=THEME["entry_bg"], fg=THEME["entry_fg"],
-                                 selectbackground=THEME["highlight"], font=("Helvetica", 14))
-    self.movie_list.pack(side="left", fill="both", expand=True)
-    scrollbar.config(command=self.movie_list.yview)
+    def setup_ui(self):
+        tk.Label(self, text="📊 Performance", font=("Helvetica", 18, "bold"),
+                 bg=THEME["bg"], fg=THEME["fg"]).pack(pady=10)
+        tk.Button(self, text="🔙 Back", command=lambda: self.app.show_frame("movies"),
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 14)).pack(anchor="nw", padx=10, pady=10)
 
-    controls_frame = tk.Frame(self.movies_tab, bg=THEME["bg"])
-    controls_frame.pack(fill="x", padx=10, pady=5)
+        btn_frame = tk.Frame(self, bg=THEME["bg"])
+        btn_frame.pack(fill="x", padx=10, pady=5)
 
-    add_frame = tk.Frame(controls_frame, bg=THEME["bg"])
-    add_frame.pack(side="left", padx=10)
+        self.enabled_var = tk.BooleanVar(value=timings.enabled)
+        tk.Checkbutton(btn_frame, text="Record timings", variable=self.enabled_var, command=self.toggle,
+                       bg=THEME["bg"], fg=THEME["fg"], selectcolor=THEME["btn_bg"],
+                       font=("Helvetica", 14)).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Refresh", command=self.refresh,
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Reset", command=self.reset,
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Dump to JSON", command=self.dump,
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(side="left", padx=5)
 
-    tk.Label(add_frame, text="Add New Movie:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 14)).pack(anchor="w")
+        self.cache_label = tk.Label(self, font=("Helvetica", 12), justify="left", bg=THEME["bg"], fg=THEME["fg"])
+        self.cache_label.pack(anchor="w", padx=10, pady=5)
 
-    form_frame = tk.Frame(add_frame, bg=THEME["bg"])
-    form_frame.pack(fill="x", pady=5)
+        table_frame = tk.Frame(self, bg=THEME["bg"])
+        table_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-    tk.Label(form_frame, text="Title:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).grid(row=0, column=0, sticky="e", padx=5, pady=5)
-    self.title_entry = tk.Entry(form_frame, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
-                                font=("Helvetica", 12))
-    self.title_entry.grid(row=0, column=1, padx=5, pady=5)
+        self.table = ttk.Treeview(table_frame, columns=self.COLUMNS)
+        self.table.heading("#0", text="timer")
+        self.table.column("#0", width=300)
+        for column in self.COLUMNS:
+            self.table.heading(column, text=column)
+            self.table.column(column, width=100, anchor="e")
+        scrollbar = tk.Scrollbar(table_frame, orient="vertical", command=self.table.yview)
+        self.table.configure(yscrollcommand=scrollbar.set)
 
-    tk.Label(form_frame, text="Year:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).grid(row=1, column=0, sticky="e", padx=5, pady=5)
-    self.year_entry = tk.Entry(form_frame, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
-                               font=("Helvetica", 12))
-    self.year_entry.grid(row=1, column=1, padx=5, pady=5)
-
-    tk.Label(form_frame, text="Genre:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).grid(row=2, column=0, sticky="e", padx=5, pady=5)
-    self.genre_combobox = ttk.Combobox(form_frame, values=sorted(self.app.movie_db.keys()),
-                                       font=("Helvetica", 12), state="readonly")
-    self.genre_combobox.grid(row=2, column=1, padx=5, pady=5)
-    self.genre_combobox.set("Action")  # Default genre
-
-    tk.Label(form_frame, text="Description:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).grid(row=3, column=0, sticky="e", padx=5, pady=5)
-    self.desc_entry = tk.Entry(form_frame, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
-                               font=("Helvetica", 12))
-    self.desc_entry.grid(row=3, column=1, padx=5, pady=5)
-
-    tk.Label(form_frame, text="Poster:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).grid(row=4, column=0, sticky="e", padx=5, pady=5)
-    self.poster_button = tk.Button(form_frame, text="Choose File", command=self.choose_poster,
-                                   bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12))
-    self.poster_button.grid(row=4, column=1, padx=5, pady=5, sticky="w")
-
-    tk.Button(add_frame, text="Add Movie", command=self.add_movie,
-              bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(pady=10)
-
-    action_frame = tk.Frame(controls_frame, bg=THEME["bg"])
-    action_frame.pack(side="left", padx=10)
-
-    tk.Label(action_frame, text="Manage Selected Movie:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 14)).pack(anchor="w")
-    tk.Button(action_frame, text="Edit", command=self.edit_movie,
-              bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(pady=5)
-    tk.Button(action_frame, text="Delete", command=self.delete_movie,
-              bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(pady=5)
-
-    self.movie_list.bind("<<ListboxSelect>>", self.on_movie_select)
-    self.selected_movie = None
-    self.poster_path = None
-
-def setup_users_tab(self):
-    list_frame = tk.Frame(self.users_tab, bg=THEME["bg"])
-    list_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-    scrollbar = tk.Scrollbar(list_frame)
-    scrollbar.pack(side="right", fill="y")
-
-    self.user_list = tk.Listbox(list_frame, yscrollcommand=scrollbar.set,
-                                bg=THEME["entry_bg"], fg=THEME["entry_fg"],
-                                selectbackground=THEME["highlight"], font=("Helvetica", 14))
-    self.user_list.pack(side="left", fill="both", expand=True)
-    scrollbar.config(command=self.user_list.yview)
-
-    controls_frame = tk.Frame(self.users_tab, bg=THEME["bg"])
-    controls_frame.pack(fill="x", padx=10, pady=5)
-
-    tk.Label(controls_frame, text="Manage Users:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 14)).pack(anchor="w")
-    tk.Button(controls_frame, text="View Details", command=self.view_user_details,
-              bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(anchor="w", pady=5)
-    tk.Button(controls_frame, text="Delete User", command=self.delete_user,
-              bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(anchor="w", pady=5)
-
-    self.user_list.bind("<<ListboxSelect>>", self.on_user_select)
-    self.selected_user = None
-
-def on_show(self):
-    if not self.app.is_admin:
-        messagebox.showerror("Access Denied", "Only admin can access this page")
-        self.app.show_frame("movies")
-        return
-    self.load_movies()
-    self.load_users()
-
-def load_movies(self):
-    self.movie_list.delete(0, tk.END)
-    for genre, movies in sorted(self.app.movie_db.items()):
-        for movie in sorted(movies, key=lambda x: x["title"]):
-            self.movie_list.insert(tk.END, f"{movie['title']} ({movie['year']}) - {genre}")
-
-def load_users(self):
-    self.user_list.delete(0, tk.END)
-    for user in sorted(self.app.users.keys()):
-        if user != "admin":  # Exclude admin from list
-            self.user_list.insert(tk.END, user)
+        scrollbar.pack(side="right", fill="y")
+        self.table.pack(side="left", fill="both", expand=True)
 
-def on_movie_select(self, event):
-    selection = self.movie_list.curselection()
-    if selection:
-        index = selection[0]
-        movie_str = self.movie_list.get(index)
-        # Extract title from string like "Title (Year) - Genre"
-        title = movie_str.split(" (")[0]
-        self.selected_movie = None
-        for genre, movies in self.app.movie_db.items():
-            for movie in movies:
-                if movie["title"] == title:
-                    self.selected_movie = (movie, genre)
-                    break
-            if self.selected_movie:
-                break
-    else:
+        self.place(relwidth=1, relheight=1)
+
+    def refresh(self):
+        self.table.delete(*self.table.get_children())
+        for name, stats in timings.snapshot().items():
+            self.table.insert("", tk.END, text=name, values=[stats[column] for column in self.COLUMNS])
+
+        cache = self.app.poster_cache.stats()
+        recommendations = self.app.service.recommendation_cache.stats()
+        self.cache_label.config(text=f"Poster cache: {cache['entries']} images, "
+                                     f"{cache['bytes'] / (1024 * 1024):.1f} MB, "
+                                     f"hit rate {cache['hit_rate']:.0%}, {cache['evictions']} evictions\n"
+                                     f"Recommendation cache: {recommendations['entries']} users, "
+                                     f"hit rate {recommendations['hit_rate']:.0%}, "
+                                     f"{recommendations['evictions']} evictions")
+
+    def toggle(self):
+        timings.enabled = self.enabled_var.get()
+
+    def reset(self):
+        timings.reset()
+        self.refresh()
+
+    def dump(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json"), ("All files", "*.*")])
+        if path:
+            try:
+                timings.dump(path)
+                messagebox.showinfo("Exported", f"Timings saved to {path}")
+            except IOError as e:
+                messagebox.showerror("Error", f"Failed to export: {str(e)}")
+
+    def on_show(self):
+        if not self.app.is_admin:
+            messagebox.showerror("Access Denied", "Only admin can access this page")
+            self.app.show_frame("movies")
+            return
+        self.enabled_var.set(timings.enabled)
+        self.refresh()
+
+class AdminFrame(tk.Frame):
+    def __init__(self, app):
+        super().__init__(app.root, bg=THEME["bg"])
+        self.app = app
+        self.importer = None
+        self.movie_search_job = None
+        self.movie_search_seq = 0
+        self.setup_ui()
+
+    def setup_ui(self):
+        tk.Label(self, text="🛡️ Admin", font=("Helvetica", 18, "bold"),
+                 bg=THEME["bg"], fg=THEME["fg"]).pack(pady=10)
+        tk.Button(self, text="🔙 Back", command=lambda: self.app.show_frame("movies"),
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 14)).pack(anchor="nw", padx=10, pady=10)
+
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.movies_tab = tk.Frame(self.notebook, bg=THEME["bg"])
+        self.users_tab = tk.Frame(self.notebook, bg=THEME["bg"])
+
+        self.notebook.add(self.movies_tab, text="Movies")
+        self.notebook.add(self.users_tab, text="Users")
+
+        self.setup_movies_tab()
+        self.setup_users_tab()
+
+        self.place(relwidth=1, relheight=1)
+
+    def setup_movies_tab(self):
+        search_frame = tk.Frame(self.movies_tab, bg=THEME["bg"])
+        search_frame.pack(fill="x", padx=10, pady=(10, 0))
+        tk.Label(search_frame, text="🔍", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 14)).pack(side="left")
+        self.movie_search_var = tk.StringVar()
+        movie_search_entry = tk.Entry(search_frame, textvariable=self.movie_search_var, font=("Helvetica", 14),
+                                      bg=THEME["entry_bg"], fg=THEME["entry_fg"], width=30)
+        movie_search_entry.pack(side="left", padx=10)
+        movie_search_entry.bind("<KeyRelease>", self.on_movie_search_key)
+
+        list_frame = tk.Frame(self.movies_tab, bg=THEME["bg"])
+        list_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        scrollbar = tk.Scrollbar(list_frame)
+        scrollbar.pack(side="right", fill="y")
+
+        # Extended selection so several movies can be deleted at once
+        self.movie_list = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, selectmode=tk.EXTENDED,
+                                     bg=THEME["entry_bg"], fg=THEME["entry_fg"],
+                                     selectbackground=THEME["highlight"], font=("Helvetica", 14))
+        self.movie_list.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.movie_list.yview)
+
+        controls_frame = tk.Frame(self.movies_tab, bg=THEME["bg"])
+        controls_frame.pack(fill="x", padx=10, pady=5)
+
+        add_frame = tk.Frame(controls_frame, bg=THEME["bg"])
+        add_frame.pack(side="left", padx=10)
+
+        tk.Label(add_frame, text="Add New Movie:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 14)).pack(anchor="w")
+
+        form_frame = tk.Frame(add_frame, bg=THEME["bg"])
+        form_frame.pack(fill="x", pady=5)
+
+        tk.Label(form_frame, text="Title:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).grid(row=0, column=0, sticky="e", padx=5, pady=5)
+        self.title_entry = tk.Entry(form_frame, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
+                                    font=("Helvetica", 12))
+        self.title_entry.grid(row=0, column=1, padx=5, pady=5)
+
+        tk.Label(form_frame, text="Year:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).grid(row=1, column=0, sticky="e", padx=5, pady=5)
+        self.year_entry = tk.Entry(form_frame, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
+                                   font=("Helvetica", 12))
+        self.year_entry.grid(row=1, column=1, padx=5, pady=5)
+
+        tk.Label(form_frame, text="Genre:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).grid(row=2, column=0, sticky="e", padx=5, pady=5)
+        self.genre_combobox = ttk.Combobox(form_frame, values=self.app.service.catalog.genres(),
+                                           font=("Helvetica", 12), state="readonly")
+        self.genre_combobox.grid(row=2, column=1, padx=5, pady=5)
+        self.genre_combobox.set("Action")  # Default genre
+
+        tk.Label(form_frame, text="Description:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).grid(row=3, column=0, sticky="e", padx=5, pady=5)
+        self.desc_entry = tk.Entry(form_frame, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
+                                   font=("Helvetica", 12))
+        self.desc_entry.grid(row=3, column=1, padx=5, pady=5)
+
+        tk.Label(form_frame, text="Poster:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).grid(row=4, column=0, sticky="e", padx=5, pady=5)
+        self.poster_button = tk.Button(form_frame, text="Choose File", command=self.choose_poster,
+                                       bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12))
+        self.poster_button.grid(row=4, column=1, padx=5, pady=5, sticky="w")
+
+        tk.Button(add_frame, text="Add Movie", command=self.add_movie,
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(pady=10)
+
+        action_frame = tk.Frame(controls_frame, bg=THEME["bg"])
+        action_frame.pack(side="left", padx=10)
+
+        tk.Label(action_frame, text="Manage Selected Movie:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 14)).pack(anchor="w")
+        tk.Button(action_frame, text="Edit", command=self.edit_movie,
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(pady=5)
+        tk.Button(action_frame, text="Delete", command=self.delete_movie,
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(pady=5)
+
+        import_frame = tk.Frame(controls_frame, bg=THEME["bg"])
+        import_frame.pack(side="left", padx=10)
+
+        tk.Label(import_frame, text="Bulk Import (CSV / JSON Lines):", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 14)).pack(anchor="w")
+        self.import_btn = tk.Button(import_frame, text="Import File", command=self.import_catalog,
+                                    bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12))
+        self.import_btn.pack(pady=5)
+        self.import_progress = ttk.Progressbar(import_frame, length=200, maximum=1.0)
+        self.import_progress.pack(pady=5)
+        self.import_status = tk.Label(import_frame, bg=THEME["bg"], fg=THEME["fg"], font=("Helvetica", 12))
+        self.import_status.pack()
+
+        self.movie_list.bind("<<ListboxSelect>>", self.on_movie_select)
         self.selected_movie = None
+        self.selected_movies = []
+        self.poster_path = None
 
-def on_user_select(self, event):
-    selection = self.user_list.curselection()
-    if selection:
-        self.selected_user = self.user_list.get(selection[0])
-    else:
+    def setup_users_tab(self):
+        list_frame = tk.Frame(self.users_tab, bg=THEME["bg"])
+        list_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        scrollbar = tk.Scrollbar(list_frame)
+        scrollbar.pack(side="right", fill="y")
+
+        self.user_list = tk.Listbox(list_frame, yscrollcommand=scrollbar.set,
+                                    bg=THEME["entry_bg"], fg=THEME["entry_fg"],
+                                    selectbackground=THEME["highlight"], font=("Helvetica", 14))
+        self.user_list.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.user_list.yview)
+
+        controls_frame = tk.Frame(self.users_tab, bg=THEME["bg"])
+        controls_frame.pack(fill="x", padx=10, pady=5)
+
+        tk.Label(controls_frame, text="Manage Users:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 14)).pack(anchor="w")
+        tk.Button(controls_frame, text="View Details", command=self.view_user_details,
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(anchor="w", pady=5)
+        tk.Button(controls_frame, text="Delete User", command=self.delete_user,
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(anchor="w", pady=5)
+
+        self.user_list.bind("<<ListboxSelect>>", self.on_user_select)
         self.selected_user = None
 
-def choose_poster(self):
-    file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.png *.jpeg"), ("All files", "*.*")])
-    if file_path:
-        self.poster_path = file_path
-        self.poster_button.config(text="File Selected")
-
-def add_movie(self):
-    title = self.title_entry.get().strip()
-    year = self.year_entry.get().strip()
-    genre = self.genre_combobox.get()
-    description = self.desc_entry.get().strip()
-    poster = self.poster_path
-
-    if not title or not year or not genre or not description:
-        messagebox.showerror("Error", "All fields except poster are required")
-        return
-
-    if not year.isdigit() or len(year) != 4:
-        messagebox.showerror("Error", "Year must be a 4-digit number")
-        return
-
-    # Check if movie already exists
-    for g, movies in self.app.movie_db.items():
-        for m in movies:
-            if m["title"].lower() == title.lower():
-                messagebox.showerror("Error", "Movie already exists")
-                return
+    def on_show(self):
+        if not self.app.is_admin:
+            messagebox.showerror("Access Denied", "Only admin can access this page")
+            self.app.show_frame("movies")
+            return
+        self.load_movies()
+        self.load_users()
+
+    def on_movie_search_key(self, event=None):
+        # Wait for a pause in typing before searching
+        if self.movie_search_job is not None:
+            self.after_cancel(self.movie_search_job)
+        self.movie_search_job = self.after(SEARCH_DEBOUNCE_MS, self.load_movies)
+
+    def load_movies(self):
+        self.movie_search_job = None
+        # Results of any search still running are now stale
+        self.movie_search_seq += 1
+        query = self.movie_search_var.get().strip()
+        if query:
+            seq = self.movie_search_seq
+            future = self.app.search_executor.submit(self.app.service.search_movies, query)
+            future.add_done_callback(lambda f: self.app.call_in_ui(self.show_movie_results, seq, f))
+            return
+        catalog = self.app.service.catalog
+        self.show_movie_list([(movie, genre) for genre in catalog.genres()
+                              for movie in sorted(catalog.movies(genre), key=lambda x: x["title"])])
+
+    def show_movie_results(self, seq, future):
+        if seq != self.movie_search_seq or future.cancelled():
+            return
+        try:
+            movies = future.result()
+        except Exception as e:
+            print(f"Search failed: {e}")
+            return
+        genre_by_id = self.app.service.catalog.genre_by_id
+        self.show_movie_list([(movie, genre_by_id.get(movie["id"], "")) for movie in movies])
+
+    def show_movie_list(self, movies):
+        # Reloading clears the listbox selection without a <<ListboxSelect>>
+        self.movie_list.delete(0, tk.END)
+        self.selected_movie = None
+        self.selected_movies = []
+        entries = [f"{movie['title']} ({movie['year']}) - {genre}" for movie, genre in movies]
+        # One insert call instead of a Tcl round trip per movie
+        if entries:
+            self.movie_list.insert(tk.END, *entries)
+
+    def import_catalog(self):
+        if self.importer is not None:
+            return
+        path = filedialog.askopenfilename(filetypes=[("Catalog files", "*.csv *.jsonl *.ndjson"), ("All files", "*.*")])
+        if not path:
+            return
+
+        self.import_btn.config(state="disabled")
+        self.import_progress["value"] = 0
+        self.import_status.config(text="⏳ Importing...")
+        self.importer = BulkImporter(self.app.service, call_in_owner=self.app.call_in_ui,
+                                     copy_file=PosterCache.make_thumbnail,
+                                     on_progress=self.import_progressed, on_done=self.import_finished)
+        self.importer.start(path)
+
+    def import_progressed(self, importer, fraction):
+        self.import_progress["value"] = fraction
+        self.import_status.config(text=f"⏳ {importer.added} imported, {len(importer.errors)} problems")
+
+    def import_finished(self, importer, error):
+        self.importer = None
+        self.import_btn.config(state="normal")
+        self.import_progress["value"] = 1.0 if error is None else self.import_progress["value"]
+        self.import_status.config(text=f"{importer.added} imported, {len(importer.errors)} problems")
+        self.load_movies()
+
+        text = f"Imported {importer.added} movies."
+        if importer.errors:
+            text += f"\n\n{len(importer.errors)} problems:\n"
+            text += "\n".join(f"Line {line}: {message}" for line, message in importer.errors[:20])
+            if len(importer.errors) > 20:
+                text += f"\n... and {len(importer.errors) - 20} more"
+        if error is not None:
+            messagebox.showerror("Import Stopped", f"{text}\n\nImport stopped: {str(error)}")
+        else:
+            messagebox.showinfo("Import Finished", text)
+
+    def load_users(self):
+        self.user_list.delete(0, tk.END)
+        for user in self.app.service.usernames():
+            self.user_list.insert(tk.END, user)
 
-    # Generate unique movie ID
-    max_id = 0
-    for movies in self.app.movie_db.values():
-        for m in movies:
-            max_id = max(max_id, m["id"])
-    new_id = max_id + 1
-
-    # Handle poster
-    poster_name = ""
-    if poster:
-        import shutil
-        poster_name = f"{title.replace(' ', '_').lower()}_{new_id}.jpg"
-        poster_dest = os.path.join(POSTER_DIR, poster_name)
+    def on_movie_select(self, event):
+        self.selected_movies = []
+        for index in self.movie_list.curselection():
+            movie_str = self.movie_list.get(index)
+            # Extract title from string like "Title (Year) - Genre"
+            title = movie_str.split(" (")[0]
+            movie, genre = self.app.service.catalog.find(title)
+            if movie:
+                self.selected_movies.append((movie, genre))
+        # Edit works on the first selected movie
+        self.selected_movie = self.selected_movies[0] if self.selected_movies else None
+
+    def on_user_select(self, event):
+        selection = self.user_list.curselection()
+        if selection:
+            self.selected_user = self.user_list.get(selection[0])
+        else:
+            self.selected_user = None
+
+    def choose_poster(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.png *.jpeg"), ("All files", "*.*")])
+        if file_path:
+            self.poster_path = file_path
+            self.poster_button.config(text="File Selected")
+
+    def add_movie(self):
         try:
-            shutil.copy(poster, poster_dest)
-        except IOError as e:
-            messagebox.showerror("Error", f"Failed to save poster: {str(e)}")
+            self.app.service.add_movie(self.title_entry.get().strip(), self.year_entry.get().strip(),
+                                       self.genre_combobox.get(), self.desc_entry.get().strip(),
+                                       poster_file=self.poster_path)
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
             return
 
-    # Add movie to database
-    new_movie = {
-        "title": title,
-        "year": year,
-        "description": description,
-        "poster": poster_name,
-        "id": new_id
-    }
-    self.app.movie_db[genre].append(new_movie)
-    self.app.poster_map[title] = os.path.join(POSTER_DIR, poster_name) if poster_name else None
-
-    if self.app.save_data(self.app.movie_db, MOVIES_FILE):
         messagebox.showinfo("Success", "Movie added successfully")
         self.title_entry.delete(0, tk.END)
         self.year_entry.delete(0, tk.END)
@@ -1448,190 +1737,129 @@ def add_movie(self):
         self.poster_path = None
         self.load_movies()
 
-def edit_movie(self):
-    if not self.selected_movie:
-        messagebox.showerror("Error", "Please select a movie to edit")
-        return
-
-    movie, genre = self.selected_movie
-
-    dialog = tk.Toplevel(self)
-    dialog.title("Edit Movie")
-    dialog.resizable(False, False)
-    dialog.configure(bg=THEME["bg"])
-
-    tk.Label(dialog, text="Title:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).pack(pady=5)
-    title_entry = tk.Entry(dialog, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
-                           font=("Helvetica", 12))
-    title_entry.pack(pady=5)
-    title_entry.insert(0, movie["title"])
-
-    tk.Label(dialog, text="Year:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).pack(pady=5)
-    year_entry = tk.Entry(dialog, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
-                          font=("Helvetica", 12))
-    year_entry.pack(pady=5)
-    year_entry.insert(0, movie["year"])
-
-    tk.Label(dialog, text="Genre:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).pack(pady=5)
-    genre_combobox = ttk.Combobox(dialog, values=sorted(self.app.movie_db.keys()),
-                                  font=("Helvetica", 12), state="readonly")
-    genre_combobox.pack(pady=5)
-    genre_combobox.set(genre)
-
-    tk.Label(dialog, text="Description:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).pack(pady=5)
-    desc_entry = tk.Entry(dialog, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
-                          font=("Helvetica", 12))
-    desc_entry.pack(pady=5)
-    desc_entry.insert(0, movie["description"])
-
-    tk.Label(dialog, text="Poster:", bg=THEME["bg"], fg=THEME["fg"],
-             font=("Helvetica", 12)).pack(pady=5)
-    poster_button = tk.Button(dialog, text="Choose File" if not movie["poster"] else "Replace File",
-                             command=lambda: self.choose_poster_edit(poster_button),
-                             bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12))
-    poster_button.pack(pady=5)
-
-    def submit():
-        new_title = title_entry.get().strip()
-        new_year = year_entry.get().strip()
-        new_genre = genre_combobox.get()
-        new_desc = desc_entry.get().strip()
-        new_poster = self.poster_path
-
-        if not new_title or not new_year or not new_genre or not new_desc:
-            messagebox.showerror("Error", "All fields except poster are required")
+    def edit_movie(self):
+        if not self.selected_movie:
+            messagebox.showerror("Error", "Please select a movie to edit")
             return
 
-        if not new_year.isdigit() or len(new_year) != 4:
-            messagebox.showerror("Error", "Year must be a 4-digit number")
-            return
+        movie, genre = self.selected_movie
+
+        dialog = tk.Toplevel(self)
+        dialog.title("Edit Movie")
+        dialog.resizable(False, False)
+        dialog.configure(bg=THEME["bg"])
 
-        # Check if new title conflicts (excluding current movie)
-        for g, movies in self.app.movie_db.items():
-            for m in movies:
-                if m["title"].lower() == new_title.lower() and m["id"] != movie["id"]:
-                    messagebox.showerror("Error", "Movie title already exists")
-                    return
-
-        # Handle poster
-        new_poster_name = movie["poster"]
-        if new_poster:
-            import shutil
-            new_poster_name = f"{new_title.replace(' ', '_').lower()}_{movie['id']}.jpg"
-            poster_dest = os.path.join(POSTER_DIR, new_poster_name)
+        tk.Label(dialog, text="Title:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).pack(pady=5)
+        title_entry = tk.Entry(dialog, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
+                               font=("Helvetica", 12))
+        title_entry.pack(pady=5)
+        title_entry.insert(0, movie["title"])
+
+        tk.Label(dialog, text="Year:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).pack(pady=5)
+        year_entry = tk.Entry(dialog, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
+                              font=("Helvetica", 12))
+        year_entry.pack(pady=5)
+        year_entry.insert(0, movie["year"])
+
+        tk.Label(dialog, text="Genre:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).pack(pady=5)
+        genre_combobox = ttk.Combobox(dialog, values=self.app.service.catalog.genres(),
+                                      font=("Helvetica", 12), state="readonly")
+        genre_combobox.pack(pady=5)
+        genre_combobox.set(genre)
+
+        tk.Label(dialog, text="Description:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).pack(pady=5)
+        desc_entry = tk.Entry(dialog, bg=THEME["entry_bg"], fg=THEME["entry_fg"],
+                              font=("Helvetica", 12))
+        desc_entry.pack(pady=5)
+        desc_entry.insert(0, movie["description"])
+
+        tk.Label(dialog, text="Poster:", bg=THEME["bg"], fg=THEME["fg"],
+                 font=("Helvetica", 12)).pack(pady=5)
+        poster_button = tk.Button(dialog, text="Choose File" if not movie["poster"] else "Replace File",
+                                 command=lambda: self.choose_poster_edit(poster_button),
+                                 bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12))
+        poster_button.pack(pady=5)
+
+        def submit():
             try:
-                if movie["poster"] and os.path.exists(os.path.join(POSTER_DIR, movie["poster"])):
-                    os.remove(os.path.join(POSTER_DIR, movie["poster"]))
-                shutil.copy(new_poster, poster_dest)
-            except IOError as e:
-                messagebox.showerror("Error", f"Failed to save poster: {str(e)}")
+                self.app.service.update_movie(movie, title_entry.get().strip(), year_entry.get().strip(),
+                                              genre_combobox.get(), desc_entry.get().strip(),
+                                              poster_file=self.poster_path)
+            except ServiceError as e:
+                messagebox.showerror("Error", str(e))
                 return
 
-        # Update movie
-        old_title = movie["title"]
-        self.app.movie_db[genre].remove(movie)
-        updated_movie = {
-            "title": new_title,
-            "year": new_year,
-            "description": new_desc,
-            "poster": new_poster_name,
-            "id": movie["id"]
-        }
-        self.app.movie_db[new_genre].append(updated_movie)
-        self.app.poster_map.pop(old_title, None)
-        self.app.poster_map[new_title] = os.path.join(POSTER_DIR, new_poster_name) if new_poster_name else None
-
-        if self.app.save_data(self.app.movie_db, MOVIES_FILE):
             dialog.destroy()
             messagebox.showinfo("Success", "Movie updated successfully")
             self.load_movies()
             self.selected_movie = None
             self.poster_path = None
 
-    tk.Button(dialog, text="Submit", command=submit,
-              bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(pady=10)
-
-def choose_poster_edit(self, button):
-    file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.png *.jpeg"), ("All files", "*.*")])
-    if file_path:
-        self.poster_path = file_path
-        button.config(text="File Selected")
-
-def delete_movie(self):
-    if not self.selected_movie:
-        messagebox.showerror("Error", "Please select a movie to delete")
-        return
-
-    movie, genre = self.selected_movie
-    if messagebox.askyesno("Confirm", f"Are you sure you want to delete '{movie['title']}'?"):
-        # Remove movie from database
-        self.app.movie_db[genre].remove(movie)
-        # Remove poster file
-        if movie["poster"] and os.path.exists(os.path.join(POSTER_DIR, movie["poster"])):
-            try:
-                os.remove(os.path.join(POSTER_DIR, movie["poster"]))
-            except OSError:
-                pass
-        # Remove from poster map
-        self.app.poster_map.pop(movie["title"], None)
-        # Remove from all users' ratings
-        for user_ratings in self.app.ratings.values():
-            user_ratings.pop(movie["title"], None)
-
-        if self.app.save_data(self.app.movie_db, MOVIES_FILE) and self.app.save_data(self.app.ratings, RATINGS_FILE):
-            messagebox.showinfo("Success", "Movie deleted successfully")
+        tk.Button(dialog, text="Submit", command=submit,
+                  bg=THEME["btn_bg"], fg=THEME["btn_fg"], font=("Helvetica", 12)).pack(pady=10)
+
+    def choose_poster_edit(self, button):
+        file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.png *.jpeg"), ("All files", "*.*")])
+        if file_path:
+            self.poster_path = file_path
+            button.config(text="File Selected")
+
+    def delete_movie(self):
+        if not self.selected_movies:
+            messagebox.showerror("Error", "Please select a movie to delete")
+            return
+
+        movies = [movie for movie, _ in self.selected_movies]
+        ratings = sum(self.app.service.rating_count(movie["id"]) for movie in movies)
+        if len(movies) == 1:
+            question = f"Are you sure you want to delete '{movies[0]['title']}'?"
+        else:
+            question = f"Are you sure you want to delete {len(movies)} movies?"
+        if ratings:
+            question += f"\n\n{ratings} user rating(s) will be removed."
+        if messagebox.askyesno("Confirm", question):
+            self.app.service.delete_movies(movies)
+            messagebox.showinfo("Success", "Movie deleted successfully" if len(movies) == 1
+                                else f"{len(movies)} movies deleted successfully")
             self.load_movies()
             self.selected_movie = None
+            self.selected_movies = []
+
+    def view_user_details(self):
+        if not self.selected_user:
+            messagebox.showerror("Error", "Please select a user to view details")
+            return
+
+        try:
+            details = self.app.service.user_details(self.selected_user)
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        text = f"Username: {details['username']}\n"
+        text += f"Joined: {details['joined']}\n"
+        text += f"Total Ratings: {details['ratings']}\n"
+        text += f"Total Friends: {details['friends']}\n"
+        text += "\nLiked Movies:\n"
+        text += "\n".join(details["liked"]) if details["liked"] else "None"
+
+        messagebox.showinfo("User Details", text)
 
-def view_user_details(self):
-    if not self.selected_user:
-        messagebox.showerror("Error", "Please select a user to view details")
-        return
-
-    user = self.selected_user
-    user_data = self.app.users.get(user, {})
-    ratings = self.app.ratings.get(user, {})
-    friends = self.app.friends.get(user, {}).get("friends", [])
-
-    details = f"Username: {user}\n"
-    details += f"Joined: {user_data.get('joined', 'N/A')}\n"
-    details += f"Total Ratings: {len(ratings)}\n"
-    details += f"Total Friends: {len(friends)}\n"
-    details += "\nLiked Movies:\n"
-    liked = [m for m, r in ratings.items() if r == 1]
-    details += "\n".join(liked) if liked else "None"
-
-    messagebox.showinfo("User Details", details)
-
-def delete_user(self):
-    if not self.selected_user:
-        messagebox.showerror("Error", "Please select a user to delete")
-        return
-
-    if self.selected_user == "admin":
-        messagebox.showerror("Error", "Cannot delete admin account")
-        return
-
-    if messagebox.askyesno("Confirm", f"Are you sure you want to delete user '{self.selected_user}'?"):
-        user = self.selected_user
-        # Remove user from users
-        self.app.users.pop(user, None)
-        # Remove user ratings
-        self.app.ratings.pop(user, None)
-        # Remove user from friends lists
-        self.app.friends.pop(user, None)
-        for other_user in self.app.friends:
-            self.app.friends[other_user]["friends"] = [f for f in self.app.friends[other_user]["friends"] if f != user]
-            self.app.friends[other_user]["requests_sent"] = [r for r in self.app.friends[other_user]["requests_sent"] if r != user]
-            self.app.friends[other_user]["requests_received"] = [r for r in self.app.friends[other_user]["requests_received"] if r != user]
-
-        if (self.app.save_data(self.app.users, USERS_FILE) and
-            self.app.save_data(self.app.ratings, RATINGS_FILE) and
-            self.app.save_data(self.app.friends, FRIENDS_FILE)):
+    def delete_user(self):
+        if not self.selected_user:
+            messagebox.showerror("Error", "Please select a user to delete")
+            return
+
+        if messagebox.askyesno("Confirm", f"Are you sure you want to delete user '{self.selected_user}'?"):
+            try:
+                self.app.service.delete_user(self.selected_user)
+            except ServiceError as e:
+                messagebox.showerror("Error", str(e))
+                return
             messagebox.showinfo("Success", "User deleted successfully")
             self.load_users()
             self.selected_user = None
@@ -0,0 +1,51 @@
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moviemate.catalog import MovieCatalog
+
+GENRES = ["Action", "Comedy", "Drama", "Science Fiction", "Horror",
+          "Romance", "Thriller", "Adventure", "Animation", "Mystery"]
+SIZES = [100, 1000, 10000, 50000]
+LOOKUPS = 1000
+
+
+def make_movie_db(size):
+    movie_db = {genre: [] for genre in GENRES}
+    for movie_id in range(1, size + 1):
+        movie_db[GENRES[movie_id % len(GENRES)]].append({
+            "title": f"Movie {movie_id}",
+            "year": str(1950 + movie_id % 75),
+            "description": "",
+            "poster": "",
+            "id": movie_id
+        })
+    return movie_db
+
+
+def linear_genre(movie_db, title):
+    for genre, movies in movie_db.items():
+        for movie in movies:
+            if movie["title"] == title:
+                return genre
+    return None
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'movies':>8} {'linear us/lookup':>18} {'catalog us/lookup':>18}")
+    for size in SIZES:
+        movie_db = make_movie_db(size)
+        catalog = MovieCatalog(movie_db)
+        titles = [f"Movie {rng.randint(1, size)}" for _ in range(LOOKUPS)]
+
+        linear = timeit.timeit(lambda: [linear_genre(movie_db, t) for t in titles], number=1)
+        indexed = timeit.timeit(lambda: [catalog.genre_of(t) for t in titles], number=1)
+        print(f"{size:>8} {linear / LOOKUPS * 1e6:>18.2f} {indexed / LOOKUPS * 1e6:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
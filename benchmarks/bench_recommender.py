@@ -0,0 +1,75 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moviemate.recommender import ItemItemRecommender
+
+# python benchmarks/bench_recommender.py [users] [movies] [ratings_per_user]
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+MOVIES = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+RATINGS_PER_USER = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+REQUESTS = 200
+
+
+def make_ratings(rng):
+    movie_ids = list(range(1, MOVIES + 1))
+    # Power-law popularity, like a real catalog
+    cumulative = []
+    total = 0.0
+    for rank in range(MOVIES):
+        total += 1 / (rank + 1)
+        cumulative.append(total)
+    ratings = {}
+    for user in range(USERS):
+        picks = rng.choices(movie_ids, cum_weights=cumulative, k=RATINGS_PER_USER)
+        ratings[f"user{user}"] = {movie_id: rng.randint(0, 1) for movie_id in picks}
+    return ratings
+
+
+def report(label, timings):
+    timings.sort()
+    print(f"{label}: median {timings[len(timings) // 2] * 1000:.2f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95)] * 1000:.2f} ms")
+
+
+def time_requests(recommender, users):
+    timings = []
+    for user in users:
+        start = time.perf_counter()
+        recommender.recommend(user)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    rng = random.Random(42)
+    ratings = make_ratings(rng)
+
+    start = time.perf_counter()
+    recommender = ItemItemRecommender(ratings)
+    print(f"build: {time.perf_counter() - start:.2f} s for {USERS} users x {MOVIES} movies")
+
+    # cold: nothing cached yet; warm: the same users again
+    users = [f"user{rng.randrange(USERS)}" for _ in range(REQUESTS)]
+    report("cold", time_requests(recommender, users))
+    report("warm", time_requests(recommender, users))
+
+    # Every user rates one more movie, which patches the cached neighbour
+    # lists of everything they rated; then the same users again
+    timings = []
+    for user in users:
+        movie_id = rng.randint(1, MOVIES)
+        start = time.perf_counter()
+        recommender.update(user, movie_id, rng.randint(0, 1))
+        timings.append(time.perf_counter() - start)
+    report("rating update", timings)
+    report("after ratings", time_requests(recommender, users))
+    # Users nobody has asked about yet still pay for their uncached movies
+    report("new users", time_requests(recommender, [f"user{rng.randrange(USERS)}" for _ in range(REQUESTS)]))
+
+
+if __name__ == "__main__":
+    main()
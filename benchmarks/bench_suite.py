@@ -0,0 +1,183 @@
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_dataset import generate
+from moviemate.instrumentation import registry as timings
+from moviemate.persistence import dump_json, write_atomic
+from moviemate.service import (FRIENDS_FILE, MOVIES_FILE, RATINGS_FILE, RATINGS_JOURNAL_FILE, USERS_FILE,
+                               MovieMateService)
+from moviemate.storage import JsonStorage
+
+# python benchmarks/bench_suite.py [scale ...] > results.json
+# A scale is one of SCALES or USERSxMOVIESxRATINGS, e.g. 5000x2000x100000.
+# Progress goes to stderr and the results to stdout as JSON, so runs on
+# different commits can be diffed or compared with a script. With
+# MOVIEMATE_PROFILE=1 each scale also reports the app's internal timers.
+SCALES = {
+    "small": (1000, 1000, 50000),
+    "medium": (10000, 10000, 1000000),
+    "large": (100000, 50000, 10000000)
+}
+DEFAULT_SCALES = ["small", "medium"]
+SEED = 42
+
+
+class DiscardWriter:
+    # Writer interface that drops everything. The app persists write-behind,
+    # so what the user waits for is the in-memory part of an operation;
+    # save_data is measured on its own.
+    def mark_dirty(self, path, produce, save=None):
+        pass
+
+    def append(self, path, text, save=None):
+        pass
+
+    def submit(self, task):
+        pass
+
+    def flush(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def timed(func, samples):
+    timings = []
+    for arg in samples:
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    return {
+        "n": len(ordered),
+        "total_s": round(sum(ordered), 6),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4),
+        "median_ms": round(ordered[len(ordered) // 2] * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4)
+    }
+
+
+def open_storage(data_dir, writer=None):
+    return JsonStorage(*(os.path.join(data_dir, name) for name in
+                         (USERS_FILE, RATINGS_FILE, MOVIES_FILE, FRIENDS_FILE, RATINGS_JOURNAL_FILE)),
+                       writer=writer)
+
+
+def run_scale(users, movies, ratings):
+    results = {}
+    timings.reset()
+    with tempfile.TemporaryDirectory(prefix="moviemate-bench-") as data_dir:
+        start = time.perf_counter()
+        dataset = generate(data_dir, users, movies, ratings, SEED)
+        dataset["generate_s"] = round(time.perf_counter() - start, 3)
+        log(f"  generated {dataset['ratings']} ratings in {dataset['generate_s']} s")
+
+        storage = open_storage(data_dir)
+        loaded = {}
+        for filename in (USERS_FILE, RATINGS_FILE, MOVIES_FILE, FRIENDS_FILE):
+            path = os.path.join(data_dir, filename)
+            results[f"load_data[{filename}]"] = timed(
+                lambda p: loaded.__setitem__(filename, storage.load_data(p, {})), [path] * 3)
+            results[f"save_data[{filename}]"] = timed(
+                lambda p: write_atomic(p, dump_json(lambda: loaded[filename])), [path] * 3)
+        loaded.clear()
+        log("  load_data / save_data done")
+
+        start = time.perf_counter()
+        service = MovieMateService(open_storage(data_dir, DiscardWriter()),
+                                   poster_dir=os.path.join(data_dir, "posters"))
+        results["service_startup"] = summarize([time.perf_counter() - start])
+
+        rng = random.Random(SEED)
+        usernames = service.usernames()
+        titles = [movie["title"] for movie in service.catalog.movies()]
+
+        sample = rng.sample(usernames, min(200, len(usernames)))
+        results["get_recommendations[cold]"] = timed(service.recommend, sample)
+        # [warm] scores again with the similarity lists cached; [cached] is
+        # a repeat visit served from the recommendation cache
+        service.recommendation_cache.clear()
+        results["get_recommendations[warm]"] = timed(service.recommend, sample)
+        results["get_recommendations[cached]"] = timed(service.recommend, sample)
+        results["load_suggestions"] = timed(service.friend_suggestions, sample)
+        results["get_movie_genre"] = timed(service.catalog.genre_of, rng.choices(titles, k=10000))
+        start = time.perf_counter()
+        service.prepare_search()
+        results["search_index_build"] = summarize([time.perf_counter() - start])
+        # Whole title words plus the partial word of someone still typing
+        queries = []
+        for title in rng.sample(titles, min(200, len(titles))):
+            words = title.split()
+            queries.append(" ".join(words[:-1]) + " " + words[-1][:3] if len(words) > 1 else words[0][:3])
+        results["search_movies"] = timed(service.search_movies, queries)
+        log("  reads done")
+
+        victims = rng.sample(usernames, min(50, len(usernames)))
+        results["delete_user"] = timed(service.delete_user, victims)
+        # Popularity is independent of id, so a random sample mixes blockbusters
+        # (many raters to update) with obscure titles
+        doomed = rng.sample(service.catalog.movies(), min(20, len(titles)))
+        results["delete_movie"] = timed(service.delete_movie, doomed)
+        log("  deletes done")
+    report = {"dataset": dataset, "ops": results}
+    if timings.enabled:
+        report["timers"] = timings.snapshot()
+    return report
+
+
+def parse_scale(name):
+    if name in SCALES:
+        return SCALES[name]
+    try:
+        users, movies, ratings = (int(part) for part in name.split("x"))
+    except ValueError:
+        raise SystemExit(f"unknown scale {name!r}; use one of {', '.join(SCALES)} or USERSxMOVIESxRATINGS")
+    return users, movies, ratings
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    names = sys.argv[1:] or DEFAULT_SCALES
+    scales = {name: parse_scale(name) for name in names}
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": {}
+    }
+    for name, (users, movies, ratings) in scales.items():
+        log(f"{name}: {users} users, {movies} movies, {ratings} ratings")
+        report["scales"][name] = run_scale(users, movies, ratings)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moviemate.friends import FriendGraph
+from moviemate.persistence import dump_json, write_atomic
+from moviemate.service import FRIENDS_FILE, MOVIES_FILE, RATINGS_FILE, USERS_FILE, hash_password
+from moviemate.storage import ratings_snapshot
+
+# python benchmarks/generate_dataset.py OUT_DIR [users] [movies] [ratings] [seed]
+# Writes users.json, ratings.json, movies.json and friends.json in the app's
+# own format. The same arguments always produce the same files. Every
+# generated user's password is "password".
+
+GENRES = ["Action", "Comedy", "Drama", "Science Fiction", "Horror",
+          "Romance", "Thriller", "Adventure", "Animation", "Mystery"]
+WORDS = ["Silent", "River", "Last", "Night", "Iron", "Garden", "Broken", "Star", "Hidden", "City",
+         "Red", "Winter", "Golden", "Shadow", "Lost", "Empire", "Dark", "Ocean", "Little", "Storm",
+         "Glass", "Kingdom", "Wild", "Heart", "Paper", "Moon", "Secret", "Road", "Fire", "Dream"]
+FRIENDS_PER_USER = 10
+REQUESTS_PER_USER = 1
+
+
+def popularity(count):
+    # Cumulative Zipf weights: rank r is picked with probability ~ 1/r
+    cumulative = []
+    total = 0.0
+    for rank in range(count):
+        total += 1 / (rank + 1)
+        cumulative.append(total)
+    return cumulative
+
+
+def make_movie_db(rng, movies):
+    movie_db = {genre: [] for genre in GENRES}
+    for movie_id in range(1, movies + 1):
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        movie_db[rng.choice(GENRES)].append({
+            "title": f"{' '.join(words)} {movie_id}",
+            "year": str(rng.randint(1950, 2024)),
+            "description": f"A {rng.choice(WORDS).lower()} story about {rng.choice(WORDS).lower()} things.",
+            "poster": "",
+            "id": movie_id
+        })
+    return movie_db
+
+
+def make_ratings(rng, usernames, movie_ids, ratings):
+    # Rating counts per user are exponentially distributed around the mean,
+    # so there are a few heavy raters; movies follow a power law in a random
+    # order so popularity is not tied to id or genre
+    order = list(movie_ids)
+    rng.shuffle(order)
+    cumulative = popularity(len(order))
+    mean = ratings / len(usernames)
+    result = {}
+    for username in usernames:
+        count = min(len(order), max(1, round(rng.expovariate(1 / mean))))
+        picks = rng.choices(order, cum_weights=cumulative, k=count)
+        result[username] = {movie_id: rng.randint(0, 1) for movie_id in picks}
+    return result
+
+
+def make_friends(rng, usernames):
+    graph = FriendGraph()
+    for username in usernames:
+        graph.add_user(username)
+    for username in usernames:
+        for _ in range(FRIENDS_PER_USER // 2):
+            other = rng.choice(usernames)
+            if other != username and not graph.are_friends(username, other):
+                graph.send_request(username, other)
+                graph.accept_request(username, other)
+        for _ in range(REQUESTS_PER_USER):
+            other = rng.choice(usernames)
+            if (other != username and not graph.are_friends(username, other)
+                    and not graph.has_request(other, username)):
+                graph.send_request(username, other)
+    return graph
+
+
+def generate(out_dir, users=1000, movies=1000, ratings=50000, seed=42):
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    movie_db = make_movie_db(rng, movies)
+    movie_ids = [movie["id"] for genre_movies in movie_db.values() for movie in genre_movies]
+    usernames = [f"user{i}" for i in range(users)]
+
+    # One low-cost hash shared by everyone keeps generation fast
+    password = hash_password("password", rounds=4)
+    user_db = {"admin": {"password": password, "joined": "2024-01-01 00:00:00"}}
+    for i, username in enumerate(usernames):
+        user_db[username] = {"password": password,
+                             "joined": f"2024-01-01 00:{i // 60 % 60:02d}:{i % 60:02d}"}
+
+    user_ratings = make_ratings(rng, usernames, movie_ids, ratings)
+    files = {
+        USERS_FILE: user_db,
+        MOVIES_FILE: movie_db,
+        RATINGS_FILE: ratings_snapshot(user_ratings),
+        FRIENDS_FILE: make_friends(rng, usernames).to_dict()
+    }
+    for filename, data in files.items():
+        write_atomic(os.path.join(out_dir, filename), dump_json(lambda: data))
+
+    return {
+        "users": users,
+        "movies": movies,
+        "ratings": sum(len(r) for r in user_ratings.values()),
+        "seed": seed
+    }
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: generate_dataset.py OUT_DIR [users] [movies] [ratings] [seed]")
+        sys.exit(1)
+    out_dir = sys.argv[1]
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    movies = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    ratings = int(sys.argv[4]) if len(sys.argv) > 4 else 50000
+    seed = int(sys.argv[5]) if len(sys.argv) > 5 else 42
+
+    start = time.perf_counter()
+    stats = generate(out_dir, users, movies, ratings, seed)
+    print(f"Wrote {stats['users']} users, {stats['movies']} movies and {stats['ratings']} ratings "
+          f"to {out_dir} in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
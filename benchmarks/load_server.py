@@ -0,0 +1,119 @@
+import asyncio
+import json
+import random
+import sys
+import time
+from urllib.parse import quote
+
+# python benchmarks/load_server.py [clients] [seconds] [port]
+# Start the server first (python -m moviemate.server); set
+# MOVIEMATE_BCRYPT_ROUNDS low on the server when measuring anything but login.
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+DURATION = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+PORT = int(sys.argv[3]) if len(sys.argv) > 3 else 8080
+HOST = "127.0.0.1"
+
+# Relative frequency of each request in the mix
+MIX = [("browse", 40), ("rate", 30), ("recommend", 20), ("suggest", 10)]
+
+
+class Client:
+    # One keep-alive connection speaking just enough HTTP/1.1 for the server
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.token = ""
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(HOST, PORT)
+
+    async def request(self, method, path, data=None):
+        body = json.dumps(data).encode() if data is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+                f"Authorization: Bearer {self.token}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode() + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        payload = json.loads(await self.reader.readexactly(length)) if length else None
+        return status, payload
+
+    def close(self):
+        self.writer.close()
+
+
+async def setup(client, name, password):
+    await client.connect()
+    await client.request("POST", "/signup", {"username": name, "password": password})
+    status, payload = await client.request("POST", "/login", {"username": name, "password": password})
+    if status != 200:
+        raise RuntimeError(f"login failed for {name}: {payload}")
+    client.token = payload["token"]
+
+
+async def run_client(client, rng, titles, genres, deadline, timings, errors):
+    kinds = [kind for kind, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "browse":
+            call = ("GET", f"/movies?genre={quote(rng.choice(genres))}", None)
+        elif kind == "rate":
+            call = ("POST", "/ratings", {"title": rng.choice(titles), "rating": rng.randint(0, 1)})
+        elif kind == "recommend":
+            call = ("GET", "/recommendations", None)
+        else:
+            call = ("GET", "/suggestions", None)
+        start = time.perf_counter()
+        status, _ = await client.request(*call)
+        timings[kind].append(time.perf_counter() - start)
+        if status != 200:
+            errors[kind] += 1
+
+
+async def main():
+    rng = random.Random(42)
+    run_id = rng.getrandbits(32) ^ int(time.time())
+    clients = [Client() for _ in range(CLIENTS)]
+    start = time.perf_counter()
+    await asyncio.gather(*(setup(client, f"load{run_id}_{i}", "loadtest")
+                           for i, client in enumerate(clients)))
+    print(f"setup: {CLIENTS} clients signed up and logged in in {time.perf_counter() - start:.2f} s")
+
+    _, genres = await clients[0].request("GET", "/genres")
+    titles = []
+    for genre in genres:
+        _, movies = await clients[0].request("GET", f"/movies?genre={quote(genre)}")
+        titles += [movie["title"] for movie in movies]
+
+    timings = {kind: [] for kind, _ in MIX}
+    errors = {kind: 0 for kind, _ in MIX}
+    deadline = time.perf_counter() + DURATION
+    await asyncio.gather(*(run_client(client, random.Random(i), titles, genres, deadline, timings, errors)
+                           for i, client in enumerate(clients)))
+    for client in clients:
+        client.close()
+
+    total = sum(len(samples) for samples in timings.values())
+    print(f"{total} requests in {DURATION:.0f} s: {total / DURATION:.0f} req/s with {CLIENTS} clients")
+    for kind, samples in timings.items():
+        if not samples:
+            continue
+        samples.sort()
+        print(f"{kind:>10}: {len(samples):6d} requests, {errors[kind]} errors, "
+              f"median {samples[len(samples) // 2] * 1000:.2f} ms, "
+              f"p95 {samples[int(len(samples) * 0.95)] * 1000:.2f} ms, "
+              f"p99 {samples[int(len(samples) * 0.99)] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
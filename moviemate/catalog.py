@@ -0,0 +1,137 @@
+import threading
+from collections import defaultdict
+
+from moviemate.search import SearchIndex
+
+
+class MovieCatalog:
+    # Wraps the genre -> [movie] dict loaded from movies.json and keeps lookup
+    # indexes in sync with it. The wrapped dict is mutated in place so it can
+    # still be saved as-is. The full-text index is only filled on the first
+    # search, but changes are applied to it from the start.
+    #
+    # The index is built on a search worker from a snapshot of movie_db, so
+    # every change to movie_db takes the lock the snapshot is made under.
+    def __init__(self, movie_db):
+        self.movie_db = movie_db
+        self.lock = threading.Lock()
+        self.rebuild()
+
+    def reload(self, movie_db):
+        # Replaces the contents with a freshly loaded copy, in place
+        with self.lock:
+            self.movie_db.clear()
+            self.movie_db.update(movie_db)
+        self.rebuild()
+
+    def rebuild(self):
+        self.by_id = {}
+        self.by_title = {}
+        self.genre_by_id = {}
+        self.by_year = defaultdict(dict)
+        self.max_id = 0
+        self.search_index = SearchIndex()
+        for genre, movies in self.movie_db.items():
+            for movie in movies:
+                self._index(movie, genre)
+
+    def _index(self, movie, genre):
+        self.by_id[movie["id"]] = movie
+        self.by_title[movie["title"].casefold()] = movie
+        self.genre_by_id[movie["id"]] = genre
+        self.by_year[movie.get("year", "")][movie["id"]] = movie
+        self.max_id = max(self.max_id, movie["id"])
+
+    def _unindex(self, movie):
+        self.by_id.pop(movie["id"], None)
+        self.by_title.pop(movie["title"].casefold(), None)
+        self.genre_by_id.pop(movie["id"], None)
+        year_movies = self.by_year.get(movie.get("year", ""))
+        if year_movies is not None:
+            year_movies.pop(movie["id"], None)
+            if not year_movies:
+                del self.by_year[movie.get("year", "")]
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, title):
+        return title.casefold() in self.by_title
+
+    def get(self, title):
+        return self.by_title.get(title.casefold())
+
+    def get_by_id(self, movie_id):
+        return self.by_id.get(movie_id)
+
+    def find(self, title):
+        movie = self.get(title)
+        if movie is None:
+            return None, None
+        return movie, self.genre_by_id[movie["id"]]
+
+    def genre_of(self, title):
+        return self.find(title)[1]
+
+    def year_of(self, title):
+        movie = self.get(title)
+        return movie.get("year", "") if movie else ""
+
+    def movies_in_year(self, year):
+        return list(self.by_year.get(year, {}).values())
+
+    def genres(self):
+        return sorted(self.movie_db.keys())
+
+    def movies(self, genre=None):
+        if genre is None:
+            return [m for genre_movies in self.movie_db.values() for m in genre_movies]
+        return self.movie_db.get(genre, [])
+
+    def title_taken(self, title, exclude_id=None):
+        movie = self.get(title)
+        return movie is not None and movie["id"] != exclude_id
+
+    def next_id(self):
+        return self.max_id + 1
+
+    def search_entries(self):
+        with self.lock:
+            return [(movie, genre) for genre, movies in self.movie_db.items() for movie in movies]
+
+    def prepare_search(self):
+        self.search_index.ensure_built(self.search_entries)
+
+    def search(self, query, limit=50, genre=None):
+        self.prepare_search()
+        return self.search_index.search(query, limit, genre)
+
+    def add(self, movie, genre):
+        with self.lock:
+            self.movie_db.setdefault(genre, []).append(movie)
+        self._index(movie, genre)
+        self.search_index.add(movie, genre)
+
+    def replace(self, old_movie, new_movie, new_genre):
+        # An edit within the same genre keeps the movie's place, as on disk
+        current = self.by_id.get(old_movie["id"])
+        if current is None or self.genre_by_id[old_movie["id"]] != new_genre:
+            self.remove(old_movie)
+            self.add(new_movie, new_genre)
+            return
+        with self.lock:
+            movies = self.movie_db[new_genre]
+            movies[movies.index(current)] = new_movie
+        self._unindex(current)
+        self._index(new_movie, new_genre)
+        self.search_index.add(new_movie, new_genre)
+
+    def remove(self, movie):
+        # By id: after a reload `movie` may be an older copy
+        current = self.by_id.get(movie["id"])
+        if current is None:
+            return
+        with self.lock:
+            self.movie_db[self.genre_by_id[movie["id"]]].remove(current)
+        self._unindex(current)
+        self.search_index.remove(movie["id"])
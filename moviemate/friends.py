@@ -0,0 +1,87 @@
+class FriendGraph:
+    # In-memory friend graph. Adjacency and pending requests are dicts used as
+    # insertion-ordered sets, so membership tests and removals are O(1), and
+    # `received` is the reverse index of `sent`. Serializes back to the
+    # friends.json shape: {user: {"friends": [], "requests_sent": [],
+    # "requests_received": []}}.
+    def __init__(self, data=None):
+        self.adjacency = {}
+        self.sent = {}
+        self.received = {}
+        for user, entry in (data or {}).items():
+            self.add_user(user)
+            for friend in entry.get("friends", []):
+                self.add_user(friend)
+                self.adjacency[user][friend] = None
+                self.adjacency[friend][user] = None
+            for to_user in entry.get("requests_sent", []):
+                self.add_user(to_user)
+                self.sent[user][to_user] = None
+                self.received[to_user][user] = None
+            for from_user in entry.get("requests_received", []):
+                self.add_user(from_user)
+                self.received[user][from_user] = None
+                self.sent[from_user][user] = None
+
+    def __contains__(self, user):
+        return user in self.adjacency
+
+    def add_user(self, user):
+        if user not in self.adjacency:
+            self.adjacency[user] = {}
+            self.sent[user] = {}
+            self.received[user] = {}
+
+    def friends_of(self, user):
+        return self.adjacency.get(user, {}).keys()
+
+    def requests_sent(self, user):
+        return self.sent.get(user, {}).keys()
+
+    def requests_received(self, user):
+        return self.received.get(user, {}).keys()
+
+    def are_friends(self, user, other):
+        return other in self.adjacency.get(user, {})
+
+    def has_request(self, from_user, to_user):
+        return to_user in self.sent.get(from_user, {})
+
+    def send_request(self, from_user, to_user):
+        self.add_user(from_user)
+        self.add_user(to_user)
+        self.sent[from_user][to_user] = None
+        self.received[to_user][from_user] = None
+
+    def drop_request(self, from_user, to_user):
+        self.sent.get(from_user, {}).pop(to_user, None)
+        self.received.get(to_user, {}).pop(from_user, None)
+
+    def accept_request(self, from_user, to_user):
+        self.drop_request(from_user, to_user)
+        self.add_user(from_user)
+        self.add_user(to_user)
+        self.adjacency[to_user][from_user] = None
+        self.adjacency[from_user][to_user] = None
+
+    def remove_friendship(self, user, other):
+        self.adjacency.get(user, {}).pop(other, None)
+        self.adjacency.get(other, {}).pop(user, None)
+
+    def remove_user(self, user):
+        # Only the user's own neighbours are touched
+        for friend in self.adjacency.pop(user, {}):
+            self.adjacency[friend].pop(user, None)
+        for to_user in self.sent.pop(user, {}):
+            self.received[to_user].pop(user, None)
+        for from_user in self.received.pop(user, {}):
+            self.sent[from_user].pop(user, None)
+
+    def to_dict(self):
+        # Runs on the persistence thread while the owner thread may add or
+        # remove users, so take each user's entries from one snapshot of
+        # adjacency and tolerate users that are already gone from the rest
+        return {user: {"friends": list(friends),
+                       "requests_sent": list(self.sent.get(user, ())),
+                       "requests_received": list(self.received.get(user, ()))}
+                for user, friends in list(self.adjacency.items())}
@@ -0,0 +1,169 @@
+import csv
+import json
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+BATCH_SIZE = 500
+POSTER_WORKERS = 4
+FIELDS = ("title", "year", "genre", "description", "poster")
+
+
+def normalize(row, base_dir):
+    record = {field: str(row.get(field) or "").strip() for field in FIELDS}
+    if record["poster"]:
+        record["poster"] = os.path.join(base_dir, record["poster"])
+    return record
+
+
+def read_records(path):
+    # Streams (line, record, error, fraction of the file read) from a CSV
+    # file with a header row or a JSON Lines file with one object per line.
+    # Columns/keys are title, year, genre, description and an optional
+    # poster path relative to the import file. A bad line yields an error
+    # instead of a record and the import carries on.
+    base_dir = os.path.dirname(os.path.abspath(path))
+    size = os.path.getsize(path) or 1
+    with open(path, "rb") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    if not isinstance(row, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    yield line_number, None, f"Invalid JSON: {str(e)}", f.tell() / size
+                    continue
+                yield line_number, normalize(row, base_dir), None, f.tell() / size
+        else:
+            reader = csv.DictReader(line.decode("utf-8-sig") for line in f)
+            for row in reader:
+                yield reader.line_num, normalize(row, base_dir), None, f.tell() / size
+
+
+def call_directly(func, *args):
+    func(*args)
+
+
+class BulkImporter:
+    # Imports a catalog file without blocking the thread that owns the
+    # service. The import thread reads and parses records and gathers them
+    # into batches. Each batch is validated and added to the catalog on the
+    # owner thread (`call_in_owner` queues a call there, e.g. the Tk loop's
+    # call_in_ui), its posters are copied on a pool, and then the whole batch
+    # is committed to storage in one write.
+    #
+    # on_progress(importer, fraction) and on_done(importer, error) are
+    # called on the owner thread; `added` and `errors` ([(line, message)])
+    # hold the running totals.
+    def __init__(self, service, call_in_owner=call_directly, copy_file=shutil.copyfile,
+                 on_progress=None, on_done=None, batch_size=BATCH_SIZE, workers=POSTER_WORKERS):
+        self.service = service
+        self.call_in_owner = call_in_owner
+        self.copy_file = copy_file
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.batch_size = batch_size
+        self.workers = workers
+        self.added = 0
+        self.errors = []
+        self.cancelled = False
+        self.thread = None
+
+    def start(self, path):
+        self.thread = threading.Thread(target=self.run, args=(path,), name="moviemate-import", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        # Batches already committed stay imported
+        self.cancelled = True
+
+    def run(self, path):
+        error = None
+        try:
+            self.import_file(path)
+        except Exception as e:
+            # Reported through on_done so the caller never waits forever
+            error = e
+        if self.on_done:
+            self.call_in_owner(self.on_done, self, error)
+
+    def on_owner(self, func, *args):
+        # Runs func on the owner thread and waits for its result
+        future = Future()
+
+        def call():
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+        self.call_in_owner(call)
+        return future.result()
+
+    def import_file(self, path):
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="import-poster") as pool:
+            batch = []
+            for line, record, error, progress in read_records(path):
+                if self.cancelled:
+                    return
+                if error:
+                    self.errors.append((line, error))
+                    continue
+                batch.append((line, record))
+                if len(batch) >= self.batch_size:
+                    self.import_batch(pool, batch, progress)
+                    batch = []
+            if batch and not self.cancelled:
+                self.import_batch(pool, batch, 1.0)
+
+    def import_batch(self, pool, batch, progress):
+        entries, errors = self.on_owner(self.service.import_movies, batch)
+        self.errors += errors
+
+        copies = []
+        for line, movie, _, source in entries:
+            if source:
+                name = self.service.poster_file_name(movie["title"], movie["id"])
+                target = os.path.join(self.service.poster_dir, name)
+                copies.append((line, movie["id"], name, pool.submit(self.copy_file, source, target)))
+        posters = {}
+        for line, movie_id, name, future in copies:
+            try:
+                future.result()
+            except Exception as e:
+                self.errors.append((line, f"Failed to copy poster: {str(e)}"))
+                continue
+            posters[movie_id] = name
+
+        self.on_owner(self.service.commit_import, entries, posters)
+        self.added += len(entries)
+        if self.on_progress:
+            self.call_in_owner(self.on_progress, self, progress)
+
+
+if __name__ == "__main__":
+    # python -m moviemate.importer FILE.csv|FILE.jsonl -- run from the data directory
+    from moviemate.service import MovieMateService, open_storage
+
+    if len(sys.argv) < 2:
+        print("usage: python -m moviemate.importer FILE.csv|FILE.jsonl")
+        sys.exit(1)
+
+    def report_progress(importer, fraction):
+        print(f"{fraction:.0%}: {importer.added} imported, {len(importer.errors)} problems", file=sys.stderr)
+
+    def report_failure(importer, error):
+        if error:
+            print(f"Import stopped: {str(error)}")
+
+    service = MovieMateService(open_storage())
+    importer = BulkImporter(service, on_progress=report_progress, on_done=report_failure)
+    importer.run(sys.argv[1])
+    service.flush()
+    for line, message in importer.errors:
+        print(f"line {line}: {message}")
+    print(f"Imported {importer.added} movies, {len(importer.errors)} problems")
@@ -0,0 +1,44 @@
+import heapq
+from collections import defaultdict
+from operator import itemgetter
+
+
+class LikeIndex:
+    # Inverted index from movie id to the users who liked it, kept in sync
+    # with every rating change so friend suggestions never rescan all users
+    def __init__(self, ratings):
+        self.likers = defaultdict(set)
+        for user, user_ratings in ratings.items():
+            for movie_id, rating in user_ratings.items():
+                if rating == 1:
+                    self.likers[movie_id].add(user)
+
+    def update(self, user, movie_id, rating):
+        if rating == 1:
+            self.likers[movie_id].add(user)
+        else:
+            self.discard(user, movie_id)
+
+    def discard(self, user, movie_id):
+        users = self.likers.get(movie_id)
+        if users is not None:
+            users.discard(user)
+            if not users:
+                del self.likers[movie_id]
+
+    def remove_user(self, user, user_ratings):
+        for movie_id, rating in user_ratings.items():
+            if rating == 1:
+                self.discard(user, movie_id)
+
+    def remove_movie(self, movie_id):
+        self.likers.pop(movie_id, None)
+
+    def similar_users(self, liked_ids, exclude, k=5):
+        # Only users sharing at least one like are ever touched
+        common = defaultdict(int)
+        for movie_id in liked_ids:
+            for other in self.likers.get(movie_id, ()):
+                common[other] += 1
+        candidates = ((user, count) for user, count in common.items() if user not in exclude)
+        return heapq.nlargest(k, candidates, key=itemgetter(1))
@@ -0,0 +1,145 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+# Upper bounds of the latency histogram buckets in milliseconds; the last
+# bucket catches everything slower
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class TimingStats:
+    # Count, total, min/max and a fixed-bucket histogram for one named timer
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = max(self.max, ms)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the percentile, capped at the max
+        # seen, which is as precise as the histogram allows
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                bound = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min or 0.0, 3),
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "max_ms": round(self.max, 3),
+            "histogram": {f"<={bound}": n for bound, n in zip(BUCKET_BOUNDS_MS, self.buckets)}
+                         | {f">{BUCKET_BOUNDS_MS[-1]}": self.buckets[-1]}
+        }
+
+
+class TimingRegistry:
+    # Process-wide table of named timers. Timings come from the Tk thread,
+    # the poster pool, the auth pool and the persistence worker, so updates
+    # take a lock. When disabled, timed functions and timer blocks cost one
+    # attribute check.
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    def record(self, name, seconds):
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = TimingStats()
+            stats.add(seconds)
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+            self.started = time.time()
+
+    def snapshot(self):
+        with self.lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+    def to_dict(self):
+        return {
+            "enabled": self.enabled,
+            "since": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            "timers": self.snapshot()
+        }
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+
+# MOVIEMATE_PROFILE=1 turns timing on from startup; the admin panel can also
+# switch it on and off at runtime
+registry = TimingRegistry(enabled=os.environ.get("MOVIEMATE_PROFILE", "") == "1")
+
+
+class Timer:
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        registry.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+
+def timer(name):
+    # with timer("ui.display_movies"): ...
+    return Timer(name) if registry.enabled else NULL_TIMER
+
+
+def timed(name):
+    # @timed("service.recommend") records every call, including ones that raise
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
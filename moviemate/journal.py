@@ -0,0 +1,114 @@
+import json
+import os
+
+from moviemate.persistence import SyncWriter, append_durable
+from moviemate.ratings import PackedRatings
+
+
+class RatingsJournal:
+    # Append-only log of rating changes kept next to the ratings.json snapshot.
+    # Each line is one compact JSON record:
+    #   {"u": user, "i": movie id, "r": 1|0}   rate
+    #   {"u": user, "i": movie id, "r": null}  unrate
+    #   {"drop_user": user}                    user deleted
+    #   {"drop_movie_id": movie id, "users": [raters]}  movie deleted
+    # Replaying the records on top of the snapshot gives the current ratings.
+    # Journals from before ratings were keyed by id name the movie by title
+    # ("m" and "drop_movie"); replay maps those through the resolver too.
+    def __init__(self, path, compact_every=1000, writer=None, save=append_durable):
+        self.path = path
+        self.compact_every = compact_every
+        self.writer = writer or SyncWriter()
+        self.save = save
+        self.pending = 0
+
+    def replay(self, ratings, resolver):
+        # Returns True if the journal held title-keyed records
+        self.pending = 0
+        legacy = False
+        if not os.path.exists(self.path):
+            return legacy
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                legacy = self.apply(ratings, record, resolver) or legacy
+                self.pending += 1
+                valid_bytes += len(line)
+        # A crash mid-append can leave a torn last line; drop it so new
+        # records are not glued onto it
+        if valid_bytes != os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+        return legacy
+
+    @staticmethod
+    def apply(ratings, record, resolver):
+        # Returns True for a title-keyed record
+        if "drop_user" in record:
+            ratings.pop(record["drop_user"], None)
+            return False
+        if "drop_movie_id" in record or "drop_movie" in record:
+            legacy = "drop_movie" in record
+            if legacy:
+                movie_id = resolver.by_title(record["drop_movie"])
+            else:
+                movie_id = resolver.by_id(record["drop_movie_id"])
+            if movie_id is None:
+                # Not in the catalog, so its ratings were never loaded
+                return legacy
+            if "users" in record:
+                for user in record["users"]:
+                    ratings.get(user, {}).pop(movie_id, None)
+            else:
+                for user_ratings in ratings.values():
+                    user_ratings.pop(movie_id, None)
+            return legacy
+        legacy = "m" in record
+        movie_id = resolver.by_title(record["m"]) if legacy else resolver.by_id(record["i"])
+        if movie_id is None:
+            return legacy
+        if record.get("r") is None:
+            ratings.get(record["u"], {}).pop(movie_id, None)
+        else:
+            user_ratings = ratings.get(record["u"])
+            if user_ratings is None:
+                user_ratings = ratings[record["u"]] = PackedRatings()
+            user_ratings[movie_id] = record["r"]
+        return legacy
+
+    def read(self, start, end):
+        # Records in a byte range of complete lines, e.g. ones appended by
+        # another process
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+    def append(self, record):
+        text = json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+        self.writer.append(self.path, text, self.save)
+        self.pending += 1
+
+    def record_rating(self, user, movie_id, rating):
+        self.append({"u": user, "i": movie_id, "r": rating})
+
+    def record_drop_user(self, user):
+        self.append({"drop_user": user})
+
+    def record_drop_movie(self, movie_id, users):
+        # Naming the raters lets replay skip everyone else
+        self.append({"drop_movie_id": movie_id, "users": users})
+
+    @property
+    def needs_compaction(self):
+        return self.pending >= self.compact_every
+
+    def truncate(self):
+        # Only once the snapshot has been rewritten with everything in the log
+        open(self.path, "w").close()
@@ -0,0 +1,238 @@
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from moviemate.instrumentation import timed
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks (Windows): only threads of this process are serialized
+    fcntl = None
+
+
+def report_to_stderr(message):
+    print(message, file=sys.stderr)
+
+
+def file_stamp(path):
+    # Changes whenever the file is rewritten (write_atomic gives it a new
+    # inode) or appended to; None if it does not exist
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class FileLock:
+    # Exclusive advisory lock (fcntl.flock) shared by every process that uses
+    # the same lock file, held while a data file is checked and written.
+    # Reentrant, and also serializes the threads of this process, since the
+    # owner thread and the persistence thread both take it.
+    def __init__(self, path):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        if self.depth == 0 and fcntl is not None:
+            try:
+                if self.fd is None:
+                    self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+            except OSError:
+                self.thread_lock.release()
+                raise
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.depth -= 1
+        if self.depth == 0 and self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.thread_lock.release()
+        return False
+
+
+@timed("persistence.write_atomic")
+def write_atomic(path, text):
+    # Write next to the target, fsync, then rename over it so a crash leaves
+    # either the old or the new file, never a truncated one
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@timed("persistence.append_durable")
+def append_durable(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+@timed("persistence.dump_json")
+def dump_json(produce):
+    # The data is owned by the UI thread and may change while we serialize
+    # it; a resize mid-iteration raises RuntimeError, so just try again. A
+    # snapshot that races a value change is fine: that change marks the file
+    # dirty again and the next write picks it up.
+    for _ in range(10):
+        try:
+            return json.dumps(produce(), indent=4)
+        except RuntimeError:
+            continue
+    return json.dumps(produce(), indent=4)
+
+
+def write_json(path, produce):
+    write_atomic(path, dump_json(produce))
+
+
+class SyncWriter:
+    # Writes immediately on the calling thread; used where there is no UI to
+    # keep responsive (migrations, scripts)
+    def __init__(self, on_error=report_to_stderr):
+        self.on_error = on_error
+
+    def mark_dirty(self, path, produce, save=write_json):
+        try:
+            save(path, produce)
+        except Exception as e:
+            self.on_error(f"Failed to save {path}: {str(e)}")
+
+    def append(self, path, text, save=append_durable):
+        try:
+            save(path, text)
+        except Exception as e:
+            self.on_error(f"Failed to save {path}: {str(e)}")
+
+    def submit(self, task):
+        try:
+            task()
+        except Exception as e:
+            self.on_error(f"Failed to save: {str(e)}")
+
+    def flush(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class PersistenceWorker:
+    # Write-behind persistence on a background thread. The UI thread only
+    # queues work:
+    #   mark_dirty(path, produce)  rewrite a whole file; repeated marks of a
+    #                              file that is still queued are coalesced
+    #   append(path, text)         append to a log; consecutive appends to the
+    #                              same file share one write and one fsync
+    #   submit(task)               run any other callable in order
+    # `save` replaces the function that does the actual write, e.g. to take a
+    # lock around it.
+    def __init__(self, on_error=report_to_stderr, group_commit_delay=0.02):
+        self.on_error = on_error
+        self.group_commit_delay = group_commit_delay
+        self.queue = queue.Queue()
+        self.dirty = {}
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, name="moviemate-persistence", daemon=True)
+        self.thread.start()
+
+    def mark_dirty(self, path, produce, save=write_json):
+        with self.lock:
+            queued = path in self.dirty
+            self.dirty[path] = (produce, save)
+        if not queued:
+            self.queue.put(("write", path))
+
+    def append(self, path, text, save=append_durable):
+        self.queue.put(("append", path, text, save))
+
+    def submit(self, task):
+        self.queue.put(("task", task))
+
+    def flush(self, timeout=None):
+        # False if the writes did not all land, including when the thread is
+        # gone and nothing ever will
+        if not self.thread.is_alive():
+            return False
+        done = threading.Event()
+        self.queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def stop(self, timeout=None):
+        if self.thread.is_alive():
+            self.flush(timeout)
+            self.queue.put(None)
+            self.thread.join(timeout)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            # Let a burst of changes pile up so they share a commit
+            time.sleep(self.group_commit_delay)
+            batch = [item]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            self.process([item for item in batch if item is not None])
+            if stop:
+                return
+
+    def process(self, batch):
+        pending_appends = []
+        for item in batch:
+            if item[0] == "append":
+                if pending_appends and pending_appends[-1][0] != item[1]:
+                    self.write_appends(pending_appends)
+                    pending_appends = []
+                pending_appends.append(item[1:])
+                continue
+            if pending_appends:
+                self.write_appends(pending_appends)
+                pending_appends = []
+
+            if item[0] == "write":
+                self.write_file(item[1])
+            elif item[0] == "task":
+                try:
+                    item[1]()
+                except Exception as e:
+                    self.on_error(f"Failed to save: {str(e)}")
+            elif item[0] == "flush":
+                item[1].set()
+        if pending_appends:
+            self.write_appends(pending_appends)
+
+    def write_file(self, path):
+        with self.lock:
+            produce, save = self.dirty.pop(path, (None, None))
+        if produce is None:
+            return
+        try:
+            save(path, produce)
+        except Exception as e:
+            # Anything escaping here would end the thread and every later write
+            self.on_error(f"Failed to save {path}: {str(e)}")
+
+    def write_appends(self, appends):
+        path, _, save = appends[0]
+        try:
+            save(path, "".join(text for _, text, _ in appends))
+        except Exception as e:
+            self.on_error(f"Failed to save {path}: {str(e)}")
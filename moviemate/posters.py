@@ -0,0 +1,62 @@
+import os
+
+
+class PosterDirectory:
+    # The set of files in the poster directory, read with one os.scandir
+    # instead of a stat per movie, so render paths never touch the disk to
+    # decide whether a poster exists. Each file carries a version that
+    # changes whenever the service writes it; image caches key on it in
+    # place of the file's mtime.
+    #
+    # Changes made through the service are applied directly. Anything done
+    # to the directory behind the app's back is picked up by refresh(), which
+    # costs one stat of the directory and rescans only if its mtime moved.
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+        self.version = 0
+        self.mtime = None
+        self.scan()
+
+    def scan(self):
+        self.version += 1
+        self.mtime = self.dir_mtime()
+        try:
+            with os.scandir(self.path) as entries:
+                names = [entry.name for entry in entries if entry.is_file()]
+        except OSError:
+            names = []
+        # Files that were already known keep their version so cached images
+        # stay valid across a rescan
+        self.files = {name: self.files.get(name, self.version) for name in names}
+
+    def dir_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self):
+        mtime = self.dir_mtime()
+        if mtime == self.mtime:
+            return False
+        self.scan()
+        return True
+
+    def __contains__(self, name):
+        return name in self.files
+
+    def __len__(self):
+        return len(self.files)
+
+    def version_of(self, name):
+        return self.files.get(name)
+
+    def added(self, name):
+        self.version += 1
+        self.files[name] = self.version
+        self.mtime = self.dir_mtime()
+
+    def removed(self, name):
+        self.files.pop(name, None)
+        self.mtime = self.dir_mtime()
@@ -0,0 +1,117 @@
+from array import array
+from bisect import bisect_left
+
+# Turns a string of "0"/"1" flags into bytes that iterate as 0/1 ints
+FLAG_VALUES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class PackedRatings:
+    # One user's ratings, packed: a sorted array of the rated movie ids at
+    # 4 bytes each, and a bitmap whose bit i is set when ids[i] was liked.
+    # Ratings are binary, so that is all a user needs -- about 4 bytes a
+    # rating against ~100 for a dict entry. The liked bitmap is a Python int,
+    # so counting likes is int.bit_count().
+    #
+    # Behaves as a {movie id: 1|0} mapping; iteration is in id order. The
+    # (ids, liked) pair is replaced as a whole on every change and never
+    # mutated in place, so the persistence thread snapshotting it while the
+    # owner thread rates a movie always sees a consistent pair.
+    __slots__ = ("state",)
+
+    def __init__(self, ratings=None):
+        self.state = self.pack(sorted((ratings or {}).items()))
+
+    @staticmethod
+    def pack(items):
+        # items: [(movie id, 1|0)] sorted by id
+        flags = "".join(["1" if rating == 1 else "0" for _, rating in reversed(items)])
+        return array("I", [movie_id for movie_id, _ in items]), int(flags or "0", 2)
+
+    @classmethod
+    def from_sorted(cls, items):
+        packed = cls.__new__(cls)
+        packed.state = cls.pack(items)
+        return packed
+
+    def __len__(self):
+        return len(self.state[0])
+
+    def __bool__(self):
+        return len(self.state[0]) > 0
+
+    def __contains__(self, movie_id):
+        return self.get(movie_id) is not None
+
+    def __iter__(self):
+        return iter(self.state[0])
+
+    def __getitem__(self, movie_id):
+        rating = self.get(movie_id)
+        if rating is None:
+            raise KeyError(movie_id)
+        return rating
+
+    def get(self, movie_id, default=None):
+        ids, liked = self.state
+        index = bisect_left(ids, movie_id)
+        if index == len(ids) or ids[index] != movie_id:
+            return default
+        return liked >> index & 1
+
+    def __setitem__(self, movie_id, rating):
+        ids, liked = self.state
+        index = bisect_left(ids, movie_id)
+        bit = 1 if rating == 1 else 0
+        if index < len(ids) and ids[index] == movie_id:
+            liked = liked & ~(1 << index) | bit << index
+        else:
+            ids = ids[:index] + array("I", [movie_id]) + ids[index:]
+            low = liked & ((1 << index) - 1)
+            liked = (liked >> index) << (index + 1) | bit << index | low
+        self.state = (ids, liked)
+
+    def __delitem__(self, movie_id):
+        if self.pop(movie_id) is None:
+            raise KeyError(movie_id)
+
+    def pop(self, movie_id, default=None):
+        ids, liked = self.state
+        index = bisect_left(ids, movie_id)
+        if index == len(ids) or ids[index] != movie_id:
+            return default
+        rating = liked >> index & 1
+        low = liked & ((1 << index) - 1)
+        self.state = (ids[:index] + ids[index + 1:], (liked >> (index + 1)) << index | low)
+        return rating
+
+    def keys(self):
+        return list(self.state[0])
+
+    def unpack(self):
+        # (ids, "1"/"0" flag per id) from one read of the state
+        ids, liked = self.state
+        return ids, format(liked, f"0{len(ids)}b")[::-1] if ids else ""
+
+    def items(self):
+        ids, flags = self.unpack()
+        return list(zip(ids, flags.encode().translate(FLAG_VALUES)))
+
+    def values(self):
+        return list(self.unpack()[1].encode().translate(FLAG_VALUES))
+
+    def liked_count(self):
+        return self.state[1].bit_count()
+
+    def liked_ids(self):
+        ids, flags = self.unpack()
+        return [movie_id for movie_id, flag in zip(ids, flags) if flag == "1"]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"PackedRatings({self.to_dict()!r})"
+
+
+# Returned for users with no ratings; never written to
+NO_RATINGS = PackedRatings()
@@ -0,0 +1,213 @@
+import heapq
+import math
+from collections import OrderedDict, defaultdict
+from itertools import islice
+from operator import itemgetter
+
+
+class ItemItemRecommender:
+    # Item-item collaborative filtering over a sparse user x movie matrix.
+    # A like is stored as +1 and a dislike as -1, both by row (user -> movies)
+    # and by column (movie -> users), and kept up to date on every rating.
+    #
+    # Similarity is the cosine of two movie columns. Each movie's most similar
+    # movies are computed on first use from the users who rated it and then
+    # cached. Scoring a user is then one pass over their ratings times
+    # `neighbours`, independent of the number of users.
+    #
+    # A rating only changes the dot products between the rated movie and the
+    # other movies that user rated, so instead of dropping those movies'
+    # cached lists, update() patches the affected pairs in place. The lists
+    # are approximate: popular movies are computed from a sample of
+    # `max_raters` raters, a patch uses the column sizes of the moment and
+    # does not rescale other entries when a norm changes, and a pair that was
+    # not in a full list enters with only its patched part. Each list is
+    # therefore recomputed from scratch after `refresh_after` patches.
+    # Deleting a user or a movie still drops the lists it touched.
+    def __init__(self, ratings, neighbours=50, max_raters=500, refresh_after=100):
+        self.neighbours = neighbours
+        self.max_raters = max_raters
+        self.refresh_after = refresh_after
+        self.rows = {}
+        self.cols = defaultdict(dict)
+        self.neighbour_cache = {}
+        self.patch_counts = {}
+        for user, user_ratings in ratings.items():
+            row = self.rows.setdefault(user, {})
+            for movie_id, rating in user_ratings.items():
+                value = 1 if rating == 1 else -1
+                row[movie_id] = value
+                self.cols[movie_id][user] = value
+
+    def update(self, user, movie_id, rating):
+        row = self.rows.setdefault(user, {})
+        old_value = row.get(movie_id, 0)
+        if rating is None:
+            value = 0
+            row.pop(movie_id, None)
+            column = self.cols.get(movie_id)
+            if column is not None:
+                column.pop(user, None)
+                if not column:
+                    del self.cols[movie_id]
+        else:
+            value = 1 if rating == 1 else -1
+            row[movie_id] = value
+            self.cols[movie_id][user] = value
+        if value != old_value:
+            self.patch(row, movie_id, value - old_value)
+
+    def patch(self, row, movie_id, delta):
+        # dot(movie_id, other) moved by delta * row[other] for every other
+        # movie in the row
+        norm = math.sqrt(len(self.cols.get(movie_id, ()))) or 1.0
+        changes = []
+        for other, other_value in row.items():
+            if other != movie_id:
+                other_norm = math.sqrt(len(self.cols.get(other, ()))) or 1.0
+                changes.append((other, delta * other_value / (norm * other_norm)))
+        neighbours = self.patchable(movie_id)
+        if neighbours is not None:
+            for other, change in changes:
+                self.patch_pair(neighbours, other, change)
+        for other, change in changes:
+            neighbours = self.patchable(other)
+            if neighbours is not None:
+                self.patch_pair(neighbours, movie_id, change)
+
+    def patchable(self, movie_id):
+        # The cached list to patch, or None if there is none or it is due for
+        # a recompute
+        neighbours = self.neighbour_cache.get(movie_id)
+        if neighbours is None:
+            return None
+        count = self.patch_counts.get(movie_id, 0) + 1
+        if count > self.refresh_after:
+            self.neighbour_cache.pop(movie_id, None)
+            self.patch_counts.pop(movie_id, None)
+            return None
+        self.patch_counts[movie_id] = count
+        return neighbours
+
+    def patch_pair(self, neighbours, other, change):
+        for index, (candidate, similarity) in enumerate(neighbours):
+            if candidate == other:
+                similarity += change
+                if similarity > 0:
+                    neighbours[index] = (other, similarity)
+                else:
+                    del neighbours[index]
+                return
+        if change <= 0:
+            return
+        if len(neighbours) < self.neighbours:
+            neighbours.append((other, change))
+            return
+        weakest = min(range(len(neighbours)), key=lambda index: neighbours[index][1])
+        if change > neighbours[weakest][1]:
+            neighbours[weakest] = (other, change)
+
+    def remove_user(self, user):
+        row = self.rows.pop(user, {})
+        for movie_id in row:
+            self.neighbour_cache.pop(movie_id, None)
+            column = self.cols.get(movie_id)
+            if column is not None:
+                column.pop(user, None)
+                if not column:
+                    del self.cols[movie_id]
+
+    def raters(self, movie_id):
+        # Users who rated the movie; the columns double as the service's
+        # movie -> raters index
+        return list(self.cols.get(movie_id, ()))
+
+    def rater_count(self, movie_id):
+        return len(self.cols.get(movie_id, ()))
+
+    def remove_movie(self, movie_id):
+        for user in self.cols.pop(movie_id, {}):
+            row = self.rows.get(user, {})
+            row.pop(movie_id, None)
+            self.invalidate(row, movie_id)
+
+    def invalidate(self, row, movie_id):
+        self.neighbour_cache.pop(movie_id, None)
+        for other in row:
+            self.neighbour_cache.pop(other, None)
+
+    def similar(self, movie_id):
+        cached = self.neighbour_cache.get(movie_id)
+        if cached is not None:
+            return cached
+
+        column = self.cols.get(movie_id, {})
+        dots = defaultdict(int)
+        # Very popular movies are estimated from a bounded set of raters
+        for user, value in islice(column.items(), self.max_raters):
+            for other, other_value in self.rows[user].items():
+                dots[other] += value * other_value
+        dots.pop(movie_id, None)
+
+        norm = math.sqrt(len(column)) or 1.0
+        similarities = ((other, dot / (norm * math.sqrt(len(self.cols[other]))))
+                        for other, dot in dots.items() if dot > 0)
+        result = heapq.nlargest(self.neighbours, similarities, key=itemgetter(1))
+        self.neighbour_cache[movie_id] = result
+        self.patch_counts.pop(movie_id, None)
+        return result
+
+    def recommend(self, user, limit=10):
+        row = self.rows.get(user, {})
+        scores = defaultdict(float)
+        for movie_id, value in row.items():
+            for other, similarity in self.similar(movie_id):
+                if other not in row:
+                    scores[other] += value * similarity
+        positive = ((movie_id, score) for movie_id, score in scores.items() if score > 0)
+        return heapq.nlargest(limit, positive, key=itemgetter(1))
+
+
+class RecommendationCache:
+    # Finished recommendation lists keyed by (user, limit), each stored with
+    # the version it was computed at: the user's ratings version and the
+    # catalog version, see MovieMateService. An entry is only returned while
+    # both still match, so a lookup is one dict access. Other users' ratings
+    # do not invalidate it; their effect on someone's neighbours shows once
+    # that user rates something. Least recently used entries are evicted
+    # past max_entries.
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key, version):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, key, version, movies):
+        self.entries[key] = (version, movies)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
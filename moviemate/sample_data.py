@@ -0,0 +1,125 @@
+def mini_database():
+    # The starter catalog written on first run when movies.json is empty.
+    # Built fresh on each call because callers mutate it in place.
+    return {
+        "Action": [
+            {"title": "The Dark Knight", "year": "2008", "description": "Batman faces the Joker in Gotham.", "poster": "dark_knight.jpg", "id": 1},
+            {"title": "Inception", "year": "2010", "description": "A thief enters dreams to steal secrets.", "poster": "inception.jpg", "id": 2},
+            {"title": "Mad Max: Fury Road", "year": "2015", "description": "A post-apocalyptic chase in the wasteland.", "poster": "mad_max.jpg", "id": 3},
+            {"title": "Gladiator", "year": "2000", "description": "A Roman general seeks vengeance.", "poster": "gladiator.jpg", "id": 4},
+            {"title": "Die Hard", "year": "1988", "description": "A cop battles terrorists in a skyscraper.", "poster": "die_hard.jpg", "id": 5},
+            {"title": "John Wick", "year": "2014", "description": "An ex-hitman seeks revenge after his dog is killed.", "poster": "john_wick.jpg", "id": 6},
+            {"title": "The Bourne Identity", "year": "2002", "description": "A man with amnesia uncovers his past as a spy.", "poster": "bourne_identity.jpg", "id": 7},
+            {"title": "Mission: Impossible - Fallout", "year": "2018", "description": "Ethan Hunt races to stop a global catastrophe.", "poster": "mission_impossible_fallout.jpg", "id": 8},
+            {"title": "Skyfall", "year": "2012", "description": "James Bond's loyalty to M is tested.", "poster": "skyfall.jpg", "id": 9},
+            {"title": "The Expendables", "year": "2010", "description": "A group of mercenaries takes on a dangerous mission.", "poster": "expendables.jpg", "id": 10},
+            {"title": "Black Panther", "year": "2018", "description": "T'Challa becomes king of Wakanda and faces challenges.", "poster": "black_panther.jpg", "id": 11},
+            {"title": "Avengers: Endgame", "year": "2019", "description": "The Avengers assemble to undo Thanos' actions.", "poster": "avengers_endgame.jpg", "id": 12},
+            {"title": "Casino Royale", "year": "2006", "description": "James Bond takes on a terrorist financier in a high-stakes poker game.", "poster": "casino_royale.jpg", "id": 71},
+            {"title": "Speed", "year": "1994", "description": "A cop must prevent a bomb on a bus from exploding.", "poster": "speed.jpg", "id": 72},
+            {"title": "The Equalizer", "year": "2014", "description": "A retired operative takes on a Russian mafia.", "poster": "equalizer.jpg", "id": 73}
+        ],
+        "Comedy": [
+            {"title": "Superbad", "year": "2007", "description": "High schoolers throw a wild party.", "poster": "superbad.jpg", "id": 13},
+            {"title": "The Hangover", "year": "2009", "description": "A bachelor party goes wrong in Vegas.", "poster": "hangover.jpg", "id": 14},
+            {"title": "Deadpool", "year": "2016", "description": "A mercenary with a sense of humor.", "poster": "deadpool.jpg", "id": 15},
+            {"title": "Zombieland", "year": "2009", "description": "Survivors in a zombie apocalypse.", "poster": "zombieland.jpg", "id": 16},
+            {"title": "Pitch Perfect", "year": "2012", "description": "A college a cappella group competes.", "poster": "pitch_perfect.jpg", "id": 17},
+            {"title": "Anchorman", "year": "2004", "description": "A 1970s news anchor faces challenges.", "poster": "anchorman.jpg", "id": 18},
+            {"title": "Step Brothers", "year": "2008", "description": "Two grown men become stepbrothers and cause chaos.", "poster": "step_brothers.jpg", "id": 19},
+            {"title": "Mean Girls", "year": "2004", "description": "A teen navigates high school social hierarchies.", "poster": "mean_girls.jpg", "id": 20},
+            {"title": "The Nice Guys", "year": "2016", "description": "A private eye and a hired enforcer team up in 1970s LA.", "poster": "nice_guys.jpg", "id": 21},
+            {"title": "21 Jump Street", "year": "2012", "description": "Two cops go undercover at a high school.", "poster": "21_jump_street.jpg", "id": 22},
+            {"title": "Knives Out", "year": "2019", "description": "A detective investigates a dysfunctional family's patriarch's death.", "poster": "knives_out.jpg", "id": 23},
+            {"title": "Game Night", "year": "2018", "description": "A game night turns into a real mystery.", "poster": "game_night.jpg", "id": 24},
+            {"title": "Crazy Rich Asians", "year": "2018", "description": "A woman discovers her boyfriend's wealthy family in Singapore.", "poster": "crazy_rich_asians.jpg", "id": 74},
+            {"title": "The Grand Budapest Hotel", "year": "2014", "description": "A concierge and his lobby boy get embroiled in a caper.", "poster": "grand_budapest_hotel.jpg", "id": 75},
+            {"title": "Jojo Rabbit", "year": "2019", "description": "A boy has an imaginary friend who is Adolf Hitler.", "poster": "jojo_rabbit.jpg", "id": 76}
+        ],
+        "Drama": [
+            {"title": "The Shawshank Redemption", "year": "1994", "description": "Two prisoners find hope.", "poster": "shawshank.jpg", "id": 25},
+            {"title": "Forrest Gump", "year": "1994", "description": "A man witnesses history.", "poster": "forrest_gump.jpg", "id": 26},
+            {"title": "Fight Club", "year": "1999", "description": "An underground fight club spirals out of control.", "poster": "fight_club.jpg", "id": 27},
+            {"title": "The Godfather", "year": "1972", "description": "A mafia family saga.", "poster": "godfather.jpg", "id": 28},
+            {"title": "Schindler's List", "year": "1993", "description": "A businessman saves Jews during the Holocaust.", "poster": "schindlers_list.jpg", "id": 29},
+            {"title": "The Green Mile", "year": "1999", "description": "A death row guard encounters a unique prisoner.", "poster": "green_mile.jpg", "id": 30},
+            {"title": "12 Years a Slave", "year": "2013", "description": "A free man is kidnapped and sold into slavery.", "poster": "12_years_a_slave.jpg", "id": 31},
+            {"title": "The Pursuit of Happyness", "year": "2006", "description": "A struggling salesman fights for a better life.", "poster": "pursuit_of_happyness.jpg", "id": 32},
+            {"title": "A Beautiful Mind", "year": "2001", "description": "A mathematician struggles with schizophrenia.", "poster": "beautiful_mind.jpg", "id": 33},
+            {"title": "The Wolf of Wall Street", "year": "2013", "description": "A stockbroker's rise and fall in corruption.", "poster": "wolf_of_wall_street.jpg", "id": 34},
+            {"title": "Moonlight", "year": "2016", "description": "A young man grows up in a tough Miami neighborhood.", "poster": "moonlight.jpg", "id": 77},
+            {"title": "Manchester by the Sea", "year": "2016", "description": "A man returns to his hometown after his brother's death.", "poster": "manchester_by_the_sea.jpg", "id": 78},
+            {"title": "The Departed", "year": "2006", "description": "An undercover cop and a mole infiltrate each other's worlds.", "poster": "departed.jpg", "id": 79}
+        ],
+        "Science Fiction": [
+            {"title": "Interstellar", "year": "2014", "description": "Explorers travel through a wormhole.", "poster": "interstellar.jpg", "id": 35},
+            {"title": "The Matrix", "year": "1999", "description": "A hacker discovers reality's truth.", "poster": "matrix.jpg", "id": 36},
+            {"title": "Blade Runner 2049", "year": "2017", "description": "A replicant hunter uncovers a secret.", "poster": "blade_runner_2049.jpg", "id": 37},
+            {"title": "Dune", "year": "2021", "description": "A noble family controls a desert planet.", "poster": "dune.jpg", "id": 38},
+            {"title": "Star Wars: The Empire Strikes Back", "year": "1980", "description": "The Rebels face the Empire's wrath.", "poster": "empire_strikes_back.jpg", "id": 39},
+            {"title": "Arrival", "year": "2016", "description": "A linguist communicates with alien visitors.", "poster": "arrival.jpg", "id": 40},
+            {"title": "Ex Machina", "year": "2014", "description": "A programmer tests an AI's capabilities.", "poster": "ex_machina.jpg", "id": 41},
+            {"title": "2001: A Space Odyssey", "year": "1968", "description": "A journey to Jupiter with a mysterious monolith.", "poster": "2001_space_odyssey.jpg", "id": 42},
+            {"title": "Annihilation", "year": "2018", "description": "A team explores a mysterious zone called The Shimmer.", "poster": "annihilation.jpg", "id": 43},
+            {"title": "Her", "year": "2013", "description": "A man falls in love with an AI operating system.", "poster": "her.jpg", "id": 80},
+            {"title": "Edge of Tomorrow", "year": "2014", "description": "A soldier relives the same day to fight aliens.", "poster": "edge_of_tomorrow.jpg", "id": 81},
+            {"title": "The Martian", "year": "2015", "description": "An astronaut is stranded on Mars and must survive.", "poster": "martian.jpg", "id": 82}
+        ],
+        "Horror": [
+            {"title": "The Shining", "year": "1980", "description": "A family is haunted in an isolated hotel.", "poster": "shining.jpg", "id": 44},
+            {"title": "Get Out", "year": "2017", "description": "A man uncovers a dark secret at his girlfriend's family estate.", "poster": "get_out.jpg", "id": 45},
+            {"title": "Hereditary", "year": "2018", "description": "A family is haunted by sinister forces after a death.", "poster": "hereditary.jpg", "id": 46},
+            {"title": "It", "year": "2017", "description": "Kids face a shape-shifting entity in Derry.", "poster": "it.jpg", "id": 47},
+            {"title": "The Conjuring", "year": "2013", "description": "Paranormal investigators help a family in a haunted house.", "poster": "conjuring.jpg", "id": 48},
+            {"title": "A Quiet Place", "year": "2018", "description": "A family must live in silence to avoid creatures that hunt by sound.", "poster": "quiet_place.jpg", "id": 83},
+            {"title": "The Witch", "year": "2015", "description": "A Puritan family encounters evil in 17th-century New England.", "poster": "witch.jpg", "id": 84},
+            {"title": "Midsommar", "year": "2019", "description": "A couple visits a Swedish festival that turns sinister.", "poster": "midsommar.jpg", "id": 85}
+        ],
+        "Romance": [
+            {"title": "The Notebook", "year": "2004", "description": "A couple's love story unfolds through a notebook.", "poster": "notebook.jpg", "id": 49},
+            {"title": "La La Land", "year": "2016", "description": "A musician and an actress fall in love in LA.", "poster": "la_la_land.jpg", "id": 50},
+            {"title": "Pride & Prejudice", "year": "2005", "description": "Elizabeth Bennet navigates love and societal expectations.", "poster": "pride_prejudice.jpg", "id": 51},
+            {"title": "Before Sunrise", "year": "1995", "description": "Two strangers meet and connect in Vienna.", "poster": "before_sunrise.jpg", "id": 52},
+            {"title": "Amélie", "year": "2001", "description": "A shy waitress changes lives in Paris with small acts of kindness.", "poster": "amelie.jpg", "id": 86},
+            {"title": "Call Me by Your Name", "year": "2017", "description": "A teen experiences a summer romance in 1980s Italy.", "poster": "call_me_by_your_name.jpg", "id": 87},
+            {"title": "A Star Is Born", "year": "2018", "description": "A musician helps a young singer find fame as he struggles.", "poster": "star_is_born.jpg", "id": 88}
+        ],
+        "Thriller": [
+            {"title": "Se7en", "year": "1995", "description": "Two detectives hunt a serial killer with a twisted motive.", "poster": "se7en.jpg", "id": 53},
+            {"title": "Gone Girl", "year": "2014", "description": "A man becomes a suspect in his wife's disappearance.", "poster": "gone_girl.jpg", "id": 54},
+            {"title": "Shutter Island", "year": "2010", "description": "A marshal investigates a patient's disappearance on an island.", "poster": "shutter_island.jpg", "id": 55},
+            {"title": "The Silence of the Lambs", "year": "1991", "description": "An FBI agent seeks help from a cannibalistic killer.", "poster": "silence_of_the_lambs.jpg", "id": 56},
+            {"title": "Parasite", "year": "2019", "description": "A poor family infiltrates a wealthy household.", "poster": "parasite.jpg", "id": 57},
+            {"title": "Prisoners", "year": "2013", "description": "A father takes desperate measures when his daughter goes missing.", "poster": "prisoners.jpg", "id": 89},
+            {"title": "Nightcrawler", "year": "2014", "description": "A driven man becomes a crime journalist in LA.", "poster": "nightcrawler.jpg", "id": 90},
+            {"title": "Zodiac", "year": "2007", "description": "Investigators hunt the Zodiac Killer in San Francisco.", "poster": "zodiac.jpg", "id": 91}
+        ],
+        "Adventure": [
+            {"title": "Jurassic Park", "year": "1993", "description": "A theme park with cloned dinosaurs goes wrong.", "poster": "jurassic_park.jpg", "id": 58},
+            {"title": "Indiana Jones: Raiders of the Lost Ark", "year": "1981", "description": "An archaeologist races to find the Ark of the Covenant.", "poster": "raiders_lost_ark.jpg", "id": 59},
+            {"title": "The Lord of the Rings: The Fellowship of the Ring", "year": "2001", "description": "A hobbit embarks on a quest to destroy a powerful ring.", "poster": "lotr_fellowship.jpg", "id": 60},
+            {"title": "Pirates of the Caribbean: The Curse of the Black Pearl", "year": "2003", "description": "A pirate and a blacksmith rescue a kidnapped maiden.", "poster": "pirates_caribbean.jpg", "id": 61},
+            {"title": "The Revenant", "year": "2015", "description": "A frontiersman seeks survival and revenge in the wilderness.", "poster": "revenant.jpg", "id": 92},
+            {"title": "Life of Pi", "year": "2012", "description": "A young man survives a shipwreck with a Bengal tiger.", "poster": "life_of_pi.jpg", "id": 93},
+            {"title": "Into the Wild", "year": "2007", "description": "A young man abandons society to live in the Alaskan wilderness.", "poster": "into_the_wild.jpg", "id": 94}
+        ],
+        "Animation": [
+            {"title": "Toy Story", "year": "1995", "description": "Toys come to life when humans aren't looking.", "poster": "toy_story.jpg", "id": 62},
+            {"title": "Spirited Away", "year": "2001", "description": "A girl navigates a magical world to save her parents.", "poster": "spirited_away.jpg", "id": 63},
+            {"title": "The Incredibles", "year": "2004", "description": "A family of superheroes saves the world.", "poster": "incredibles.jpg", "id": 64},
+            {"title": "Coco", "year": "2017", "description": "A boy journeys to the Land of the Dead to uncover his family history.", "poster": "coco.jpg", "id": 65},
+            {"title": "Inside Out", "year": "2015", "description": "Emotions guide a young girl through a life change.", "poster": "inside_out.jpg", "id": 66},
+            {"title": "Finding Nemo", "year": "2003", "description": "A clownfish searches for his lost son in the ocean.", "poster": "finding_nemo.jpg", "id": 95},
+            {"title": "Up", "year": "2009", "description": "An elderly man embarks on an adventure with a floating house.", "poster": "up.jpg", "id": 96},
+            {"title": "WALL-E", "year": "2008", "description": "A small waste-collecting robot finds love and saves Earth.", "poster": "wall_e.jpg", "id": 97}
+        ],
+        "Mystery": [
+            {"title": "The Sixth Sense", "year": "1999", "description": "A boy who sees dead people seeks help from a psychologist.", "poster": "sixth_sense.jpg", "id": 67},
+            {"title": "Memento", "year": "2000", "description": "A man with short-term memory loss hunts his wife's killer.", "poster": "memento.jpg", "id": 68},
+            {"title": "The Others", "year": "2001", "description": "A woman suspects her house is haunted.", "poster": "others.jpg", "id": 69},
+            {"title": "Oldboy", "year": "2003", "description": "A man seeks answers after being imprisoned for 15 years.", "poster": "oldboy.jpg", "id": 70},
+            {"title": "The Girl with the Dragon Tattoo", "year": "2011", "description": "A journalist and hacker investigate a decades-old disappearance.", "poster": "girl_with_dragon_tattoo.jpg", "id": 98},
+            {"title": "Donnie Darko", "year": "2001", "description": "A troubled teen has visions of a man in a rabbit suit.", "poster": "donnie_darko.jpg", "id": 99},
+            {"title": "L.A. Confidential", "year": "1997", "description": "Cops uncover corruption in 1950s Los Angeles.", "poster": "la_confidential.jpg", "id": 100}
+        ]
+    }
@@ -0,0 +1,278 @@
+import bisect
+import heapq
+import re
+import threading
+from collections import defaultdict
+from operator import itemgetter
+
+TOKEN_RE = re.compile(r"\w+")
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+# The last word of a query is completed as a prefix once it is this long
+MIN_PREFIX = 2
+MAX_PREFIX_TERMS = 200
+# Postings at least this long also keep their ids grouped by weight, so the
+# best matches of a common word are read off without scoring all of them
+TIER_MIN = 64
+# Up to this many movies matching every word are all scored; past it the
+# best ones are found by reading the words' postings best first
+MAX_SCORED = 2000
+# Rarest words longer than this are not worth intersecting
+MAX_NARROWED = 20000
+# Words too common to narrow a search down. They are indexed like any other
+# word, since some titles are nothing else ("Her", "It"), but skipped in a
+# query unless they are its last word, which may also be a prefix being typed
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has he her his in is it its of on or she that the "
+    "their they this to was were who will with".split())
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.casefold())
+
+
+def query_tokens(query):
+    tokens = tokenize(query)
+    return [token for token in tokens[:-1] if token not in STOPWORDS] + tokens[-1:]
+
+
+class SearchIndex:
+    # Inverted index over movie titles and descriptions. `postings` maps a
+    # word to {movie id: weight}, where each occurrence in the title counts
+    # TITLE_WEIGHT and each one in the description DESCRIPTION_WEIGHT.
+    # `terms` is the sorted vocabulary, so the last word of a query can be
+    # completed as a prefix while the user is still typing. Every word of the
+    # query has to match; results are ranked by summed weight.
+    #
+    # `tiers` maps a word with a long posting to {weight: {movie id: None}},
+    # the same entries grouped by weight in insertion order, so postings can
+    # be read best first. A query matching few movies scores them all; one
+    # matching many, such as a single common word or a short prefix, reads
+    # the postings best first and stops once nothing left can make the top.
+    #
+    # Queries run on a worker while the catalog changes on the UI thread, so
+    # every public method takes the lock. add() and remove() are idempotent,
+    # which lets the catalog apply changes before the first build.
+    def __init__(self):
+        self.postings = {}
+        self.tiers = {}
+        self.terms = []
+        self.docs = {}
+        self.by_genre = defaultdict(set)
+        self.built = False
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def ensure_built(self, entries):
+        # entries() returns [(movie, genre)]; it is called under the lock so
+        # a catalog change either lands in the snapshot or waits for the build
+        with self.lock:
+            if self.built:
+                return
+            new_terms = []
+            for movie, genre in entries():
+                self._add(movie, genre, new_terms)
+            self.terms = sorted(set(self.terms).union(new_terms))
+            self.built = True
+
+    def add(self, movie, genre):
+        with self.lock:
+            new_terms = []
+            self._add(movie, genre, new_terms)
+            for term in new_terms:
+                bisect.insort(self.terms, term)
+
+    def remove(self, movie_id):
+        with self.lock:
+            self._remove(movie_id)
+
+    def _add(self, movie, genre, new_terms):
+        self._remove(movie["id"])
+        weights = defaultdict(int)
+        for token in tokenize(movie["title"]):
+            weights[token] += TITLE_WEIGHT
+        for token in tokenize(movie.get("description", "")):
+            weights[token] += DESCRIPTION_WEIGHT
+        for token, weight in weights.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                new_terms.append(token)
+            posting[movie["id"]] = weight
+            tiers = self.tiers.get(token)
+            if tiers is not None:
+                tiers.setdefault(weight, {})[movie["id"]] = None
+            elif len(posting) >= TIER_MIN:
+                self.tiers[token] = tiers = {}
+                for movie_id, movie_weight in posting.items():
+                    tiers.setdefault(movie_weight, {})[movie_id] = None
+        self.docs[movie["id"]] = (movie, genre, weights)
+        self.by_genre[genre].add(movie["id"])
+
+    def _remove(self, movie_id):
+        doc = self.docs.pop(movie_id, None)
+        if doc is None:
+            return
+        self.by_genre[doc[1]].discard(movie_id)
+        for token in doc[2]:
+            posting = self.postings[token]
+            weight = posting.pop(movie_id)
+            tiers = self.tiers.get(token)
+            if tiers is not None:
+                tier = tiers[weight]
+                del tier[movie_id]
+                if not tier:
+                    del tiers[weight]
+            if not posting:
+                del self.postings[token]
+                self.tiers.pop(token, None)
+                index = bisect.bisect_left(self.terms, token)
+                if index < len(self.terms) and self.terms[index] == token:
+                    del self.terms[index]
+
+    def completions(self, prefix):
+        start = bisect.bisect_left(self.terms, prefix)
+        end = start
+        while end < len(self.terms) and end - start < MAX_PREFIX_TERMS and self.terms[end].startswith(prefix):
+            end += 1
+        return self.terms[start:end]
+
+    def ranked(self, term, factor=1):
+        # (weight, movie id) for one word, best first
+        tiers = self.tiers.get(term)
+        if tiers is None:
+            best = sorted(self.postings[term].items(), key=itemgetter(1), reverse=True)
+            return [(weight * factor, movie_id) for movie_id, weight in best]
+        return ((weight * factor, movie_id) for weight in sorted(tiers, reverse=True) for movie_id in tiers[weight])
+
+    def score(self, movie_id, tokens, factors):
+        # Summed weight of the query words in one movie, or None when one is
+        # missing; factors maps the completions of the word being typed to
+        # how much they count, and the best of them is taken
+        weights = self.docs[movie_id][2]
+        total = 0
+        for token in tokens:
+            if token not in weights:
+                return None
+            total += weights[token]
+        if factors:
+            best = 0
+            for token, weight in weights.items():
+                factor = factors.get(token)
+                if factor and weight * factor > best:
+                    best = weight * factor
+            if not best:
+                return None
+            total += best
+        return total
+
+    def score_all(self, candidates, tokens, factors):
+        # {movie id: score} for movies known to match every word, summed a
+        # word at a time from the postings
+        scores = dict.fromkeys(candidates, 0)
+        for token in tokens:
+            posting = self.postings[token]
+            for movie_id in scores:
+                scores[movie_id] += posting[movie_id]
+        if factors:
+            best = dict.fromkeys(candidates, 0)
+            for term, factor in factors.items():
+                posting = self.postings[term]
+                for movie_id in posting.keys() & best.keys():
+                    weight = posting[movie_id] * factor
+                    if weight > best[movie_id]:
+                        best[movie_id] = weight
+            for movie_id, weight in best.items():
+                scores[movie_id] += weight
+        return scores
+
+    def top(self, streams, tokens, factors, limit, genre):
+        # Threshold algorithm: the streams are read best first in turn and
+        # each new movie is scored in full from its own words. A movie not
+        # read yet scores at most the sum of the weights last read, so once
+        # `limit` movies reach that the rest is skipped. A movie matching
+        # every word is in every stream, so when one runs out all were seen.
+        allowed = self.by_genre.get(genre, set()) if genre is not None else None
+        streams = [iter(stream) for stream in streams]
+        frontier = [0] * len(streams)
+        seen = set()
+        best = []
+        done = False
+        while not done:
+            for index, stream in enumerate(streams):
+                item = next(stream, None)
+                if item is None:
+                    done = True
+                    break
+                frontier[index], movie_id = item
+                if movie_id in seen:
+                    continue
+                seen.add(movie_id)
+                if allowed is not None and movie_id not in allowed:
+                    continue
+                score = self.score(movie_id, tokens, factors)
+                if score is None:
+                    continue
+                # Ties go to the movie read first
+                entry = (score, -len(seen), movie_id)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+            else:
+                done = len(best) >= limit and best[0][0] >= sum(frontier)
+        return [self.docs[movie_id][0] for _, _, movie_id in sorted(best, reverse=True)]
+
+    def search(self, query, limit=50, genre=None):
+        # [movie] best first; genre restricts the results to one genre
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+        prefix = None
+        if not query[-1].isspace():
+            if len(tokens[-1]) >= MIN_PREFIX:
+                prefix = tokens.pop()
+            elif len(tokens) > 1:
+                # A single letter after other words would match nothing as a
+                # whole word; leave it out until it can be completed
+                tokens.pop()
+        if limit <= 0:
+            return []
+
+        with self.lock:
+            if any(token not in self.postings for token in tokens):
+                return []
+            # The exact word being typed counts fully, longer completions half
+            factors = {}
+            if prefix is not None:
+                factors = {term: 1 if term == prefix else 0.5 for term in self.completions(prefix)}
+                if not factors:
+                    return []
+            postings = sorted((self.postings[token] for token in tokens), key=len)
+            if len(tokens) + bool(factors) > 1 and postings and len(postings[0]) <= MAX_NARROWED:
+                # Narrow down from the rarest word with set intersections,
+                # which run in C and only walk the smaller side
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    candidates = posting.keys() & candidates
+                if genre is not None:
+                    candidates &= self.by_genre.get(genre, set())
+                if factors:
+                    matched = set()
+                    for term in factors:
+                        matched |= self.postings[term].keys() & candidates
+                        if len(matched) > MAX_SCORED:
+                            break
+                    candidates = matched
+                if len(candidates) <= MAX_SCORED:
+                    scores = self.score_all(candidates, tokens, factors)
+                    best = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+                    return [self.docs[movie_id][0] for movie_id, _ in best]
+            streams = [self.ranked(token) for token in tokens]
+            if factors:
+                ranked = [self.ranked(term, factor) for term, factor in factors.items()]
+                streams.append(ranked[0] if len(ranked) == 1 else
+                               heapq.merge(*ranked, key=itemgetter(0), reverse=True))
+            return self.top(streams, tokens, factors, limit, genre)
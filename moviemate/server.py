@@ -0,0 +1,306 @@
+import asyncio
+import json
+import secrets
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from moviemate.persistence import PersistenceWorker
+from moviemate.service import (AuthenticationError, MovieMateService, NotFoundError, ServiceError,
+                               ValidationError, hash_password, open_storage)
+
+AUTH_WORKERS = 4
+MAX_BODY = 64 * 1024
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+               500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def error_status(error):
+    if isinstance(error, AuthenticationError):
+        return 401
+    if isinstance(error, NotFoundError):
+        return 404
+    if isinstance(error, ValidationError):
+        return 409
+    return 400
+
+
+class MovieMateServer:
+    # JSON over HTTP/1.1 for the same data files the desktop app uses.
+    #
+    # The event loop only parses requests and routes them. MovieMateService
+    # is not thread-safe, so every call into it runs on `service_thread`, a
+    # single-thread executor: that is the one writer, and it also keeps
+    # recommendation scoring off the loop. bcrypt runs on `auth_pool`, which
+    # only reads the stored hash. File I/O is handed on to the same
+    # background PersistenceWorker the desktop app uses.
+    #
+    # Sessions are bearer tokens returned by /login and kept in memory.
+    def __init__(self, service, auth_workers=AUTH_WORKERS):
+        self.service = service
+        self.service_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="service")
+        self.auth_pool = ThreadPoolExecutor(max_workers=auth_workers, thread_name_prefix="auth")
+        self.sessions = {}
+        self.routes = {
+            ("POST", "/signup"): self.signup,
+            ("POST", "/login"): self.login,
+            ("POST", "/logout"): self.logout,
+            ("GET", "/genres"): self.genres,
+            ("GET", "/movies"): self.movies,
+            ("GET", "/search"): self.search,
+            ("GET", "/ratings"): self.ratings,
+            ("POST", "/ratings"): self.rate,
+            ("GET", "/recommendations"): self.recommendations,
+            ("GET", "/friends"): self.friends,
+            ("POST", "/friends/requests"): self.send_request,
+            ("POST", "/friends/accept"): self.accept_request,
+            ("POST", "/friends/reject"): self.reject_request,
+            ("GET", "/suggestions"): self.suggestions,
+        }
+
+    def call(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self.service_thread, func, *args)
+
+    def call_auth(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self.auth_pool, func, *args)
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"MovieMate API listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.service_thread.submit(self.service.flush).result()
+        self.service_thread.shutdown()
+        self.auth_pool.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload = await self.dispatch(method, target, headers, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HttpError as e:
+            self.write_response(writer, e.status, {"error": str(e)}, False)
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        # METHOD SP TARGET SP VERSION; an unencoded space in the target
+        # would otherwise silently cut it short
+        parts = line.decode("latin-1").rstrip("\r\n").split(" ")
+        if len(parts) != 3:
+            raise HttpError(400, "Malformed request line")
+        method, target, _ = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > MAX_BODY:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    def write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+    async def dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                return 405, {"error": "Method not allowed"}
+            return 404, {"error": "Not found"}
+        try:
+            request = {
+                "query": {key: values[-1] for key, values in parse_qs(url.query).items()},
+                "data": json.loads(body) if body else {},
+                "token": headers.get("authorization", "").removeprefix("Bearer ").strip()
+            }
+            if not isinstance(request["data"], dict):
+                raise HttpError(400, "Expected a JSON object")
+            # Other MovieMate processes may share the data files
+            await self.call(self.service.sync)
+            return 200, await handler(request)
+        except json.JSONDecodeError:
+            return 400, {"error": "Invalid JSON body"}
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except ServiceError as e:
+            return error_status(e), {"error": str(e)}
+        except Exception as e:
+            print(f"Error handling {method} {url.path}: {e!r}", file=sys.stderr)
+            return 500, {"error": "Internal server error"}
+
+    def session_user(self, request):
+        username = self.sessions.get(request["token"])
+        if username is None:
+            raise HttpError(401, "Login required")
+        return username
+
+    @staticmethod
+    def field(request, name):
+        value = request["data"].get(name)
+        if value is None:
+            raise HttpError(400, f"Missing field: {name}")
+        return value
+
+    @classmethod
+    def name_field(cls, request, name):
+        # A username given by the client; only a non-empty string can be one
+        value = cls.field(request, name)
+        if not isinstance(value, str) or not value.strip():
+            raise HttpError(400, f"{name} must be a non-empty string")
+        return value
+
+    # Handlers. Each returns a JSON-serializable payload; anything built from
+    # service state is built on the service thread.
+
+    async def signup(self, request):
+        username = str(self.field(request, "username")).strip()
+        password = str(self.field(request, "password"))
+        await self.call(self.service.validate_signup, username, password)
+        hashed = await self.call_auth(hash_password, password)
+        await self.call(self.service.create_user, username, hashed)
+        return {"username": username}
+
+    async def login(self, request):
+        username = str(self.field(request, "username")).strip()
+        credentials = await self.call_auth(self.service.check_password, username,
+                                           str(self.field(request, "password")))
+        await self.call(self.service.complete_login, username, *credentials)
+        token = secrets.token_urlsafe(24)
+        self.sessions[token] = username
+        return {"token": token, "username": username}
+
+    async def logout(self, request):
+        self.session_user(request)
+        del self.sessions[request["token"]]
+        return {}
+
+    async def genres(self, request):
+        return await self.call(self.service.catalog.genres)
+
+    async def movies(self, request):
+        genre = request["query"].get("genre")
+        return await self.call(lambda: list(self.service.catalog.movies(genre)))
+
+    async def search(self, request):
+        query = request["query"].get("q", "")
+        return await self.call(self.service.search_movies, query, request["query"].get("genre"))
+
+    async def ratings(self, request):
+        username = self.session_user(request)
+        return await self.call(self.service.titled_ratings, username)
+
+    async def rate(self, request):
+        # The movie is given by "id", or by "title" as before
+        username = self.session_user(request)
+        rating = request["data"].get("rating")
+        # bool is an int subclass (and 1.0 == 1), but only 0 and 1 are ratings
+        if rating is not None and (type(rating) is not int or rating not in (0, 1)):
+            raise HttpError(400, "rating must be 1, 0 or null")
+        movie_id = request["data"].get("id")
+        if movie_id is not None and type(movie_id) is not int:
+            raise HttpError(400, "id must be an integer")
+
+        def rate(movie_id):
+            if movie_id is None:
+                movie_id = self.service.find_movie(str(self.field(request, "title")))[0]["id"]
+            self.service.set_rating(username, movie_id, rating)
+            movie = self.service.catalog.get_by_id(movie_id)
+            return {"id": movie_id, "title": movie["title"] if movie else None, "rating": rating}
+        return await self.call(rate, movie_id)
+
+    async def recommendations(self, request):
+        username = self.session_user(request)
+        try:
+            limit = int(request["query"].get("limit", 10))
+        except ValueError:
+            raise HttpError(400, "limit must be an integer")
+        return await self.call(self.service.recommend, username, max(1, min(limit, 100)))
+
+    async def friends(self, request):
+        username = self.session_user(request)
+
+        def collect():
+            graph = self.service.friends
+            return {
+                "friends": sorted(graph.friends_of(username)),
+                "received": list(graph.requests_received(username)),
+                "sent": list(graph.requests_sent(username))
+            }
+        return await self.call(collect)
+
+    async def send_request(self, request):
+        username = self.session_user(request)
+        await self.call(self.service.send_friend_request, username, self.name_field(request, "to"))
+        return {}
+
+    async def accept_request(self, request):
+        username = self.session_user(request)
+        await self.call(self.service.accept_friend_request, self.name_field(request, "from"), username)
+        return {}
+
+    async def reject_request(self, request):
+        username = self.session_user(request)
+        await self.call(self.service.reject_friend_request, self.name_field(request, "from"), username)
+        return {}
+
+    async def suggestions(self, request):
+        username = self.session_user(request)
+        pairs = await self.call(self.service.friend_suggestions, username)
+        return [{"username": user, "common_likes": common} for user, common in pairs]
+
+
+def main():
+    # python -m moviemate.server [port] [host] -- run from the data directory
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+    host = sys.argv[2] if len(sys.argv) > 2 else "127.0.0.1"
+    writer = PersistenceWorker()
+    server = MovieMateServer(MovieMateService(open_storage(writer=writer)))
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        writer.stop()
+
+
+if __name__ == "__main__":
+    main()
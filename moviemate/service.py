@@ -0,0 +1,625 @@
+import datetime
+import json
+import os
+import shutil
+from collections import defaultdict
+
+import bcrypt
+
+from moviemate.catalog import MovieCatalog
+from moviemate.indexes import LikeIndex
+from moviemate.instrumentation import timed
+from moviemate.persistence import report_to_stderr
+from moviemate.posters import PosterDirectory
+from moviemate.ratings import NO_RATINGS, PackedRatings
+from moviemate.recommender import ItemItemRecommender, RecommendationCache
+from moviemate.sample_data import mini_database
+from moviemate.storage import JsonStorage, SQLiteStorage, migrate_json_to_sqlite
+
+USERS_FILE = "users.json"
+RATINGS_FILE = "ratings.json"
+RATINGS_JOURNAL_FILE = "ratings.journal"
+MOVIES_FILE = "movies.json"
+FRIENDS_FILE = "friends.json"
+DATABASE_FILE = "moviemate.db"
+# "json" keeps the whole-file JSON layout, "sqlite" stores everything in DATABASE_FILE
+STORAGE_BACKEND = os.environ.get("MOVIEMATE_STORAGE", "json")
+POSTER_DIR = "posters"
+# bcrypt work factor; hashes made with a different cost are upgraded on login
+BCRYPT_ROUNDS = int(os.environ.get("MOVIEMATE_BCRYPT_ROUNDS", "12"))
+MIN_PASSWORD_LENGTH = 6
+SEARCH_LIMIT = 100
+RECOMMENDATION_CACHE_ENTRIES = 256
+ADMIN_USER = "admin"
+
+
+class ServiceError(Exception):
+    # Base class for everything the service refuses to do. The message is
+    # meant to be shown to the user as-is.
+    pass
+
+
+class AuthenticationError(ServiceError):
+    pass
+
+
+class ValidationError(ServiceError):
+    pass
+
+
+class NotFoundError(ServiceError):
+    pass
+
+
+def open_storage(backend=STORAGE_BACKEND, writer=None, on_error=report_to_stderr):
+    json_storage = JsonStorage(USERS_FILE, RATINGS_FILE, MOVIES_FILE, FRIENDS_FILE,
+                               RATINGS_JOURNAL_FILE, on_error=on_error, writer=writer)
+    if backend != "sqlite":
+        return json_storage
+
+    storage = SQLiteStorage(DATABASE_FILE, on_error=on_error, writer=writer)
+    if storage.is_new:
+        migrate_json_to_sqlite(json_storage, storage)
+    return storage
+
+
+@timed("auth.hash_password")
+def hash_password(password, rounds=BCRYPT_ROUNDS):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+
+
+@timed("auth.verify_password")
+def verify_password(password, hashed):
+    try:
+        return bcrypt.checkpw(password.encode(), hashed.encode())
+    except ValueError:
+        return False
+
+
+def needs_rehash(hashed, rounds=BCRYPT_ROUNDS):
+    # bcrypt hashes look like $2b$12$<salt+hash>; the middle field is the cost
+    try:
+        return int(hashed.split("$")[2]) != rounds
+    except (IndexError, ValueError):
+        return False
+
+
+def now():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class MovieMateService:
+    # Everything MovieMate does, without a UI. Methods either return data or
+    # raise a ServiceError subclass; it is up to the caller how to show it.
+    #
+    # The service is not thread-safe and expects to be driven from a single
+    # thread. The bcrypt helpers (check_password, check_password_change and
+    # the module-level functions) only read shared state and may be run on a
+    # worker; their results are applied with complete_login,
+    # create_user and set_password_hash on the owning thread.
+    def __init__(self, storage, poster_dir=POSTER_DIR):
+        self.storage = storage
+        self.poster_dir = poster_dir
+        self.users, self.ratings, self.movie_db, self.friends = storage.load()
+
+        os.makedirs(poster_dir, exist_ok=True)
+
+        self.create_default_admin()
+        if not self.movie_db:
+            self.movie_db = mini_database()
+            self.storage.replace_movie_db(self.movie_db)
+        self.catalog = MovieCatalog(self.movie_db)
+        self.recommender = ItemItemRecommender(self.ratings)
+        self.like_index = LikeIndex(self.ratings)
+        self.posters = PosterDirectory(poster_dir)
+        # Versions for the recommendation cache. A user's ratings version is
+        # a stamp from one counter shared by all users, bumped on every change
+        # to their ratings and on deletion, so a re-created account never
+        # repeats the version of a deleted one's cached entry.
+        self.recommendation_cache = RecommendationCache(RECOMMENDATION_CACHE_ENTRIES)
+        self.ratings_stamp = 0
+        self.ratings_versions = {}
+        self.catalog_version = 0
+
+    def flush(self):
+        self.storage.flush()
+
+    @timed("service.sync")
+    def sync(self):
+        # Applies what other processes sharing the data files changed since
+        # the last load or sync. A few stats when nothing did, so it is
+        # called whenever a page is shown or a request comes in. Returns True
+        # if anything changed.
+        return self.apply_changes(self.storage.poll())
+
+    def sync_later(self, call_soon, on_done=None):
+        # sync() without waiting for queued writes, for the UI thread: the
+        # files are read on the persistence thread, and call_soon(func) has
+        # to run func back on this one, where the changes are applied and
+        # on_done(changed) is called
+        def apply(read):
+            changed = self.apply_changes(read())
+            if on_done is not None:
+                on_done(changed)
+        self.storage.poll_later(lambda read: call_soon(apply, read))
+
+    def apply_changes(self, changes):
+        if not changes:
+            return False
+        if changes.get("friends"):
+            self.friends = self.storage.friends
+        if "movies" in changes:
+            # movie_db is shared with storage and the search worker
+            self.catalog.reload(changes["movies"])
+            self.catalog_changed()
+        if changes.get("ratings"):
+            self.recommender = ItemItemRecommender(self.ratings)
+            self.like_index = LikeIndex(self.ratings)
+            self.recommendation_cache.clear()
+        for record in changes.get("records", ()):
+            if "drop_user" in record:
+                self.drop_user_ratings(record["drop_user"])
+            elif "drop_movie_id" in record:
+                self.drop_movie_ratings(record["drop_movie_id"])
+            elif "i" in record:
+                self.apply_rating(record["u"], record["i"], record["r"])
+        return True
+
+    # Accounts
+
+    def create_default_admin(self):
+        if ADMIN_USER not in self.users:
+            self.users[ADMIN_USER] = {"password": hash_password("admin123"), "joined": now()}
+            self.storage.add_user(ADMIN_USER, self.users[ADMIN_USER])
+
+    def is_admin(self, username):
+        return username == ADMIN_USER
+
+    def check_password(self, username, password):
+        # Returns the hash that was checked and, if its cost is outdated, a
+        # replacement; pass both to complete_login
+        user = self.users.get(username)
+        if user is None or not verify_password(password, user["password"]):
+            raise AuthenticationError("Invalid username or password")
+        hashed = user["password"]
+        return hashed, hash_password(password) if needs_rehash(hashed) else None
+
+    def complete_login(self, username, hashed, new_hash=None):
+        user = self.users.get(username)
+        if user is None:
+            raise AuthenticationError("Invalid username or password")
+        # Skip the upgrade if the password changed while we were hashing
+        if new_hash and user["password"] == hashed:
+            user["password"] = new_hash
+            self.storage.update_user(username, user)
+        if username not in self.ratings:
+            self.ratings[username] = PackedRatings()
+        self.friends.add_user(username)
+
+    def login(self, username, password):
+        self.complete_login(username, *self.check_password(username, password))
+
+    def validate_password(self, password):
+        if not password:
+            raise ValidationError("New password cannot be empty")
+        if len(password) < MIN_PASSWORD_LENGTH:
+            raise ValidationError(f"Password must be at least {MIN_PASSWORD_LENGTH} characters")
+
+    def validate_signup(self, username, password):
+        if not username or not password:
+            raise ValidationError("Username and password are required")
+        if username.lower() == ADMIN_USER:
+            raise ValidationError("Cannot create admin account")
+        if username in self.users:
+            raise ValidationError("Username already exists")
+        self.validate_password(password)
+
+    def create_user(self, username, hashed):
+        if username in self.users:
+            raise ValidationError("Username already exists")
+        self.users[username] = {"password": hashed, "joined": now()}
+        self.ratings[username] = PackedRatings()
+        self.friends.add_user(username)
+        self.storage.add_user(username, self.users[username])
+
+    def register(self, username, password):
+        self.validate_signup(username, password)
+        self.create_user(username, hash_password(password))
+
+    def check_password_change(self, username, current, new):
+        self.validate_password(new)
+        user = self.users.get(username)
+        if user is None or not verify_password(current, user["password"]):
+            raise AuthenticationError("Incorrect current password")
+        return hash_password(new)
+
+    def set_password_hash(self, username, hashed):
+        user = self.get_user(username)
+        user["password"] = hashed
+        self.storage.update_user(username, user)
+
+    def change_password(self, username, current, new):
+        self.set_password_hash(username, self.check_password_change(username, current, new))
+
+    def get_user(self, username):
+        user = self.users.get(username)
+        if user is None:
+            raise NotFoundError("User does not exist")
+        return user
+
+    def usernames(self):
+        return sorted(user for user in self.users if user != ADMIN_USER)
+
+    def user_details(self, username):
+        user = self.get_user(username)
+        ratings = self.user_ratings(username)
+        return {
+            "username": username,
+            "joined": user.get("joined", "N/A"),
+            "ratings": len(ratings),
+            "friends": len(self.friends.friends_of(username)),
+            "liked": self.liked_titles(username)
+        }
+
+    def delete_user(self, username):
+        if username == ADMIN_USER:
+            raise ValidationError("Cannot delete admin account")
+        self.get_user(username)
+        self.users.pop(username, None)
+        self.drop_user_ratings(username)
+        # Remove user from their friends' and requesters' lists
+        self.friends.remove_user(username)
+        self.storage.delete_user(username)
+
+    # Ratings
+
+    def user_ratings(self, username):
+        # PackedRatings, a {movie id: 1|0} mapping
+        return self.ratings.get(username, NO_RATINGS)
+
+    def rating_of(self, username, movie_id):
+        return self.user_ratings(username).get(movie_id)
+
+    def rated_movies(self, username):
+        # [(movie, rating)] for display
+        rated = []
+        for movie_id, rating in self.user_ratings(username).items():
+            movie = self.catalog.get_by_id(movie_id)
+            if movie is not None:
+                rated.append((movie, rating))
+        return rated
+
+    def titled_ratings(self, username):
+        # {title: rating}, the layout of exported files
+        return {movie["title"]: rating for movie, rating in self.rated_movies(username)}
+
+    def rating_counts(self, username):
+        ratings = self.user_ratings(username)
+        liked = ratings.liked_count()
+        return len(ratings), liked, len(ratings) - liked
+
+    def set_rating(self, username, movie_id, rating):
+        # rating is 1 (like), 0 (dislike) or None to remove the rating
+        movie = self.catalog.get_by_id(movie_id)
+        if movie is not None:
+            # Store the catalog's own id object rather than the caller's copy
+            movie_id = movie["id"]
+        elif rating is not None:
+            raise NotFoundError("Movie not found")
+        if self.apply_rating(username, movie_id, rating):
+            self.storage.set_rating(username, movie_id, rating)
+
+    def apply_rating(self, username, movie_id, rating):
+        # The in-memory part of a rating change; False if there was nothing
+        # to remove
+        user_ratings = self.ratings.get(username)
+        if user_ratings is None:
+            user_ratings = self.ratings[username] = PackedRatings()
+        if rating is None:
+            if movie_id not in user_ratings:
+                return False
+            del user_ratings[movie_id]
+        else:
+            user_ratings[movie_id] = rating
+        self.recommender.update(username, movie_id, rating)
+        self.like_index.update(username, movie_id, rating)
+        self.ratings_changed(username)
+        return True
+
+    def drop_user_ratings(self, username):
+        self.like_index.remove_user(username, self.ratings.pop(username, NO_RATINGS))
+        self.recommender.remove_user(username)
+        # A fresh stamp, not a pop: the account's cached entries were made at
+        # version 0 if it never rated, and a re-created account must not match
+        self.ratings_changed(username)
+
+    def ratings_changed(self, username):
+        self.ratings_stamp += 1
+        self.ratings_versions[username] = self.ratings_stamp
+
+    def export_ratings(self, username, path):
+        data = self.titled_ratings(username)
+        if not data:
+            raise ValidationError("No ratings to export.")
+        try:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=4)
+        except IOError as e:
+            raise ServiceError(f"Failed to export: {str(e)}") from e
+
+    # Recommendations
+
+    def recommend(self, username, limit=10):
+        # Served from the cache until the user rates something or the
+        # catalog changes. The list is shared with the cache; do not modify.
+        key = (username, limit)
+        version = (self.ratings_versions.get(username, 0), self.catalog_version)
+        movies = self.recommendation_cache.lookup(key, version)
+        if movies is None:
+            movies = self.compute_recommendations(username, limit)
+            self.recommendation_cache.put(key, version, movies)
+        return movies
+
+    @timed("service.recommend")
+    def compute_recommendations(self, username, limit=10):
+        user_ratings = self.user_ratings(username)
+        if not user_ratings:
+            return []
+
+        recommended_movies = []
+        for movie_id, _ in self.recommender.recommend(username, limit):
+            movie = self.catalog.get_by_id(movie_id)
+            if movie:
+                recommended_movies.append(movie)
+
+        # Cold start: not enough overlap with other users yet
+        if len(recommended_movies) < limit:
+            recommended_movies += self.genre_recommendations(
+                user_ratings, {m["id"] for m in recommended_movies}, limit - len(recommended_movies))
+        return recommended_movies
+
+    def genre_recommendations(self, user_ratings, exclude_ids, limit):
+        liked_genres = defaultdict(int)
+        for movie_id, rating in user_ratings.items():
+            if rating == 1:  # Liked
+                genre = self.catalog.genre_by_id.get(movie_id)
+                if genre:
+                    liked_genres[genre] += 1
+
+        if not liked_genres:
+            return []
+
+        sorted_genres = sorted(liked_genres.items(), key=lambda x: x[1], reverse=True)
+
+        recommended_movies = []
+        for genre, _ in sorted_genres:
+            for movie in self.movie_db.get(genre, []):
+                if movie["id"] not in user_ratings and movie["id"] not in exclude_ids:
+                    recommended_movies.append(movie)
+                if len(recommended_movies) >= limit:
+                    break
+            if len(recommended_movies) >= limit:
+                break
+
+        return recommended_movies
+
+    # Friends
+
+    def send_friend_request(self, from_user, to_user):
+        if from_user == to_user:
+            raise ValidationError("Cannot send friend request to yourself")
+        if to_user not in self.users:
+            raise NotFoundError("User does not exist")
+        if self.friends.are_friends(from_user, to_user):
+            raise ValidationError("You are already friends")
+        if self.friends.has_request(from_user, to_user):
+            raise ValidationError("Friend request already sent")
+
+        self.friends.send_request(from_user, to_user)
+        self.storage.send_friend_request(from_user, to_user)
+
+    def accept_friend_request(self, from_user, to_user):
+        if not self.friends.has_request(from_user, to_user):
+            raise NotFoundError("No friend request from this user")
+
+        self.friends.accept_request(from_user, to_user)
+        self.storage.accept_friend_request(from_user, to_user)
+
+    def reject_friend_request(self, from_user, to_user):
+        if not self.friends.has_request(from_user, to_user):
+            raise NotFoundError("No friend request from this user")
+
+        self.friends.drop_request(from_user, to_user)
+        self.storage.reject_friend_request(from_user, to_user)
+
+    def remove_friend(self, username, friend):
+        self.friends.remove_friendship(username, friend)
+        self.storage.remove_friend(username, friend)
+
+    def liked_ids(self, username):
+        return self.user_ratings(username).liked_ids()
+
+    def liked_titles(self, username):
+        return [movie["title"] for movie, rating in self.rated_movies(username) if rating == 1]
+
+    @timed("service.friend_suggestions")
+    def friend_suggestions(self, username, k=5):
+        # [(user, common likes)] for users outside the current circle
+        exclude = {username, ADMIN_USER}
+        exclude.update(self.friends.friends_of(username))
+        exclude.update(self.friends.requests_sent(username))
+        return self.like_index.similar_users(self.liked_ids(username), exclude, k=k)
+
+    # Catalog
+
+    @timed("service.search_movies")
+    def search_movies(self, query, genre=None, limit=SEARCH_LIMIT):
+        # Ranked full-text search over titles and descriptions. Safe to call
+        # from a worker thread; the index has its own lock.
+        return self.catalog.search(query, limit, genre)
+
+    def prepare_search(self):
+        # Builds the search index ahead of the first query
+        self.catalog.prepare_search()
+
+    def find_movie(self, title):
+        movie, genre = self.catalog.find(title)
+        if movie is None:
+            raise NotFoundError("Movie not found")
+        return movie, genre
+
+    def validate_movie(self, title, year, genre, description, exclude_id=None):
+        if not title or not year or not genre or not description:
+            raise ValidationError("All fields except poster are required")
+        if not year.isdigit() or len(year) != 4:
+            raise ValidationError("Year must be a 4-digit number")
+        if self.catalog.title_taken(title, exclude_id=exclude_id):
+            raise ValidationError("Movie already exists" if exclude_id is None else "Movie title already exists")
+
+    @staticmethod
+    def poster_file_name(title, movie_id):
+        return f"{title.replace(' ', '_').lower()}_{movie_id}.jpg"
+
+    def copy_poster(self, source, title, movie_id, old_poster=""):
+        poster_name = self.poster_file_name(title, movie_id)
+        try:
+            if old_poster in self.posters:
+                os.remove(os.path.join(self.poster_dir, old_poster))
+                self.posters.removed(old_poster)
+            shutil.copy(source, os.path.join(self.poster_dir, poster_name))
+        except IOError as e:
+            raise ServiceError(f"Failed to save poster: {str(e)}") from e
+        self.posters.added(poster_name)
+        return poster_name
+
+    def add_movie(self, title, year, genre, description, poster_file=None):
+        # Ids come from the catalog, so catch up with movies other processes
+        # added first
+        self.sync()
+        self.validate_movie(title, year, genre, description)
+        new_id = self.catalog.next_id()
+        poster_name = self.copy_poster(poster_file, title, new_id) if poster_file else ""
+
+        new_movie = {
+            "title": title,
+            "year": year,
+            "description": description,
+            "poster": poster_name,
+            "id": new_id
+        }
+        self.catalog.add(new_movie, genre)
+        self.catalog_changed()
+        self.storage.add_movie(new_movie, genre)
+        return new_movie
+
+    def import_movies(self, records):
+        # Bulk import, step one: validate a batch of [(line, record)] and add
+        # the good ones to the catalog. Nothing is written yet; pass the
+        # returned entries to commit_import once their posters are copied.
+        # Returns ([(line, movie, genre, poster source)], [(line, error)]).
+        self.sync()
+        entries = []
+        errors = []
+        for line, record in records:
+            title, year, genre = record["title"], record["year"], record["genre"]
+            try:
+                self.validate_movie(title, year, genre, record["description"])
+            except ValidationError as e:
+                errors.append((line, str(e)))
+                continue
+            movie = {
+                "title": title,
+                "year": year,
+                "description": record["description"],
+                "poster": "",
+                "id": self.catalog.next_id()
+            }
+            self.catalog.add(movie, genre)
+            entries.append((line, movie, genre, record.get("poster", "")))
+        if entries:
+            self.catalog_changed()
+        return entries, errors
+
+    def commit_import(self, entries, posters):
+        # Step two: posters maps movie id -> file name already copied into
+        # poster_dir. The batch goes to storage in a single write.
+        for _, movie, _, _ in entries:
+            poster_name = posters.get(movie["id"])
+            if poster_name:
+                movie["poster"] = poster_name
+                self.posters.added(poster_name)
+        if entries:
+            self.storage.add_movies([(movie, genre) for _, movie, genre, _ in entries])
+
+    def update_movie(self, movie, title, year, genre, description, poster_file=None):
+        self.validate_movie(title, year, genre, description, exclude_id=movie["id"])
+        poster_name = movie["poster"]
+        if poster_file:
+            poster_name = self.copy_poster(poster_file, title, movie["id"], old_poster=movie["poster"])
+
+        updated_movie = {
+            "title": title,
+            "year": year,
+            "description": description,
+            "poster": poster_name,
+            "id": movie["id"]
+        }
+        self.catalog.replace(movie, updated_movie, genre)
+        self.catalog_changed()
+        self.storage.update_movie(movie, updated_movie, genre)
+        return updated_movie
+
+    def catalog_changed(self):
+        # Cached recommendations hold movie dicts and genre picks
+        self.catalog_version += 1
+
+    def rating_count(self, movie_id):
+        return self.recommender.rater_count(movie_id)
+
+    def delete_movie(self, movie):
+        self.delete_movies([movie])
+
+    def delete_movies(self, movies):
+        # Ratings are found through the movie -> raters index, so a delete
+        # costs the movie's number of ratings rather than the number of users.
+        # The whole batch goes to storage in a single write.
+        deleted = []
+        for movie in movies:
+            self.catalog.remove(movie)
+            if movie["poster"] in self.posters:
+                try:
+                    os.remove(os.path.join(self.poster_dir, movie["poster"]))
+                except OSError:
+                    pass
+                self.posters.removed(movie["poster"])
+            deleted.append((movie, self.drop_movie_ratings(movie["id"])))
+        if deleted:
+            self.catalog_changed()
+            self.storage.delete_movies(deleted)
+
+    def drop_movie_ratings(self, movie_id):
+        # Returns the users who had rated the movie
+        raters = self.recommender.raters(movie_id)
+        for user in raters:
+            self.ratings[user].pop(movie_id, None)
+            self.ratings_changed(user)
+        self.recommender.remove_movie(movie_id)
+        self.like_index.remove_movie(movie_id)
+        return raters
+
+    def poster(self, title):
+        # (path, version) of the movie's poster file, or (None, None) if it
+        # has none on disk. No filesystem access.
+        movie = self.catalog.get(title)
+        poster_name = movie.get("poster", "") if movie else ""
+        version = self.posters.version_of(poster_name)
+        if version is None:
+            return None, None
+        return os.path.join(self.poster_dir, poster_name), version
+
+    def poster_path(self, title):
+        return self.poster(title)[0]
+
+    def refresh_posters(self):
+        # One stat of the poster directory; True if it had to be rescanned
+        return self.posters.refresh()
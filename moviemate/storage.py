@@ -0,0 +1,762 @@
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+
+from moviemate.friends import FriendGraph
+from moviemate.instrumentation import timed
+from moviemate.journal import RatingsJournal
+from moviemate.persistence import (FileLock, SyncWriter, append_durable, dump_json, file_stamp,
+                                   report_to_stderr, write_atomic)
+from moviemate.ratings import PackedRatings
+
+# ratings.json is {"version": 2, "ratings": {user: {movie id: 1|0}}}; files
+# without a version are the older {user: {title: 1|0}} layout
+RATINGS_VERSION = 2
+# Appended to the names of title-keyed files kept when a migration drops titles
+LEGACY_SUFFIX = ".legacy"
+# Held by every process sharing a data directory while it writes there
+LOCK_FILE = "moviemate.lock"
+
+
+class MovieIdResolver:
+    # Maps the movie keys found on disk to ids of the loaded catalog.
+    # Ratings of movies that are no longer in the catalog resolve to None and
+    # are dropped. Titles, from files written before ratings were keyed by
+    # id, are looked up exactly and then case-insensitively; the ones that
+    # are not found are collected in `unresolved`.
+    def __init__(self, movie_db):
+        self.movie_db = movie_db or {}
+        self.ids = {movie["id"] for movies in self.movie_db.values() for movie in movies}
+        self.titles = None
+        self.folded = None
+        self.unresolved = set()
+
+    def by_id(self, movie_id):
+        return movie_id if movie_id in self.ids else None
+
+    def by_title(self, title):
+        if self.titles is None:
+            self.titles = {}
+            self.folded = {}
+            for movies in self.movie_db.values():
+                for movie in movies:
+                    self.titles.setdefault(movie["title"], movie["id"])
+                    self.folded.setdefault(movie["title"].casefold(), movie["id"])
+        movie_id = self.titles.get(title)
+        if movie_id is None:
+            movie_id = self.folded.get(title.casefold())
+        if movie_id is None:
+            self.unresolved.add(title)
+        return movie_id
+
+
+def ratings_snapshot(ratings):
+    # ratings maps users to PackedRatings or plain {movie id: rating} dicts
+    return {"version": RATINGS_VERSION,
+            "ratings": {username: dict(user_ratings.items()) for username, user_ratings in ratings.items()}}
+
+
+def put_movie(movie_db, movie, genre):
+    # Adds or replaces the movie with movie["id"], keeping its place if it
+    # stays in the same genre
+    for genre_name, movies in movie_db.items():
+        for index, existing in enumerate(movies):
+            if existing["id"] == movie["id"]:
+                if genre_name == genre:
+                    movies[index] = movie
+                    return
+                del movies[index]
+                break
+    movie_db.setdefault(genre, []).append(movie)
+
+
+def remove_movie(movie_db, movie_id):
+    for movies in movie_db.values():
+        for index, movie in enumerate(movies):
+            if movie["id"] == movie_id:
+                del movies[index]
+                return
+
+
+def ratings_from_snapshot(data, resolver):
+    # Returns (ratings, legacy), legacy being True for a title-keyed file
+    if "version" not in data:
+        ratings = {}
+        for username, user_ratings in data.items():
+            row = {}
+            for title, rating in user_ratings.items():
+                movie_id = resolver.by_title(title)
+                if movie_id is not None:
+                    row[movie_id] = rating
+            ratings[username] = PackedRatings(row)
+        return ratings, bool(data)
+
+    ratings = {}
+    for username, user_ratings in data.get("ratings", {}).items():
+        # JSON object keys are always strings
+        items = sorted(zip(map(int, user_ratings), user_ratings.values()))
+        if not resolver.ids.issuperset([movie_id for movie_id, _ in items]):
+            items = [(movie_id, rating) for movie_id, rating in items if movie_id in resolver.ids]
+        ratings[username] = PackedRatings.from_sorted(items)
+    return ratings, False
+
+
+class JsonStorage:
+    # The original whole-file JSON layout. Ratings changes go to an
+    # append-only journal; everything else rewrites the affected file.
+    # Writes are handed to `writer`, which may perform them in the background.
+    #
+    # Several processes may share the files. Every write happens under
+    # `lock`, after comparing the file's stamp with the one this process last
+    # read or wrote. If another process changed it in between, the file is
+    # read back, the changes this process has made since (`ops`, kept per
+    # file as small functions on the file's data) are applied to it and the
+    # result is written, so neither side's changes are lost. Journal appends
+    # note the byte ranges other processes appended before them. poll()
+    # brings the in-memory data up to date with all of that; until it does,
+    # writes of a file that was merged keep merging. poll_later() does the
+    # reading on the writer and leaves only the update to the owner thread;
+    # `local_changes` counts the owner's changes per file, so an update that
+    # a newer local change has overtaken can be told apart and left out.
+    def __init__(self, users_file, ratings_file, movies_file, friends_file,
+                 journal_file, on_error=report_to_stderr, writer=None, lock_file=None):
+        self.users_file = users_file
+        self.ratings_file = ratings_file
+        self.movies_file = movies_file
+        self.friends_file = friends_file
+        self.on_error = on_error
+        self.writer = writer or SyncWriter(on_error)
+        self.journal = RatingsJournal(journal_file, writer=self.writer, save=self.append_shared)
+        self.lock = FileLock(lock_file or os.path.join(os.path.dirname(users_file), LOCK_FILE))
+        self.users = {}
+        self.ratings = {}
+        self.movie_db = None
+        self.friends = FriendGraph()
+        # (decode, encode) between each file's JSON and the data ops work on
+        self.codecs = {
+            users_file: (lambda data: data or {}, lambda users: users),
+            friends_file: (FriendGraph, lambda friends: friends.to_dict()),
+            movies_file: (lambda data: data or {}, lambda movie_db: movie_db),
+        }
+        self.stamps = {}
+        self.ops = {}
+        self.ops_lock = threading.Lock()
+        self.merged = set()
+        self.local_changes = {}
+        # Reads whose ratings changes the owner thread has not applied yet
+        self.unapplied = 0
+        # Journal bytes this process has applied, and ranges other processes
+        # appended that it has not
+        self.journal_end = 0
+        self.foreign = []
+        self.ratings_stale = False
+        self.legacy_kept = False
+
+    @timed("storage.load_data")
+    def load_data(self, filename, default):
+        try:
+            if os.path.exists(filename):
+                with open(filename, 'r') as f:
+                    return json.load(f)
+            return default
+        except (json.JSONDecodeError, IOError) as e:
+            self.on_error(f"Failed to load {filename}: {str(e)}")
+            return default
+
+    def load_shared(self, filename, default):
+        # Under the lock; the stamp is taken first, so a write that lands
+        # while the file is read shows up as a change later
+        self.stamps[filename] = file_stamp(filename)
+        return self.load_data(filename, default)
+
+    @timed("storage.save_data")
+    def save_data(self, produce, filename, op=None):
+        with self.ops_lock:
+            if op is not None:
+                self.ops.setdefault(filename, []).append(op)
+            self.local_changes[filename] = self.local_changes.get(filename, 0) + 1
+        self.writer.mark_dirty(filename, produce, self.save_shared)
+        return True
+
+    def save_shared(self, filename, produce):
+        # Runs on the writer
+        with self.ops_lock:
+            ops = self.ops.pop(filename, [])
+        with self.lock:
+            if filename in self.merged or file_stamp(filename) != self.stamps.get(filename):
+                decode, encode = self.codecs[filename]
+                data = decode(self.load_data(filename, None))
+                for op in ops:
+                    op(data)
+                text = dump_json(lambda: encode(data))
+                self.merged.add(filename)
+            else:
+                text = dump_json(produce)
+            write_atomic(filename, text)
+            self.stamps[filename] = file_stamp(filename)
+
+    def journal_size(self):
+        try:
+            return os.path.getsize(self.journal.path)
+        except OSError:
+            return 0
+
+    def check_journal(self):
+        # Under the lock: notes what other processes did to the ratings
+        # since this process last looked
+        if self.ratings_stale:
+            return
+        size = self.journal_size()
+        if file_stamp(self.ratings_file) != self.stamps.get(self.ratings_file) or size < self.journal_end:
+            # Compacted by another process; only a full reload will do
+            self.ratings_stale = True
+        elif size > self.journal_end:
+            self.foreign.append((self.journal_end, size))
+            self.journal_end = size
+
+    def append_shared(self, path, text):
+        # Runs on the writer
+        with self.lock:
+            self.check_journal()
+            append_durable(path, text)
+            if not self.ratings_stale:
+                self.journal_end += len(text.encode("utf-8"))
+
+    def load_ratings(self, resolver):
+        # Under the lock
+        ratings, legacy = ratings_from_snapshot(self.load_shared(self.ratings_file, {}), resolver)
+        try:
+            legacy = self.journal.replay(ratings, resolver) or legacy
+        except IOError as e:
+            self.on_error(f"Failed to load {self.journal.path}: {str(e)}")
+        self.journal_end = self.journal_size()
+        self.foreign = []
+        self.ratings_stale = False
+        return ratings, legacy
+
+    @timed("storage.load")
+    def load(self):
+        with self.lock:
+            self.users = self.load_shared(self.users_file, {})
+            # Movies first: ratings are resolved against the catalog's ids
+            self.movie_db = self.load_shared(self.movies_file, None)
+            resolver = MovieIdResolver(self.movie_db)
+            self.ratings, legacy = self.load_ratings(resolver)
+            self.friends = FriendGraph(self.load_shared(self.friends_file, {}))
+        if legacy:
+            self.migrate_ratings(resolver)
+        return self.users, self.ratings, self.movie_db, self.friends
+
+    def migrate_ratings(self, resolver):
+        # Rewrites title-keyed ratings once in the id-keyed format. Without a
+        # catalog (movies.json missing or unreadable) every title would be
+        # dropped, so the files are left as they are and not compacted until
+        # a later start has one. Titles that are not in the catalog are
+        # dropped from the rewrite; the original files are kept beside it.
+        if not resolver.ids:
+            self.legacy_kept = True
+            self.on_error(f"Ratings in {self.ratings_file} were not migrated: no movies to match their titles to")
+            return
+        if resolver.unresolved:
+            try:
+                with self.lock:
+                    for path in (self.ratings_file, self.journal.path):
+                        if os.path.exists(path) and not os.path.exists(path + LEGACY_SUFFIX):
+                            shutil.copy2(path, path + LEGACY_SUFFIX)
+            except OSError as e:
+                self.legacy_kept = True
+                self.on_error(f"Ratings in {self.ratings_file} were not migrated: {str(e)}")
+                return
+            self.on_error(f"{len(resolver.unresolved)} rated titles are not in the catalog; "
+                          f"their ratings are kept in {self.ratings_file}{LEGACY_SUFFIX}")
+        self.compact_ratings()
+
+    def changed_files(self):
+        with self.lock:
+            self.check_journal()
+            changed = {filename for filename in self.codecs
+                       if filename in self.merged or file_stamp(filename) != self.stamps.get(filename)}
+            if self.ratings_stale or self.foreign:
+                changed.add(self.ratings_file)
+            return changed
+
+    @timed("storage.poll")
+    def poll(self):
+        # Picks up what other processes wrote since the last load or poll.
+        # Costs a few stats when nothing changed. Returns {} or a dict with
+        # "users" and "friends" set if those were reloaded (users in place,
+        # friends as a new graph), "movies" holding the reloaded genre ->
+        # [movie] dict for the caller to apply to movie_db, "ratings" if the
+        # ratings were reloaded in full, otherwise "records": journal records
+        # of other processes for the caller to apply.
+        if not self.changed_files():
+            return {}
+        # Let queued writes land first so what is read back includes them
+        self.writer.flush()
+        local_changes = self.local_change_counts()
+        return self.apply_changes(self.read_changes(), local_changes)
+
+    def poll_later(self, deliver):
+        # poll() for an owner thread that must not wait on the writer: the
+        # files are read on the writer, behind the writes queued so far, and
+        # deliver(apply) is called there. The owner thread then calls apply()
+        # to update the in-memory data and get what poll() would return.
+        local_changes = self.local_change_counts()
+
+        def read():
+            changes = self.read_changes()
+            deliver(lambda: self.apply_changes(changes, local_changes))
+        self.writer.submit(read)
+
+    def local_change_counts(self):
+        with self.ops_lock:
+            return dict(self.local_changes)
+
+    def read_changes(self):
+        # Loads what other processes changed without touching the in-memory
+        # data, for apply_changes(). Until then the reloaded files stay
+        # merged, so a write that comes first still merges.
+        changes = {}
+        with self.lock:
+            changed = self.changed_files()
+            if self.users_file in changed:
+                changes["users"] = self.load_shared(self.users_file, {})
+            if self.friends_file in changed:
+                changes["friends"] = FriendGraph(self.load_shared(self.friends_file, {}))
+            if self.movies_file in changed:
+                changes["movies"] = self.load_shared(self.movies_file, None) or {}
+            self.merged.update(filename for filename in changed if filename in self.codecs)
+            if self.ratings_stale:
+                # Resolved against the catalog on disk: the in-memory one
+                # belongs to the owner thread, and the file holds every
+                # movie this process wrote before the read was queued
+                movie_db = changes["movies"] if "movies" in changes else self.load_data(self.movies_file, None)
+                changes["ratings"], _ = self.load_ratings(MovieIdResolver(movie_db))
+            elif self.foreign:
+                records = []
+                try:
+                    for start, end in self.foreign:
+                        records += self.journal.read(start, end)
+                except (IOError, ValueError) as e:
+                    self.on_error(f"Failed to load {self.journal.path}: {str(e)}")
+                self.foreign = []
+                changes["records"] = records
+            if "ratings" in changes or "records" in changes:
+                # Compacting now would write ratings that lack them
+                with self.ops_lock:
+                    self.unapplied += 1
+        return changes
+
+    def apply_changes(self, changes, local_changes):
+        # On the owner thread, with what read_changes() loaded. A file this
+        # process changed after local_changes was counted is left out: it
+        # stays merged (the ratings stale) so the next poll reads it again.
+        with self.ops_lock:
+            overtaken = {filename for filename, count in self.local_changes.items()
+                         if count != local_changes.get(filename, 0)}
+            if "ratings" in changes or "records" in changes:
+                self.unapplied -= 1
+        for key, filename in (("users", self.users_file), ("friends", self.friends_file),
+                              ("movies", self.movies_file)):
+            if key not in changes:
+                continue
+            if filename in overtaken:
+                del changes[key]
+            else:
+                self.merged.discard(filename)
+        if "ratings" in changes and self.ratings_file in overtaken:
+            del changes["ratings"]
+            self.ratings_stale = True
+
+        if "users" in changes:
+            self.users.clear()
+            self.users.update(changes["users"])
+            changes["users"] = True
+        if "friends" in changes:
+            self.friends = changes["friends"]
+            changes["friends"] = True
+        if "movies" in changes and self.movie_db is None:
+            self.movie_db = changes["movies"]
+        if "ratings" in changes:
+            self.ratings.clear()
+            self.ratings.update(changes["ratings"])
+            changes["ratings"] = True
+        self.journal.pending += len(changes.get("records", ()))
+        return changes
+
+    def journal_ratings(self, record):
+        with self.ops_lock:
+            self.local_changes[self.ratings_file] = self.local_changes.get(self.ratings_file, 0) + 1
+        record(self.journal)
+        if self.journal.needs_compaction:
+            self.compact_ratings()
+        return True
+
+    def compact_ratings(self):
+        # Queued behind every journal append made so far, so the snapshot
+        # always covers what gets truncated. Skipped while the journal holds
+        # records of other processes that this one has not applied yet, or
+        # while title-keyed ratings could not be loaded; those would be lost
+        # from the snapshot.
+        if self.legacy_kept:
+            return
+        def compact():
+            with self.lock:
+                self.check_journal()
+                if self.ratings_stale or self.foreign or self.unapplied:
+                    return
+                write_atomic(self.ratings_file, dump_json(lambda: ratings_snapshot(self.ratings)))
+                self.journal.truncate()
+                self.stamps[self.ratings_file] = file_stamp(self.ratings_file)
+                self.journal_end = 0
+        self.journal.pending = 0
+        self.writer.submit(compact)
+
+    def save_users(self, op=None):
+        return self.save_data(lambda: self.users, self.users_file, op)
+
+    def save_friends(self, op=None):
+        return self.save_data(lambda: self.friends.to_dict(), self.friends_file, op)
+
+    def save_movies(self, op=None):
+        return self.save_data(lambda: self.movie_db, self.movies_file, op)
+
+    def flush(self):
+        self.writer.flush()
+
+    def replace_movie_db(self, movie_db):
+        self.movie_db = movie_db
+
+        def replace(data):
+            data.clear()
+            data.update(movie_db)
+        return self.save_movies(replace)
+
+    def add_user(self, username, data):
+        return (self.save_users(lambda users: users.__setitem__(username, data)) and
+                self.save_friends(lambda friends: friends.add_user(username)))
+
+    def update_user(self, username, data):
+        return self.save_users(lambda users: users.__setitem__(username, data))
+
+    def delete_user(self, username):
+        return (self.save_users(lambda users: users.pop(username, None)) and
+                self.journal_ratings(lambda j: j.record_drop_user(username)) and
+                self.save_friends(lambda friends: friends.remove_user(username)))
+
+    def set_rating(self, username, movie_id, rating):
+        return self.journal_ratings(lambda j: j.record_rating(username, movie_id, rating))
+
+    def send_friend_request(self, from_user, to_user):
+        return self.save_friends(lambda friends: friends.send_request(from_user, to_user))
+
+    def accept_friend_request(self, from_user, to_user):
+        return self.save_friends(lambda friends: friends.accept_request(from_user, to_user))
+
+    def reject_friend_request(self, from_user, to_user):
+        return self.save_friends(lambda friends: friends.drop_request(from_user, to_user))
+
+    def remove_friend(self, user, friend):
+        return self.save_friends(lambda friends: friends.remove_friendship(user, friend))
+
+    def add_movie(self, movie, genre):
+        return self.save_movies(lambda movie_db: put_movie(movie_db, movie, genre))
+
+    def add_movies(self, entries):
+        def add(movie_db):
+            for movie, genre in entries:
+                put_movie(movie_db, movie, genre)
+        return self.save_movies(add)
+
+    def update_movie(self, old_movie, new_movie, genre):
+        return self.save_movies(lambda movie_db: put_movie(movie_db, new_movie, genre))
+
+    def delete_movies(self, deleted):
+        # deleted: [(movie, raters)]
+        def remove(movie_db):
+            for movie, _ in deleted:
+                remove_movie(movie_db, movie["id"])
+
+        def record(journal):
+            for movie, raters in deleted:
+                journal.record_drop_movie(movie["id"], raters)
+        return self.save_movies(remove) and self.journal_ratings(record)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    joined TEXT
+);
+CREATE TABLE IF NOT EXISTS genres (
+    name TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS movies (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    year TEXT,
+    description TEXT,
+    poster TEXT,
+    genre TEXT NOT NULL REFERENCES genres(name),
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_movies_title ON movies(title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_movies_genre ON movies(genre, seq);
+CREATE TABLE IF NOT EXISTS ratings (
+    username TEXT NOT NULL,
+    movie_id INTEGER NOT NULL,
+    rating INTEGER NOT NULL,
+    PRIMARY KEY (username, movie_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_ratings_movie_id ON ratings(movie_id);
+CREATE TABLE IF NOT EXISTS friendships (
+    user TEXT NOT NULL,
+    friend TEXT NOT NULL,
+    PRIMARY KEY (user, friend)
+);
+CREATE INDEX IF NOT EXISTS idx_friendships_friend ON friendships(friend);
+CREATE TABLE IF NOT EXISTS friend_requests (
+    from_user TEXT NOT NULL,
+    to_user TEXT NOT NULL,
+    PRIMARY KEY (from_user, to_user)
+);
+CREATE INDEX IF NOT EXISTS idx_friend_requests_to ON friend_requests(to_user);
+"""
+
+
+class SQLiteStorage:
+    # Same interface as JsonStorage, but every mutation is a small indexed
+    # transaction instead of a whole-file rewrite. Friendships are stored as
+    # one row per direction, friend requests as from -> to edges.
+    # Transactions run on `writer`, so after load() the connection is only
+    # used from the writer's thread.
+    def __init__(self, path, on_error=report_to_stderr, writer=None):
+        self.path = path
+        self.on_error = on_error
+        self.writer = writer or SyncWriter(on_error)
+        self.is_new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.migrate_ratings()
+        self.conn.executescript(SCHEMA)
+
+    def migrate_ratings(self):
+        # Databases created before ratings were keyed by id have a title
+        # column; re-key them through the movies table. Ratings of titles
+        # that are not in it stay in ratings_by_title and are tried again on
+        # every start, so an empty or partial catalog loses none of them.
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(ratings)")]
+        if "movie" in columns:
+            self.conn.execute("DROP INDEX IF EXISTS idx_ratings_movie")
+            self.conn.execute("ALTER TABLE ratings RENAME TO ratings_by_title")
+            self.conn.executescript(SCHEMA)
+        elif not self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ratings_by_title'").fetchone():
+            return
+        with self.conn:
+            # Ratings made since by id win over leftover titles
+            self.conn.execute(
+                "INSERT OR IGNORE INTO ratings (username, movie_id, rating) "
+                "SELECT r.username, m.id, r.rating FROM ratings_by_title r "
+                "JOIN movies m ON m.title = r.movie")
+            self.conn.execute("DELETE FROM ratings_by_title WHERE movie IN (SELECT title FROM movies)")
+            if not self.conn.execute("SELECT 1 FROM ratings_by_title LIMIT 1").fetchone():
+                self.conn.execute("DROP TABLE ratings_by_title")
+
+    def execute(self, statements):
+        def transaction():
+            try:
+                with self.conn:
+                    for sql, params in statements:
+                        self.conn.execute(sql, params)
+            except sqlite3.Error as e:
+                self.on_error(f"Failed to save {self.path}: {str(e)}")
+        self.writer.submit(transaction)
+        return True
+
+    def flush(self):
+        self.writer.flush()
+
+    def poll(self):
+        # SQLite does its own locking and every write is a row-level change,
+        # so other processes can never clobber this one's; their changes are
+        # picked up on the next start
+        return {}
+
+    def poll_later(self, deliver):
+        deliver(lambda: {})
+
+    @timed("storage.load")
+    def load(self):
+        users = {}
+        for username, password, joined in self.conn.execute(
+                "SELECT username, password, joined FROM users"):
+            users[username] = {"password": password, "joined": joined}
+
+        movie_db = {name: [] for (name,) in self.conn.execute("SELECT name FROM genres ORDER BY rowid")}
+        for movie_id, title, year, description, poster, genre in self.conn.execute(
+                "SELECT id, title, year, description, poster, genre FROM movies ORDER BY seq"):
+            movie_db.setdefault(genre, []).append({
+                "title": title,
+                "year": year,
+                "description": description,
+                "poster": poster,
+                "id": movie_id
+            })
+
+        rows = {}
+        for username, movie_id, rating in self.conn.execute(
+                "SELECT username, movie_id, rating FROM ratings"):
+            rows.setdefault(username, {})[movie_id] = rating
+        ratings = {username: PackedRatings(row) for username, row in rows.items()}
+
+        friends = FriendGraph()
+        for username in users:
+            friends.add_user(username)
+        for user, friend in self.conn.execute(
+                "SELECT user, friend FROM friendships ORDER BY rowid"):
+            friends.add_user(user)
+            friends.add_user(friend)
+            friends.adjacency[user][friend] = None
+        for from_user, to_user in self.conn.execute(
+                "SELECT from_user, to_user FROM friend_requests ORDER BY rowid"):
+            friends.send_request(from_user, to_user)
+
+        return users, ratings, movie_db or None, friends
+
+    def import_data(self, users, ratings, movie_db, friends):
+        # One-shot migration of the JSON files into an empty database
+        statements = []
+        for username, data in users.items():
+            statements.append(("INSERT OR REPLACE INTO users VALUES (?, ?, ?)",
+                               (username, data["password"], data.get("joined"))))
+        for username, user_ratings in ratings.items():
+            for movie_id, rating in user_ratings.items():
+                statements.append(("INSERT OR REPLACE INTO ratings VALUES (?, ?, ?)",
+                                   (username, movie_id, rating)))
+        seq = 0
+        for genre, movies in (movie_db or {}).items():
+            statements.append(("INSERT OR IGNORE INTO genres VALUES (?)", (genre,)))
+            for movie in movies:
+                seq += 1
+                statements.append(("INSERT OR REPLACE INTO movies VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   (movie["id"], movie["title"], movie.get("year", ""),
+                                    movie.get("description", ""), movie.get("poster", ""), genre, seq)))
+        for username in friends.adjacency:
+            for friend in friends.friends_of(username):
+                statements.append(("INSERT OR IGNORE INTO friendships VALUES (?, ?)", (username, friend)))
+            for to_user in friends.requests_sent(username):
+                statements.append(("INSERT OR IGNORE INTO friend_requests VALUES (?, ?)", (username, to_user)))
+        return self.execute(statements)
+
+    def replace_movie_db(self, movie_db):
+        return (self.execute([("DELETE FROM movies", ()), ("DELETE FROM genres", ())]) and
+                self.import_data({}, {}, movie_db, FriendGraph()))
+
+    def add_user(self, username, data):
+        return self.execute([("INSERT OR REPLACE INTO users VALUES (?, ?, ?)",
+                              (username, data["password"], data.get("joined")))])
+
+    def update_user(self, username, data):
+        return self.execute([("UPDATE users SET password = ?, joined = ? WHERE username = ?",
+                              (data["password"], data.get("joined"), username))])
+
+    def delete_user(self, username):
+        return self.execute([
+            ("DELETE FROM users WHERE username = ?", (username,)),
+            ("DELETE FROM ratings WHERE username = ?", (username,)),
+            ("DELETE FROM friendships WHERE user = ? OR friend = ?", (username, username)),
+            ("DELETE FROM friend_requests WHERE from_user = ? OR to_user = ?", (username, username)),
+        ])
+
+    def set_rating(self, username, movie_id, rating):
+        if rating is None:
+            return self.execute([("DELETE FROM ratings WHERE username = ? AND movie_id = ?",
+                                  (username, movie_id))])
+        return self.execute([("INSERT OR REPLACE INTO ratings VALUES (?, ?, ?)",
+                              (username, movie_id, rating))])
+
+    def send_friend_request(self, from_user, to_user):
+        return self.execute([("INSERT OR IGNORE INTO friend_requests VALUES (?, ?)",
+                              (from_user, to_user))])
+
+    def accept_friend_request(self, from_user, to_user):
+        return self.execute([
+            ("DELETE FROM friend_requests WHERE from_user = ? AND to_user = ?", (from_user, to_user)),
+            ("INSERT OR IGNORE INTO friendships VALUES (?, ?)", (to_user, from_user)),
+            ("INSERT OR IGNORE INTO friendships VALUES (?, ?)", (from_user, to_user)),
+        ])
+
+    def reject_friend_request(self, from_user, to_user):
+        return self.execute([("DELETE FROM friend_requests WHERE from_user = ? AND to_user = ?",
+                              (from_user, to_user))])
+
+    def remove_friend(self, user, friend):
+        return self.execute([
+            ("DELETE FROM friendships WHERE user = ? AND friend = ?", (user, friend)),
+            ("DELETE FROM friendships WHERE user = ? AND friend = ?", (friend, user)),
+        ])
+
+    def movie_row(self, movie, genre):
+        return ("INSERT OR REPLACE INTO movies VALUES "
+                "(?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM movies))",
+                (movie["id"], movie["title"], movie.get("year", ""),
+                 movie.get("description", ""), movie.get("poster", ""), genre))
+
+    def add_movie(self, movie, genre):
+        return self.execute([("INSERT OR IGNORE INTO genres VALUES (?)", (genre,)),
+                             self.movie_row(movie, genre)])
+
+    def add_movies(self, entries):
+        # One transaction for a whole import batch
+        statements = []
+        for movie, genre in entries:
+            statements.append(("INSERT OR IGNORE INTO genres VALUES (?)", (genre,)))
+            statements.append(self.movie_row(movie, genre))
+        return self.execute(statements)
+
+    def update_movie(self, old_movie, new_movie, genre):
+        # Keeps the movie's seq, and so its place in the catalog, unless it
+        # moves to another genre, where it goes last like a new movie
+        return self.execute([
+            ("INSERT OR IGNORE INTO genres VALUES (?)", (genre,)),
+            ("INSERT OR REPLACE INTO movies VALUES (?, ?, ?, ?, ?, ?, COALESCE("
+             "(SELECT seq FROM movies WHERE id = ? AND genre = ?), "
+             "(SELECT COALESCE(MAX(seq), 0) + 1 FROM movies)))",
+             (new_movie["id"], new_movie["title"], new_movie.get("year", ""),
+              new_movie.get("description", ""), new_movie.get("poster", ""), genre,
+              new_movie["id"], genre)),
+        ])
+
+    def delete_movies(self, deleted):
+        # One transaction; ratings go through idx_ratings_movie_id
+        statements = []
+        for movie, _ in deleted:
+            statements.append(("DELETE FROM movies WHERE id = ?", (movie["id"],)))
+            statements.append(("DELETE FROM ratings WHERE movie_id = ?", (movie["id"],)))
+        return self.execute(statements)
+
+    def close(self):
+        self.writer.flush()
+        self.conn.close()
+
+
+def migrate_json_to_sqlite(json_storage, sqlite_storage):
+    users, ratings, movie_db, friends = json_storage.load()
+    sqlite_storage.import_data(users, ratings, movie_db, friends)
+    sqlite_storage.flush()
+
+
+if __name__ == "__main__":
+    # python -m moviemate.storage [moviemate.db] -- run from the data directory
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "moviemate.db"
+    source = JsonStorage("users.json", "ratings.json", "movies.json", "friends.json", "ratings.journal")
+    target = SQLiteStorage(db_path)
+    migrate_json_to_sqlite(source, target)
+    target.close()
+    print(f"Migrated JSON data into {db_path}")
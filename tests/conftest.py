@@ -0,0 +1,8 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Read when moviemate.service is imported; the default cost makes every
+# service start hash the admin password for a noticeable time
+os.environ.setdefault("MOVIEMATE_BCRYPT_ROUNDS", "4")
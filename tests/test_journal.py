@@ -0,0 +1,125 @@
+import json
+
+from moviemate.journal import RatingsJournal
+from moviemate.ratings import PackedRatings
+from moviemate.storage import MovieIdResolver
+
+MOVIE_DB = {
+    "Drama": [{"title": "Alpha", "year": "2000", "description": "", "poster": "", "id": 1},
+              {"title": "Beta", "year": "2001", "description": "", "poster": "", "id": 2}],
+    "Comedy": [{"title": "Gamma", "year": "2002", "description": "", "poster": "", "id": 3}],
+}
+
+
+def write_lines(path, records, tail=""):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        f.write(tail)
+
+
+def replay(path, ratings=None):
+    ratings = {} if ratings is None else ratings
+    journal = RatingsJournal(str(path))
+    legacy = journal.replay(ratings, MovieIdResolver(MOVIE_DB))
+    return journal, {user: user_ratings.to_dict() for user, user_ratings in ratings.items()}, legacy
+
+
+def test_replay_applies_records_in_order(tmp_path):
+    path = tmp_path / "ratings.journal"
+    write_lines(path, [
+        {"u": "ann", "i": 1, "r": 1},
+        {"u": "ann", "i": 2, "r": 0},
+        {"u": "bob", "i": 1, "r": 0},
+        {"u": "ann", "i": 2, "r": None},
+        {"u": "bob", "i": 3, "r": 1},
+        {"drop_movie_id": 1, "users": ["ann", "bob"]},
+        {"u": "cid", "i": 3, "r": 1},
+        {"drop_user": "cid"},
+    ])
+    journal, ratings, legacy = replay(path)
+    assert ratings == {"ann": {}, "bob": {3: 1}}
+    assert not legacy
+    assert journal.pending == 8
+
+
+def test_replay_on_top_of_a_snapshot(tmp_path):
+    path = tmp_path / "ratings.journal"
+    write_lines(path, [{"u": "ann", "i": 3, "r": 0}, {"drop_movie_id": 2}])
+    snapshot = {"ann": PackedRatings({1: 1, 2: 1}), "bob": PackedRatings({2: 0})}
+    _, ratings, _ = replay(path, snapshot)
+    # Without "users" a movie drop falls back to scanning everyone
+    assert ratings == {"ann": {1: 1, 3: 0}, "bob": {}}
+
+
+def test_legacy_title_records_resolve_through_the_catalog(tmp_path):
+    path = tmp_path / "ratings.journal"
+    write_lines(path, [
+        {"u": "ann", "m": "Alpha", "r": 1},
+        {"u": "ann", "m": "gamma", "r": 0},
+        {"u": "ann", "m": "Not In Catalog", "r": 1},
+        {"u": "bob", "m": "Beta", "r": 1},
+        {"drop_movie": "Beta"},
+    ])
+    _, ratings, legacy = replay(path)
+    assert ratings == {"ann": {1: 1, 3: 0}, "bob": {}}
+    assert legacy
+
+
+def test_records_of_unknown_movies_are_skipped(tmp_path):
+    path = tmp_path / "ratings.journal"
+    write_lines(path, [{"u": "ann", "i": 99, "r": 1}, {"drop_movie_id": 99, "users": ["ann"]},
+                       {"u": "ann", "i": 1, "r": 1}])
+    _, ratings, _ = replay(path)
+    assert ratings == {"ann": {1: 1}}
+
+
+def test_torn_last_line_is_truncated(tmp_path):
+    path = tmp_path / "ratings.journal"
+    write_lines(path, [{"u": "ann", "i": 1, "r": 1}], tail='{"u": "ann", "i": 2, "r"')
+    journal, ratings, _ = replay(path)
+    assert ratings == {"ann": {1: 1}}
+    assert journal.pending == 1
+    assert path.read_text().endswith("\n")
+
+    # New records start on a line of their own and survive the next replay
+    journal.record_rating("ann", 3, 0)
+    _, ratings, _ = replay(path)
+    assert ratings == {"ann": {1: 1, 3: 0}}
+
+
+def test_replay_stops_at_a_corrupt_line(tmp_path):
+    path = tmp_path / "ratings.journal"
+    write_lines(path, [{"u": "ann", "i": 1, "r": 1}], tail='not json\n{"u": "ann", "i": 2, "r": 1}\n')
+    _, ratings, _ = replay(path)
+    assert ratings == {"ann": {1: 1}}
+    assert path.read_text() == json.dumps({"u": "ann", "i": 1, "r": 1}) + "\n"
+
+
+def test_missing_journal_is_empty(tmp_path):
+    journal, ratings, legacy = replay(tmp_path / "ratings.journal")
+    assert ratings == {}
+    assert not legacy
+    assert journal.pending == 0
+
+
+def test_read_returns_the_records_of_a_byte_range(tmp_path):
+    path = tmp_path / "ratings.journal"
+    journal = RatingsJournal(str(path))
+    journal.record_rating("ann", 1, 1)
+    start = path.stat().st_size
+    journal.record_drop_movie(2, ["bob"])
+    journal.record_drop_user("cid")
+    assert journal.read(start, path.stat().st_size) == [
+        {"drop_movie_id": 2, "users": ["bob"]}, {"drop_user": "cid"}]
+
+
+def test_compaction_threshold_and_truncate(tmp_path):
+    path = tmp_path / "ratings.journal"
+    journal = RatingsJournal(str(path), compact_every=2)
+    journal.record_rating("ann", 1, 1)
+    assert not journal.needs_compaction
+    journal.record_rating("ann", 2, 1)
+    assert journal.needs_compaction
+    journal.truncate()
+    assert path.read_text() == ""
@@ -0,0 +1,99 @@
+import json
+import os
+import sqlite3
+
+from moviemate.service import MOVIES_FILE, RATINGS_FILE, RATINGS_JOURNAL_FILE
+from moviemate.storage import LEGACY_SUFFIX, SQLiteStorage
+
+from test_journal import MOVIE_DB
+from test_shared_storage import open_storage
+
+LEGACY_RATINGS = {"ann": {"Alpha": 1, "gamma": 0, "Lost Film": 1}, "bob": {"Beta": 0}}
+
+
+def write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def open_legacy(tmp_path, movie_db):
+    errors = []
+    write_json(tmp_path / RATINGS_FILE, LEGACY_RATINGS)
+    with open(tmp_path / RATINGS_JOURNAL_FILE, "w") as f:
+        f.write(json.dumps({"u": "bob", "m": "Lost Film", "r": 0}) + "\n")
+    if movie_db is not None:
+        write_json(tmp_path / MOVIES_FILE, movie_db)
+    storage = open_storage(str(tmp_path))
+    storage.on_error = errors.append
+    storage.load()
+    return storage, errors
+
+
+def test_titles_missing_from_the_catalog_are_kept_beside_the_migration(tmp_path):
+    storage, errors = open_legacy(tmp_path, MOVIE_DB)
+    assert read_json(tmp_path / RATINGS_FILE) == {"version": 2, "ratings": {"ann": {"1": 1, "3": 0}, "bob": {"2": 0}}}
+    assert os.path.getsize(tmp_path / RATINGS_JOURNAL_FILE) == 0
+    assert read_json(str(tmp_path / RATINGS_FILE) + LEGACY_SUFFIX) == LEGACY_RATINGS
+    with open(str(tmp_path / RATINGS_JOURNAL_FILE) + LEGACY_SUFFIX) as f:
+        assert "Lost Film" in f.read()
+    assert len(errors) == 1
+
+
+def test_no_migration_without_a_catalog(tmp_path):
+    storage, errors = open_legacy(tmp_path, None)
+    assert {user: user_ratings.to_dict() for user, user_ratings in storage.ratings.items()} == {"ann": {}, "bob": {}}
+    assert len(errors) == 1
+    # Not even once the journal asks for it
+    storage.journal_ratings(lambda journal: journal.record_rating("ann", 1, 1))
+    storage.compact_ratings()
+    assert read_json(tmp_path / RATINGS_FILE) == LEGACY_RATINGS
+    assert not os.path.exists(str(tmp_path / RATINGS_FILE) + LEGACY_SUFFIX)
+
+    # The next start with a catalog migrates everything that resolves
+    write_json(tmp_path / MOVIES_FILE, MOVIE_DB)
+    storage = open_storage(str(tmp_path))
+    storage.on_error = errors.append
+    _, ratings, _, _ = storage.load()
+    assert {user: user_ratings.to_dict() for user, user_ratings in ratings.items()} == {
+        "ann": {1: 1, 3: 0}, "bob": {2: 0}}
+    assert read_json(tmp_path / RATINGS_FILE)["version"] == 2
+
+
+def make_legacy_db(path, titles):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE genres (name TEXT PRIMARY KEY);
+        CREATE TABLE movies (id INTEGER PRIMARY KEY, title TEXT NOT NULL, year TEXT, description TEXT,
+                             poster TEXT, genre TEXT NOT NULL REFERENCES genres(name), seq INTEGER NOT NULL);
+        CREATE TABLE ratings (username TEXT NOT NULL, movie TEXT NOT NULL, rating INTEGER NOT NULL,
+                              PRIMARY KEY (username, movie));
+        CREATE INDEX idx_ratings_movie ON ratings(movie);
+        INSERT INTO genres VALUES ('Drama');
+    """)
+    for movie_id, title in enumerate(titles, 1):
+        conn.execute("INSERT INTO movies VALUES (?, ?, '', '', '', 'Drama', ?)", (movie_id, title, movie_id))
+    conn.executemany("INSERT INTO ratings VALUES (?, ?, ?)", [("ann", "Alpha", 1), ("ann", "Beta", 0)])
+    conn.commit()
+    conn.close()
+
+
+def test_sqlite_keeps_unmatched_titles_until_they_match(tmp_path):
+    path = str(tmp_path / "moviemate.db")
+    make_legacy_db(path, ["Alpha"])
+    storage = SQLiteStorage(path)
+    assert storage.conn.execute("SELECT username, movie_id, rating FROM ratings").fetchall() == [("ann", 1, 1)]
+    assert storage.conn.execute("SELECT movie FROM ratings_by_title").fetchall() == [("Beta",)]
+    storage.conn.execute("INSERT INTO movies VALUES (2, 'Beta', '', '', '', 'Drama', 2)")
+    storage.conn.commit()
+    storage.close()
+
+    storage = SQLiteStorage(path)
+    assert sorted(storage.conn.execute("SELECT movie_id, rating FROM ratings")) == [(1, 1), (2, 0)]
+    assert storage.conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'ratings_by_title'").fetchone() is None
+    storage.close()
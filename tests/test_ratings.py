@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from moviemate.ratings import NO_RATINGS, PackedRatings
+
+
+def check_same(packed, expected):
+    assert len(packed) == len(expected)
+    assert bool(packed) == bool(expected)
+    assert list(packed) == sorted(expected)
+    assert packed.keys() == sorted(expected)
+    assert packed.items() == sorted(expected.items())
+    assert packed.values() == [rating for _, rating in sorted(expected.items())]
+    assert packed.to_dict() == expected
+    assert packed.liked_count() == sum(1 for rating in expected.values() if rating == 1)
+    assert packed.liked_ids() == sorted(movie_id for movie_id, rating in expected.items() if rating == 1)
+    ids, flags = packed.unpack()
+    assert list(ids) == sorted(expected)
+    assert flags == "".join(str(expected[movie_id]) for movie_id in sorted(expected))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_a_dict_under_random_changes(seed):
+    rng = random.Random(seed)
+    packed = PackedRatings()
+    expected = {}
+    for _ in range(300):
+        movie_id = rng.randint(1, 60)
+        action = rng.random()
+        if action < 0.6:
+            rating = rng.randint(0, 1)
+            packed[movie_id] = rating
+            expected[movie_id] = rating
+        elif action < 0.8:
+            assert packed.pop(movie_id) == expected.pop(movie_id, None)
+        elif movie_id in expected:
+            del packed[movie_id]
+            del expected[movie_id]
+        else:
+            with pytest.raises(KeyError):
+                del packed[movie_id]
+        probe = rng.randint(0, 61)
+        assert (probe in packed) == (probe in expected)
+        assert packed.get(probe, "missing") == expected.get(probe, "missing")
+    check_same(packed, expected)
+
+
+def test_bits_follow_their_ids_when_ids_are_inserted_and_removed():
+    packed = PackedRatings({10: 1, 30: 0, 50: 1})
+    packed[20] = 0
+    packed[40] = 1
+    packed[5] = 1
+    check_same(packed, {5: 1, 10: 1, 20: 0, 30: 0, 40: 1, 50: 1})
+    packed.pop(5)
+    packed.pop(30)
+    check_same(packed, {10: 1, 20: 0, 40: 1, 50: 1})
+    packed[40] = 0
+    packed[20] = 1
+    check_same(packed, {10: 1, 20: 1, 40: 0, 50: 1})
+
+
+def test_constructors_agree():
+    ratings = {7: 1, 3: 0, 11: 1, 2**31: 0}
+    check_same(PackedRatings(ratings), ratings)
+    check_same(PackedRatings.from_sorted(sorted(ratings.items())), ratings)
+    check_same(PackedRatings(), {})
+    check_same(PackedRatings.from_sorted([]), {})
+
+
+def test_missing_ids():
+    packed = PackedRatings({4: 1})
+    with pytest.raises(KeyError):
+        packed[5]
+    assert packed.get(5) is None
+    assert packed.pop(5) is None
+    assert len(NO_RATINGS) == 0
+    assert NO_RATINGS.get(4) is None
+
+
+def test_state_is_replaced_not_mutated():
+    # Readers on another thread hold on to one (ids, liked) pair
+    packed = PackedRatings({1: 1, 2: 0})
+    before = packed.state
+    ids = list(before[0])
+    packed[3] = 1
+    packed.pop(1)
+    assert packed.state is not before
+    assert list(before[0]) == ids
+    assert before[1] == 0b01
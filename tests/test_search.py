@@ -0,0 +1,132 @@
+import random
+import threading
+from collections import defaultdict
+
+import pytest
+
+from moviemate import search
+from moviemate.catalog import MovieCatalog
+from moviemate.search import DESCRIPTION_WEIGHT, TITLE_WEIGHT, SearchIndex, tokenize
+
+WORDS = ["golden", "star", "storm", "story", "silent", "river", "night", "dark", "stone", "gold"]
+GENRES = ["Action", "Drama", "Comedy"]
+
+
+def make_entries(count, seed=0):
+    rng = random.Random(seed)
+    entries = []
+    for movie_id in range(1, count + 1):
+        title = " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+        description = f"A {rng.choice(WORDS)} story about {rng.choice(WORDS)} things"
+        entries.append(({"title": f"{title} {movie_id}", "description": description, "id": movie_id},
+                        rng.choice(GENRES)))
+    return entries
+
+
+def make_index(entries):
+    index = SearchIndex()
+    index.ensure_built(lambda: entries)
+    return index
+
+
+def expected_scores(entries, query, genre=None):
+    # Sorted scores of every match, computed from scratch
+    *words, last = tokenize(query)
+    scores = []
+    for movie, movie_genre in entries:
+        if genre is not None and movie_genre != genre:
+            continue
+        weights = defaultdict(int)
+        for token in tokenize(movie["title"]):
+            weights[token] += TITLE_WEIGHT
+        for token in tokenize(movie["description"]):
+            weights[token] += DESCRIPTION_WEIGHT
+        if any(word not in weights for word in words):
+            continue
+        completed = max((weight * (1 if token == last else 0.5) for token, weight in weights.items()
+                         if token.startswith(last)), default=0)
+        if completed:
+            scores.append(sum(weights[word] for word in words) + completed)
+    return sorted(scores, reverse=True)
+
+
+def result_scores(index, results, query):
+    *words, last = tokenize(query)
+    scores = []
+    for movie in results:
+        weights = index.docs[movie["id"]][2]
+        completed = max(weight * (1 if token == last else 0.5) for token, weight in weights.items()
+                        if token.startswith(last))
+        scores.append(sum(weights[word] for word in words) + completed)
+    return scores
+
+
+QUERIES = ["st", "sto", "story", "golden", "golden st", "night sil", "dark night st", "storm stone", "gold"]
+
+
+@pytest.mark.parametrize("max_scored", [0, 10 ** 6])
+@pytest.mark.parametrize("genre", [None, "Drama"])
+def test_results_are_the_best_matches(monkeypatch, max_scored, genre):
+    # Both ways of ranking: scoring every match, and reading postings best first
+    monkeypatch.setattr(search, "MAX_SCORED", max_scored)
+    entries = make_entries(3000)
+    index = make_index(entries)
+    for query in QUERIES:
+        results = index.search(query, limit=40, genre=genre)
+        assert len({movie["id"] for movie in results}) == len(results)
+        assert result_scores(index, results, query) == expected_scores(entries, query, genre)[:40], query
+
+
+def test_single_letter_after_other_words_is_left_out():
+    index = make_index(make_entries(500))
+    golden = index.search("golden", limit=1000)
+    assert golden
+    assert index.search("golden s", limit=1000) == golden
+    # Once complete it is a word like any other
+    assert index.search("golden s ", limit=1000) == []
+
+
+def test_unknown_prefix_matches_nothing():
+    index = make_index(make_entries(100))
+    assert index.search("golden zq") == []
+    assert index.search("zq") == []
+
+
+def test_changes_keep_the_tiers_in_step():
+    entries = make_entries(300)
+    index = make_index(entries)
+    movie = {"title": "Golden Golden Golden", "description": "", "id": 1000}
+    index.add(movie, "Drama")
+    assert index.search("golden", limit=1)[0]["id"] == 1000
+    index.add(dict(movie, title="Quiet"), "Drama")
+    assert all(result["id"] != 1000 for result in index.search("golden", limit=1000))
+    index.remove(1000)
+    for movie, _ in entries:
+        index.remove(movie["id"])
+    assert index.postings == {}
+    assert index.tiers == {}
+    assert index.search("golden") == []
+
+
+def test_snapshots_taken_while_the_catalog_changes():
+    catalog = MovieCatalog({})
+    failures = []
+    stop = threading.Event()
+
+    def snapshot():
+        while not stop.is_set():
+            try:
+                catalog.search_entries()
+            except RuntimeError as e:
+                failures.append(e)
+                return
+
+    thread = threading.Thread(target=snapshot)
+    thread.start()
+    for movie_id in range(1, 3001):
+        # A new genre each time resizes movie_db itself
+        catalog.add({"title": f"Movie {movie_id}", "description": "", "id": movie_id}, f"Genre {movie_id}")
+    stop.set()
+    thread.join()
+    assert not failures
+    assert len(catalog.search("movie", limit=5000)) == 3000
@@ -0,0 +1,224 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from moviemate.persistence import PersistenceWorker, fcntl
+from moviemate.service import (FRIENDS_FILE, MOVIES_FILE, RATINGS_FILE, RATINGS_JOURNAL_FILE, USERS_FILE,
+                               MovieMateService)
+from moviemate.storage import JsonStorage
+
+
+def open_storage(data_dir, writer=None):
+    return JsonStorage(*(os.path.join(data_dir, name) for name in
+                         (USERS_FILE, RATINGS_FILE, MOVIES_FILE, FRIENDS_FILE, RATINGS_JOURNAL_FILE)),
+                       writer=writer)
+
+
+def open_service(data_dir, writer=None):
+    return MovieMateService(open_storage(data_dir, writer), poster_dir=os.path.join(data_dir, "posters"))
+
+
+def read_json(data_dir, name):
+    with open(os.path.join(data_dir, name)) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    # Written once, so every instance starts from the same catalog
+    open_service(str(tmp_path)).flush()
+    return str(tmp_path)
+
+
+def test_whole_file_writes_merge_instead_of_clobbering(data_dir):
+    a = open_service(data_dir)
+    b = open_service(data_dir)
+    a.create_user("ann", "hash")
+    b.create_user("bob", "hash")
+    assert sorted(read_json(data_dir, USERS_FILE)) == ["admin", "ann", "bob"]
+
+    a.send_friend_request("ann", "admin")
+    b.send_friend_request("bob", "admin")
+    assert sorted(read_json(data_dir, FRIENDS_FILE)["admin"]["requests_received"]) == ["ann", "bob"]
+
+    a.add_movie("Only In A", "2020", "Action", "first")
+    b.add_movie("Only In B", "2021", "Drama", "second")
+    titles = {movie["title"] for movies in read_json(data_dir, MOVIES_FILE).values() for movie in movies}
+    assert {"Only In A", "Only In B"} <= titles
+
+
+def test_sync_picks_up_other_instances_changes(data_dir):
+    a = open_service(data_dir)
+    b = open_service(data_dir)
+    assert not b.sync()
+
+    a.create_user("ann", "hash")
+    a.send_friend_request("ann", "admin")
+    movie = a.add_movie("New Film", "2022", "Action", "new")
+    a.set_rating("ann", movie["id"], 1)
+
+    assert b.sync()
+    assert "ann" in b.users
+    assert b.friends.has_request("ann", "admin")
+    assert b.catalog.get("New Film") is not None
+    assert b.rating_of("ann", movie["id"]) == 1
+    assert b.rating_count(movie["id"]) == 1
+    assert not b.sync()
+
+    b.accept_friend_request("ann", "admin")
+    b.delete_movies([b.catalog.get("New Film")])
+    assert a.sync()
+    assert a.friends.are_friends("ann", "admin")
+    assert a.catalog.get("New Film") is None
+    assert a.rating_of("ann", movie["id"]) is None
+
+    b.delete_user("ann")
+    a.sync()
+    assert "ann" not in a.users
+    assert "ann" not in a.ratings
+    assert "ann" not in a.friends
+
+
+def sync_later(service):
+    # Reads on the service's writer; returns the calls it queued for the owner thread
+    calls = []
+    results = []
+    service.sync_later(lambda func, *args: calls.append((func, args)), results.append)
+    assert service.storage.writer.flush(10)
+    return calls, results
+
+
+def test_sync_later_reads_on_the_writer_and_applies_on_the_caller(data_dir):
+    a = open_service(data_dir)
+    writer = PersistenceWorker()
+    b = open_service(data_dir, writer)
+    movie_id = a.catalog.movies()[0]["id"]
+    a.create_user("ann", "hash")
+    a.set_rating("ann", movie_id, 1)
+
+    calls, results = sync_later(b)
+    assert "ann" not in b.users
+    assert [len(calls), results] == [1, []]
+    func, args = calls[0]
+    func(*args)
+    assert results == [True]
+    assert "ann" in b.users
+    assert b.rating_of("ann", movie_id) == 1
+
+    calls, results = sync_later(b)
+    func, args = calls[0]
+    func(*args)
+    assert results == [False]
+    writer.stop()
+
+
+def test_sync_later_leaves_out_files_changed_here_before_it_is_applied(data_dir):
+    a = open_service(data_dir)
+    writer = PersistenceWorker()
+    b = open_service(data_dir, writer)
+    a.create_user("ann", "hash")
+    calls, _ = sync_later(b)
+    b.create_user("bob", "hash")
+    func, args = calls[0]
+    func(*args)
+    # The reload predates bob, so it is not applied; the next sync reads again
+    assert "bob" in b.users and "ann" not in b.users
+    assert b.sync()
+    assert {"ann", "bob"} <= set(b.users)
+    writer.stop()
+    assert {"ann", "bob"} <= set(read_json(data_dir, USERS_FILE))
+
+
+def test_interleaved_journal_appends_are_all_applied(data_dir):
+    a = open_service(data_dir)
+    b = open_service(data_dir)
+    movies = [movie["id"] for movie in a.catalog.movies()[:10]]
+    for index, movie_id in enumerate(movies):
+        a.set_rating("admin", movie_id, index % 2)
+        b.set_rating("bob", movie_id, 1)
+    a.sync()
+    b.sync()
+    for service in (a, b, open_service(data_dir)):
+        assert service.user_ratings("admin").to_dict() == {movie_id: index % 2 for index, movie_id in enumerate(movies)}
+        assert service.user_ratings("bob").to_dict() == {movie_id: 1 for movie_id in movies}
+
+
+def test_compaction_by_another_instance_forces_a_full_reload(data_dir):
+    a = open_service(data_dir)
+    b = open_service(data_dir)
+    a.storage.journal.compact_every = 3
+    movies = [movie["id"] for movie in a.catalog.movies()[:5]]
+    b.set_rating("bob", movies[0], 1)
+    a.sync()
+    for movie_id in movies:
+        a.set_rating("admin", movie_id, 1)
+
+    assert b.sync()
+    assert len(b.user_ratings("admin")) == 5
+    assert b.user_ratings("bob").to_dict() == {movies[0]: 1}
+    # Indexes were rebuilt from the reloaded ratings
+    assert b.rating_count(movies[0]) == 2
+
+
+def test_compaction_waits_until_other_instances_records_are_applied(data_dir):
+    a = open_service(data_dir)
+    b = open_service(data_dir)
+    movie_id = a.catalog.movies()[0]["id"]
+    b.set_rating("bob", movie_id, 1)
+    # a has not seen bob's record; compacting now would drop it
+    a.storage.compact_ratings()
+    assert os.path.getsize(os.path.join(data_dir, RATINGS_JOURNAL_FILE)) > 0
+    assert open_service(data_dir).rating_of("bob", movie_id) == 1
+
+    a.sync()
+    a.storage.compact_ratings()
+    assert os.path.getsize(os.path.join(data_dir, RATINGS_JOURNAL_FILE)) == 0
+    assert open_service(data_dir).rating_of("bob", movie_id) == 1
+
+
+def test_background_writers_do_not_lose_updates(data_dir):
+    writers = [PersistenceWorker(), PersistenceWorker()]
+    services = [open_service(data_dir, writer) for writer in writers]
+    movie_id = services[0].catalog.movies()[0]["id"]
+    for index in range(30):
+        for prefix, service in zip("ab", services):
+            service.create_user(f"{prefix}{index}", "hash")
+            service.set_rating(f"{prefix}{index}", movie_id, 1)
+    for writer in writers:
+        assert writer.flush(10)
+        writer.stop()
+    fresh = open_service(data_dir)
+    assert len(fresh.users) == 61
+    assert fresh.rating_count(movie_id) == 60
+
+
+def add_users(data_dir, prefix, count):
+    writer = PersistenceWorker()
+    service = open_service(data_dir, writer)
+    movie_id = service.catalog.movies()[0]["id"]
+    for index in range(count):
+        service.create_user(f"{prefix}{index}", "hash")
+        service.set_rating(f"{prefix}{index}", movie_id, index % 2)
+        service.send_friend_request(f"{prefix}{index}", "admin")
+    writer.stop()
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs fcntl file locks")
+def test_concurrent_processes_do_not_lose_updates(data_dir):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=add_users, args=(data_dir, prefix, 25)) for prefix in "abc"]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    fresh = open_service(data_dir)
+    expected = {f"{prefix}{index}" for prefix in "abc" for index in range(25)}
+    assert expected <= set(fresh.users)
+    assert set(fresh.friends.requests_received("admin")) == expected
+    movie_id = fresh.catalog.movies()[0]["id"]
+    assert fresh.rating_count(movie_id) == 75
+    assert all(fresh.rating_of(user, movie_id) == int(user[1:]) % 2 for user in expected)